@@ -0,0 +1,107 @@
+"""
+	Micro-benchmark of the json decoders available to `YouTube`, over pages rebuilt from the videos recorded
+	in vs_playlist.yaml.
+
+	Each decoder is timed on the (gzip-compressed) body of every page, both through the text path used by
+	`requests.Response.json()` and directly from the response bytes.
+
+	Usage
+	-----
+		python benchmarks/bench_decode.py --repeat 20
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+import zlib
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from youtubeapi.api._decoders import _importDecoder
+
+RECORDING = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'vs_playlist.yaml')
+
+
+def toApiItem(record):
+	""" Converts a recorded (flattened) video back into the shape returned by the Api. """
+	item = {
+		'kind':           'youtube#video',
+		'etag':           '"{}"'.format(record['itemId']),
+		'id':             record['itemId'],
+		'snippet':        {
+			'publishedAt':          record['videoCreationDate'],
+			'channelId':            record['channelId'],
+			'title':                record['videoName'],
+			'description':          record['videoDescription'],
+			'channelTitle':         record['channelName'],
+			'tags':                 record.get('videoTags', []),
+			'categoryId':           record['videoCategory'],
+			'liveBroadcastContent': record['videoLiveBroadcast']
+		},
+		'contentDetails': {'duration': record['videoDuration']},
+		'statistics':     {
+			'viewCount':     record['videoViewCount'],
+			'likeCount':     record['videoLikeCount'],
+			'dislikeCount':  record['videoDislikeCount'],
+			'favoriteCount': record['videoFavoriteCount'],
+			'commentCount':  record['videoCommentCount']
+		}
+	}
+	return item
+
+
+def loadPages(page_size = 50):
+	with open(RECORDING) as file1:
+		records = yaml.safe_load(file1)
+	items = [toApiItem(record) for record in records]
+	pages = list()
+	for start in range(0, len(items), page_size):
+		page = {
+			'kind':     'youtube#videoListResponse',
+			'etag':     '"page-{}"'.format(start),
+			'pageInfo': {'totalResults': len(items), 'resultsPerPage': page_size},
+			'items':    items[start:start + page_size]
+		}
+		body = json.dumps(page).encode('utf-8')
+		pages.append(gzip.compress(body))
+	return pages
+
+
+def gunzip(page):
+	return zlib.decompress(page, 16 + zlib.MAX_WBITS)
+
+
+def benchmark(label, function, pages, repeat):
+	start = time.perf_counter()
+	for _ in range(repeat):
+		for page in pages:
+			function(page)
+	elapsed = time.perf_counter() - start
+	page_count = repeat * len(pages)
+	print("{:<36} {:8.1f} us/page   {:8.0f} pages/s".format(label, elapsed / page_count * 1e6, page_count / elapsed))
+
+
+def main():
+	parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--repeat', type = int, default = 20)
+	args = parser.parse_args()
+
+	pages = loadPages()
+	print("{} pages, {:.1f} KB compressed on average\n".format(len(pages), sum(map(len, pages)) / len(pages) / 1024))
+
+	benchmark('json, via text (Response.json)', lambda p: json.loads(gunzip(p).decode('utf-8')), pages, args.repeat)
+	for name in ['json', 'orjson', 'ujson']:
+		try:
+			decoder = _importDecoder(name)
+		except ImportError:
+			print("{:<36} not installed".format(name))
+			continue
+		benchmark('{}, from bytes'.format(name), lambda p: decoder(gunzip(p)), pages, args.repeat)
+
+
+if __name__ == '__main__':
+	main()
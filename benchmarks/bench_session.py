@@ -0,0 +1,116 @@
+"""
+	Compares the per-request latency of the unpooled `requests.get` call the client used to make
+	against the pooled keep-alive session now owned by `YouTube`.
+
+	The requests are served by a local stand-in for the Youtube Api, so no quota is used.
+
+	Usage
+	-----
+		python benchmarks/bench_session.py --requests 500
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from youtubeapi.api import YouTube
+
+VIDEO_RESPONSE = {
+	'kind':     'youtube#videoListResponse',
+	'etag':     '"benchmark"',
+	'pageInfo': {'totalResults': 1, 'resultsPerPage': 1},
+	'items':    [{
+		'kind':           'youtube#video',
+		'etag':           '"benchmark-item"',
+		'id':             'FrLgREKD4kk',
+		'snippet':        {'title': 'Benchmark', 'channelId': 'UCkxctb0jr8vwa4Do6c6su0Q', 'channelTitle': 'Benchmark'},
+		'contentDetails': {'duration': 'PT21M26S'},
+		'statistics':     {'viewCount': '1789376', 'likeCount': '28480'}
+	}]
+}
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+	protocol_version = 'HTTP/1.1'  # Required for keep-alive.
+	disable_nagle_algorithm = True
+	body = json.dumps(VIDEO_RESPONSE).encode('utf-8')
+
+	def do_GET(self):
+		self.send_response(200)
+		self.send_header('Content-Type', 'application/json; charset=UTF-8')
+		self.send_header('Content-Length', str(len(self.body)))
+		self.end_headers()
+		self.wfile.write(self.body)
+
+	def log_message(self, *args):
+		pass
+
+
+def startServer():
+	server = ThreadingHTTPServer(('127.0.0.1', 0), _StandInHandler)
+	thread = threading.Thread(target = server.serve_forever, daemon = True)
+	thread.start()
+	return server
+
+
+def summarize(label, timings):
+	timings = sorted(timings)
+	result = {
+		'label':    label,
+		'requests': len(timings),
+		'meanMs':   statistics.mean(timings) * 1000,
+		'medianMs': statistics.median(timings) * 1000,
+		'p95Ms':    timings[int(len(timings) * 0.95) - 1] * 1000
+	}
+	return result
+
+
+def benchmarkUnpooled(url, count):
+	timings = list()
+	for _ in range(count):
+		start = time.perf_counter()
+		requests.get(url, params = {'id': 'FrLgREKD4kk', 'part': 'snippet', 'key': 'benchmark'}).json()
+		timings.append(time.perf_counter() - start)
+	return timings
+
+
+def benchmarkPooled(url, count):
+	youtube = YouTube(api_key = 'benchmark', base_url = url.rsplit('/', 1)[0], pool_size = 4)
+	timings = list()
+	with youtube:
+		for _ in range(count):
+			start = time.perf_counter()
+			youtube.request('youtube#video', 'FrLgREKD4kk')
+			timings.append(time.perf_counter() - start)
+	return timings
+
+
+def main():
+	parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--requests', type = int, default = 500)
+	args = parser.parse_args()
+
+	server = startServer()
+	url = 'http://127.0.0.1:{}/youtube/v3/videos'.format(server.server_address[1])
+	try:
+		results = [
+			summarize('requests.get (new connection per call)', benchmarkUnpooled(url, args.requests)),
+			summarize('YouTube.request (pooled session)', benchmarkPooled(url, args.requests))
+		]
+	finally:
+		server.shutdown()
+
+	for result in results:
+		print("{label:<42} mean {meanMs:7.3f} ms   median {medianMs:7.3f} ms   p95 {p95Ms:7.3f} ms".format(**result))
+
+
+if __name__ == '__main__':
+	main()
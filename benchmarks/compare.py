@@ -0,0 +1,49 @@
+"""
+	Compares two result files written by `benchmarks/run_benchmarks.py`.
+
+	Usage
+	-----
+		python benchmarks/compare.py baseline.json results.json
+"""
+import argparse
+import json
+
+
+def loadResults(filename):
+	with open(filename) as file1:
+		report = json.load(file1)
+	results = {(result['name'], result['size']): result for result in report['results']}
+	return report, results
+
+
+def formatRatio(before, after):
+	if not before or not after:
+		return '      -'
+	return '{:6.2f}x'.format(after / before)
+
+
+def main():
+	parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('baseline')
+	parser.add_argument('results')
+	args = parser.parse_args()
+
+	baseline_report, baseline = loadResults(args.baseline)
+	report, results = loadResults(args.results)
+	print("{} -> {}\n".format(baseline_report.get('commit'), report.get('commit')))
+	print("{:<36} {:>7} {:>10} {:>10}".format('benchmark', 'size', 'speed', 'memory'))
+	for key in sorted(set(baseline) & set(results)):
+		before = baseline[key]
+		after = results[key]
+		# Speed is the ratio of throughputs, memory the ratio of peak memory; higher speed and lower memory are better.
+		print("{:<36} {:>7} {:>10} {:>10}".format(
+			key[0], key[1],
+			formatRatio(before['itemsPerSecond'], after['itemsPerSecond']),
+			formatRatio(before['peakMemory'], after['peakMemory'])
+		))
+	for key in sorted(set(baseline) ^ set(results)):
+		print("{:<36} {:>7}   only in {}".format(key[0], key[1], 'baseline' if key in baseline else 'results'))
+
+
+if __name__ == '__main__':
+	main()
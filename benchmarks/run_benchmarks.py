@@ -0,0 +1,314 @@
+"""
+	Reproducible benchmarks of the fetch, parse, insert and analysis hot paths, run against synthetic data
+	from `youtubeapi.api.fake_server.SyntheticCatalog`. No api key or network access is needed.
+
+	Each benchmark reports its throughput and peak memory (measured with tracemalloc in a separate run, so that
+	tracing does not distort the timings). The results are written to a json file which can be compared
+	against the results of another commit with `benchmarks/compare.py`.
+
+	Responses recorded from the real Api with `YouTube(cassette = ..., cassette_mode = 'record')` can be
+	benchmarked as well with `--cassette`, which parses every recorded response.
+
+	Usage
+	-----
+		python benchmarks/run_benchmarks.py --output results.json
+		python benchmarks/run_benchmarks.py --quick --only parse
+		python benchmarks/run_benchmarks.py --cassette vs_playlist --only cassette
+		python benchmarks/compare.py baseline.json results.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from youtubeapi.api import Cassette, ListResource, VideoResource
+from youtubeapi.api.fake_server import SyntheticCatalog
+
+VIDEO_PARTS = ['snippet', 'contentDetails', 'statistics', 'topicDetails']
+CHANNEL_PARTS = ['snippet', 'contentDetails', 'statistics', 'topicDetails']
+
+BENCHMARKS: List[Dict] = list()
+
+
+def benchmark(name: str, sizes: List[int], quick_sizes: List[int]):
+	"""
+		Registers a benchmark. The decorated function receives the size and returns a pair of functions:
+		`setup()`, which is not timed and returns the state, and `run(state)`, which is timed and returns
+		the number of items processed.
+	"""
+
+	def decorator(function):
+		BENCHMARKS.append({'name': name, 'sizes': sizes, 'quickSizes': quick_sizes, 'function': function})
+		return function
+
+	return decorator
+
+
+_catalogs: Dict[int, SyntheticCatalog] = dict()
+
+
+def getCatalog(size: int) -> SyntheticCatalog:
+	""" A catalog with a single channel of `size` uploads. Catalogs are reused between benchmarks. """
+	if size not in _catalogs:
+		_catalogs[size] = SyntheticCatalog(channel_count = 1, uploads_per_channel = size, seed = size)
+	return _catalogs[size]
+
+
+def getVideoPages(catalog: SyntheticCatalog, page_size: int = 50) -> List[Dict]:
+	""" Builds `videos.list` responses for every video in the catalog. """
+	video_ids = list(catalog.videos)
+	pages = list()
+	for start in range(0, len(video_ids), page_size):
+		items = [catalog.getVideo(i, VIDEO_PARTS) for i in video_ids[start:start + page_size]]
+		for item in items:
+			item['etag'] = '"{}"'.format(item['id'])
+		pages.append({
+			'kind':       'youtube#videoListResponse',
+			'etag':       '"page-{}"'.format(start),
+			'pageInfo':   {'totalResults': len(video_ids), 'resultsPerPage': page_size},
+			'items':      items,
+			'statusCode': 200
+		})
+	return pages
+
+
+def getChannelResource(catalog: SyntheticCatalog) -> ListResource:
+	items = [catalog.getChannel(i, CHANNEL_PARTS) for i in catalog.channels]
+	return ListResource({'kind': 'youtube#channelListResponse', 'etag': '"channels"', 'items': items})
+
+
+def createDatabase(catalog: SyntheticCatalog, folder: str, with_videos: bool = False):
+	from youtubeapi import YoutubeDatabase
+
+	filename = os.path.join(folder, 'benchmark_{}.sqlite'.format(time.perf_counter_ns()))
+	database = YoutubeDatabase(filename = filename)
+	database.insertItemIntoDatabase(getChannelResource(catalog))
+	if with_videos:
+		for page in getVideoPages(catalog):
+			database.insertItemIntoDatabase(ListResource(page))
+	return database
+
+
+@benchmark('parse.ListResource', sizes = [1000, 10000, 100000], quick_sizes = [1000])
+def benchmarkParse(size: int):
+	def setup():
+		return getVideoPages(getCatalog(size))
+
+	def run(pages):
+		return sum(len(ListResource(page)) for page in pages)
+
+	return setup, run
+
+
+@benchmark('parse.ListResource (all fields)', sizes = [1000, 10000, 100000], quick_sizes = [1000])
+def benchmarkParseFields(size: int):
+	""" Resources are parsed lazily, so this also reads every field of every item. """
+
+	def setup():
+		return getVideoPages(getCatalog(size))
+
+	def run(pages):
+		item_count = 0
+		for page in pages:
+			for item in ListResource(page):
+				item.toDict()
+				item_count += 1
+		return item_count
+
+	return setup, run
+
+
+@benchmark('parse.cassette', sizes = [1], quick_sizes = [1])
+def benchmarkCassette(size: int, cassette: Cassette = None):
+	""" Parses every successful response in the cassette `size` times. """
+
+	def setup():
+		entries = [entry for entry in cassette.entries.values() if entry['statusCode'] == 200]
+		return [entry['body'].encode('utf-8', errors = 'surrogateescape') for entry in entries]
+
+	def run(bodies):
+		item_count = 0
+		for _ in range(size):
+			for body in bodies:
+				item_count += len(ListResource(json.loads(body)))
+		return item_count
+
+	return setup, run
+
+
+@benchmark('parse.VideoResource.fromSql', sizes = [1000, 10000, 100000], quick_sizes = [1000])
+def benchmarkFromSql(size: int):
+	def setup():
+		resources = [item for page in getVideoPages(getCatalog(size)) for item in ListResource(page).items]
+		return [resource.toDict() for resource in resources]
+
+	def run(rows):
+		for row in rows:
+			VideoResource.fromSql(row).toDict()
+		return len(rows)
+
+	return setup, run
+
+
+@benchmark('database.insertItemIntoDatabase', sizes = [1000, 10000, 100000], quick_sizes = [1000])
+def benchmarkInsert(size: int, folder: str = None):
+	def setup():
+		catalog = getCatalog(size)
+		pages = [ListResource(page) for page in getVideoPages(catalog)]
+		return createDatabase(catalog, folder), pages
+
+	def run(state):
+		database, pages = state
+		return sum(len(database.insertItemIntoDatabase(page)) for page in pages)
+
+	return setup, run
+
+
+@benchmark('database.get (cached)', sizes = [1000, 10000], quick_sizes = [1000])
+def benchmarkDatabaseGet(size: int, folder: str = None):
+	def setup():
+		catalog = getCatalog(size)
+		return createDatabase(catalog, folder, with_videos = True), list(catalog.videos)
+
+	def run(state):
+		database, video_ids = state
+		for video_id in video_ids:
+			database.get('youtube#video', video_id)
+		return len(video_ids)
+
+	return setup, run
+
+
+@benchmark('analysis.ListResource.toFrame', sizes = [1000, 10000, 100000], quick_sizes = [1000])
+def benchmarkToFrame(size: int):
+	""" Builds a DataFrame from already parsed videos. """
+
+	def setup():
+		import pandas  # So that importing it isn't timed.
+
+		response = ListResource.fromSql([])
+		for page in getVideoPages(getCatalog(size)):
+			response.items += ListResource(page).items
+		for item in response.items:
+			item.toDict()
+		return response
+
+	def run(response):
+		return len(response.toFrame())
+
+	return setup, run
+
+
+@benchmark('analysis.BuildTree', sizes = [100, 1000, 5000], quick_sizes = [100])
+def benchmarkBuildTree(size: int):
+	from youtubeapi.widgets._analysis import BuildTree
+
+	def setup():
+		catalog = getCatalog(size)
+		return [video['title'] for video in catalog.videos.values()]
+
+	def run(titles):
+		BuildTree(titles).analyzeHierarchy()
+		return len(titles)
+
+	return setup, run
+
+
+def measure(factory: Callable, size: int, folder: str, trace_memory: bool, cassette: Cassette = None) -> Dict:
+	options = {'folder': folder, 'cassette': cassette}
+	kwargs = {k: v for k, v in options.items() if k in factory.__code__.co_varnames}
+	setup, run = factory(size, **kwargs)
+
+	state = setup()
+	gc.collect()
+	start = time.perf_counter()
+	item_count = run(state)
+	elapsed = time.perf_counter() - start
+	del state
+
+	peak_memory = None
+	if trace_memory:
+		state = setup()
+		gc.collect()
+		tracemalloc.start()
+		run(state)
+		peak_memory = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+		del state
+
+	result = {
+		'size':           size,
+		'items':          item_count,
+		'seconds':        elapsed,
+		'itemsPerSecond': item_count / elapsed if elapsed else None,
+		'peakMemory':     peak_memory
+	}
+	return result
+
+
+def getCommit() -> str:
+	try:
+		output = subprocess.check_output(
+			['git', 'rev-parse', '--short', 'HEAD'], cwd = os.path.dirname(os.path.abspath(__file__)),
+			stderr = subprocess.DEVNULL
+		)
+		return output.decode().strip()
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+
+def main():
+	parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--output', default = 'benchmark_results.json')
+	parser.add_argument('--quick', action = 'store_true', help = "Only run the smallest size of each benchmark.")
+	parser.add_argument('--only', default = None, help = "Only run the benchmarks whose name contains this string.")
+	parser.add_argument('--no-memory', action = 'store_true', help = "Skip the (slower) peak memory measurements.")
+	parser.add_argument('--cassette', default = None, help = "A cassette of recorded responses to parse.")
+	args = parser.parse_args()
+	cassette = Cassette(args.cassette) if args.cassette else None
+
+	folder = tempfile.mkdtemp(prefix = 'youtubeapi_benchmarks_')
+	results = list()
+	try:
+		for benchmark_info in BENCHMARKS:
+			if args.only and args.only not in benchmark_info['name']:
+				continue
+			if benchmark_info['name'] == 'parse.cassette' and cassette is None:
+				continue
+			sizes = benchmark_info['quickSizes'] if args.quick else benchmark_info['sizes']
+			for size in sizes:
+				result = measure(benchmark_info['function'], size, folder, not args.no_memory, cassette)
+				result['name'] = benchmark_info['name']
+				results.append(result)
+				peak_memory = result['peakMemory'] / 1024 ** 2 if result['peakMemory'] is not None else float('nan')
+				print("{:<36} {:>7} items {:>12.0f} items/s {:>10.1f} MB peak".format(
+					result['name'], size, result['itemsPerSecond'], peak_memory
+				))
+	finally:
+		shutil.rmtree(folder, ignore_errors = True)
+
+	report = {
+		'commit':    getCommit(),
+		'timestamp': datetime.now().isoformat(),
+		'python':    platform.python_version(),
+		'platform':  platform.platform(),
+		'results':   results
+	}
+	with open(args.output, 'w') as file1:
+		json.dump(report, file1, indent = 4)
+	print("Saved the results to", args.output)
+
+
+if __name__ == '__main__':
+	main()
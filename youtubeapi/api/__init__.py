@@ -1,2 +1,12 @@
 from ._api import YouTube
-from .resources import *
\ No newline at end of file
+from ._async_api import AsyncYouTube
+from ._quota import QuotaBudget, QuotaExceededError
+from ._cache import ResponseCache
+from ._etag import EtagStore
+from ._isotime import parseDuration, parseDurations, parseTimestamp, parseTimestamps
+from ._keys import ApiKeyPool
+from ._loader import BatchLoader
+from ._profiles import PROFILES, RequestProfile
+from ._policy import CircuitBreaker, RequestPolicy, RetryPolicy, TokenBucket
+from ._transport import Cassette, CassetteTransport
+from .resources import *
@@ -1,18 +1,35 @@
+import time
+import zlib
+from datetime import datetime, timezone
 import requests
+import requests.adapters
 
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from pprint import pprint
 from .resources import *
-from typing import List, Union
+from ._quota import QuotaBudget, QuotaExceededError
+from ._cache import ResponseCache
+from ._decoders import Decoder, getDecoder
+from ._etag import EtagStore
+from ._keys import ApiKeyPool
+from ._profiles import RequestProfile, getProfile
+from ._policy import CircuitBreaker, RequestPolicy, getErrorReason
+from ._transport import Cassette, CassetteTransport
+from typing import Any, Callable, Iterator, List, Set, Tuple, Union
 
 pprint = partial(pprint, width = 180)
 
-from ..github import youtube_api_key
+from .. import github
 
-ResourceType = Union[VideoResource, ChannelResource, PlaylistResource, PlaylistItemResource, SearchResource]
+ResourceType = Union[
+	VideoResource, ChannelResource, PlaylistResource, PlaylistItemResource, SearchResource, ActivityResource,
+	SubscriptionResource, CommentThreadResource
+]
 
 
 class YouTube:
+	default_base_url = 'https://www.googleapis.com/youtube/v3'
 	endpoints = {
 		'youtube#video':        'https://www.googleapis.com/youtube/v3/videos',
 		'youtube#search':       'https://www.googleapis.com/youtube/v3/search',
@@ -20,10 +37,33 @@ class YouTube:
 		'youtube#playlist':     'https://www.googleapis.com/youtube/v3/playlists',
 		'youtube#playlistItem': 'https://www.googleapis.com/youtube/v3/playlistItems',
 		'youtube#activities':    'https://www.googleapis.com/youtube/v3/activities',
+		'youtube#subscription':  'https://www.googleapis.com/youtube/v3/subscriptions',
+		'youtube#commentThread': 'https://www.googleapis.com/youtube/v3/commentThreads',
 		'youtube#watch':         'http://www.youtube.com/watch'
 	}
 
+	# The Api method that each resource kind is retrieved with, as named in `quota_costs`.
+	resource_methods = {
+		'youtube#video':         'videos',
+		'youtube#search':        'search',
+		'youtube#channel':       'channels',
+		'youtube#playlist':      'playlists',
+		'youtube#playlistItem':  'playlistItems',
+		'youtube#activities':    'activities',
+		'youtube#subscription':  'subscriptions',
+		'youtube#commentThread': 'commentThreads'
+	}
+
+	# Methods which cost more than 1 unit before their parts are counted.
+	method_costs = {
+		'search.list': 100
+	}
+
 	quota_costs = {
+		'search.list':        {
+			'id':      0,
+			'snippet': 0
+		},
 		'videos.list':        {
 			'contentDetails':       2,
 			'fileDetails':          1,
@@ -76,6 +116,11 @@ class YouTube:
 			'id':      0,
 			'snippet': 1
 		},
+		'commentThreads.list': {
+			'id':      0,
+			'replies': 1,
+			'snippet': 1
+		},
 		'activities.list':    {
 			'contentDetails': 2,
 			'id':             0,
@@ -83,22 +128,126 @@ class YouTube:
 		}
 	}
 
-	def __init__(self, api_key: str = None):
+	def __init__(self, api_key: Union[str, List[str], ApiKeyPool] = None, base_url: str = None, pool_size: int = 10, timeout: float = 30.0,
+			quota_budget: QuotaBudget = None, policy: RequestPolicy = None, etag_store: EtagStore = None,
+			response_cache: ResponseCache = None, decoder: Union[str, Decoder] = 'auto', decode_raw: bool = False,
+			cassette: Union[str, Cassette] = None, cassette_mode: str = 'replay', emulate_latency: bool = False,
+			keep_raw: bool = False):
+		"""
+		Parameters
+		----------
+		api_key: str, list of str, ApiKeyPool; default None
+			Defaults to `github.youtube_api_key`. If several keys are given, each request is sent with the key
+			which has the most quota remaining, and keys which run out of quota are skipped until it resets.
+		base_url: str; default None
+			The root of the Data Api, ex. 'http://127.0.0.1:8080/youtube/v3' to use a local stand-in
+			(see `youtubeapi.api.fake_server`). Defaults to `YouTube.default_base_url`.
+		pool_size: int; default 10
+			The maximum number of keep-alive connections held open per host.
+		timeout: float; default 30.0
+			The default (connect, read) timeout for each request, in seconds.
+		quota_budget: QuotaBudget; default None
+			If given, every request is charged against this budget before it is sent.
+		policy: RequestPolicy; default None
+			The rate limiting, retry and circuit breaker policy applied to each request.
+			Defaults to retrying transient errors with exponential backoff.
+		etag_store: EtagStore; default None
+			If given, requests are sent with `If-None-Match` and unchanged responses are served from the store.
+		response_cache: ResponseCache; default None
+			If given, responses are served from this persistent cache until they expire.
+		decoder: {'auto', 'json', 'orjson', 'ujson'}, callable; default 'auto'
+			Decodes the json body of each response from bytes. 'auto' uses orjson or ujson when installed.
+		decode_raw: bool; default False
+			If True, the compressed body is read straight from the connection and decompressed in one step,
+			rather than being reassembled from chunks by `requests`.
+		cassette: str, Cassette; default None
+			If given, responses are recorded to or replayed from this cassette (see `youtubeapi.api._transport`).
+			A name is saved as '<name>.json.gz' in `DATA_FOLDER/cassettes`.
+		cassette_mode: {'replay', 'record', 'auto'}; default 'replay'
+			'auto' replays the recorded responses and records the others.
+		emulate_latency: bool; default False
+			If True, each replayed response takes as long as it did when it was recorded.
+		keep_raw: bool; default False
+			If True, every parsed resource also keeps its raw response in `resource.response`.
+		"""
 		if api_key is None:
-			self.api_key = youtube_api_key
+			api_key = github.youtube_api_key
+		if isinstance(api_key, (list, tuple)):
+			api_key = ApiKeyPool(api_key, quota_budget = quota_budget)
+		if isinstance(api_key, ApiKeyPool):
+			self.key_pool = api_key
+			if self.key_pool.quota_budget is None:
+				self.key_pool.quota_budget = quota_budget
+			self.api_key = self.key_pool.api_keys[0]
 		else:
+			self.key_pool = None
 			self.api_key = api_key
 
+		self.base_url = (base_url or self.default_base_url).rstrip('/')
+		self.endpoints = {
+			k: v.replace(self.default_base_url, self.base_url, 1) for k, v in YouTube.endpoints.items()
+		}
+
+		self.pool_size = pool_size
+		self.timeout = timeout
+		self.session = self._createSession(pool_size)
+		self.quota_budget = quota_budget
+		self.quota_used = 0
+		self.policy = policy if policy is not None else RequestPolicy()
+		self.etag_store = etag_store
+		self.response_cache = response_cache
+		self.decoder = getDecoder(decoder)
+		self.decode_raw = decode_raw
+		self.keep_raw = keep_raw
+
+		if cassette is None:
+			self.transport = self.session
+		else:
+			if isinstance(cassette, str):
+				cassette = Cassette(cassette)
+			self.transport = CassetteTransport(self.session, cassette, cassette_mode, emulate_latency)
+			# Recorded bodies are stored decompressed.
+			self.decode_raw = False
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_val, exc_tb):
+		self.close()
+
+	@staticmethod
+	def _createSession(pool_size: int) -> requests.Session:
+		"""
+			Creates a session which reuses its connections between requests, so that paging through
+			a playlist only pays for the TCP/TLS handshake once per pooled connection.
+		"""
+		session = requests.Session()
+		adapter = requests.adapters.HTTPAdapter(pool_connections = pool_size, pool_maxsize = pool_size)
+		session.mount('https://', adapter)
+		session.mount('http://', adapter)
+		session.headers.update({
+			'Accept-Encoding': 'gzip',
+			# Google only compresses responses for clients which also mention gzip in their user agent.
+			'User-Agent':      'youtubeapi (gzip)',
+			'Connection':      'keep-alive'
+		})
+		return session
+
+	def close(self) -> None:
+		""" Closes every pooled connection, and saves the cassette if one is being recorded. """
+		if self.transport is not self.session:
+			self.transport.close()
+		self.session.close()
+
 	@staticmethod
 	def getDefaultApiParameters(endpoint: str, request_key: Union[str, List[str]], **optional_parameters) -> Dict[
 		str, str]:
-		if request_key is None and endpoint != 'search':
+		# Searches may be made without a query (ex. with 'channelId' or 'relatedToVideoId').
+		if request_key is None and endpoint != 'youtube#search':
 			raise ValueError("Request Key = '{}', kind = '{}'".format(request_key, endpoint))
 
-		if not isinstance(request_key, list):
-			request_key = [request_key]
-
-		request_key = ','.join(request_key)
+		if isinstance(request_key, list):
+			request_key = ','.join(request_key)
 
 		default_parameters = {
 			'youtube#channel':      {
@@ -121,6 +270,31 @@ class YouTube:
 			'youtube#video':        {
 				'id':   request_key,
 				'part': 'snippet,contentDetails,statistics,topicDetails'
+			},
+
+			'youtube#search':       {
+				'q':          request_key,
+				'maxResults': '50',
+				'part':       'snippet'
+			},
+
+			'youtube#activities':   {
+				'channelId':  request_key,
+				'maxResults': '50',
+				'part':       'snippet,contentDetails'
+			},
+
+			'youtube#subscription': {
+				'channelId':  request_key,
+				'maxResults': '50',
+				'part':       'snippet,contentDetails'
+			},
+
+			'youtube#commentThread': {
+				'videoId':    request_key,
+				'maxResults': '100',
+				'part':       'snippet',
+				'textFormat': 'plainText'
 			}
 		}
 		parameters = default_parameters[endpoint]
@@ -129,14 +303,62 @@ class YouTube:
 
 		return parameters
 
-	def calculateQuota(self, endpoint: str, parts: List[str]):
-		base_cost = 1
+	@classmethod
+	def normalizeEndpoint(cls, endpoint: str) -> str:
+		""" Converts an endpoint such as 'videos' into its resource kind ('youtube#video'). """
+		if endpoint in cls.endpoints:
+			return endpoint
+		resource_kinds = {v: k for k, v in cls.resource_methods.items()}
+		if endpoint in resource_kinds:
+			return resource_kinds[endpoint]
 
-		method_costs = self.quota_costs[endpoint + '.list']
-		base_cost += sum([v for k, v in method_costs if k in parts])
+		if endpoint.endswith('s'):
+			endpoint = endpoint[:-1]
+		if '#' not in endpoint:
+			endpoint = 'youtube#' + endpoint
+		return endpoint
+
+	def calculateQuota(self, endpoint: str, parts: Union[str, List[str]]) -> int:
+		"""
+			Calculates the number of quota units a request will use.
+		Parameters
+		----------
+		endpoint: str
+			Either a resource kind ('youtube#video') or an Api method ('videos').
+		parts: str, list<str>
+			The requested parts, as a list or as the comma-separated 'part' parameter.
+
+		Returns
+		-------
+			int
+		"""
+		if isinstance(parts, str):
+			parts = parts.split(',')
+		endpoint = self.resource_methods.get(endpoint, endpoint)
+
+		base_cost = self.method_costs.get(endpoint + '.list', 1)
+		method_costs = self.quota_costs.get(endpoint + '.list', {})
+		base_cost += sum([v for k, v in method_costs.items() if k in parts])
 		return base_cost
 
-	def getChannelItems(self, channel_id: str, **kwargs) -> ListResource:
+	def calculateProfileQuota(self, profile: Union[str, RequestProfile], endpoint: str) -> int:
+		""" Calculates the quota cost of a single request made with the given profile. """
+		endpoint = self.normalizeEndpoint(endpoint)
+		parameters = getProfile(profile).getParameters(endpoint)
+		if 'part' not in parameters:
+			parameters = self.getDefaultApiParameters(endpoint, '')
+		return self.calculateQuota(endpoint, parameters['part'])
+
+	def getChannelItems(self, channel_id: str, until: Callable[[ResourceType], bool] = None, **kwargs) -> ListResource:
+		"""
+			Retrieves the uploads of a channel, newest first.
+		Parameters
+		----------
+		channel_id: str
+		until: callable; default None
+			Stops paging at the first upload for which this returns True (ex. the newest upload already
+			imported), so that only the newer uploads are requested.
+		"""
 		parameters = {
 			'id':   channel_id,
 			'part': 'contentDetails'
@@ -146,87 +368,434 @@ class YouTube:
 			return None
 
 		upload_playlist = channel_response[0]['channelUploadPlaylist']
-		channel_items = self.get('playlistItems', upload_playlist, part = 'id,snippet', **kwargs)
+		channel_items = self.get('playlistItems', upload_playlist, until = until, part = 'id,snippet', **kwargs)
 
 		return channel_items
 
-	def getVideos(self, ids: Union[str, int]) -> ListResource:
-		if not isinstance(ids[0], str):
-			ids = [i.item_id for i in ids]
-		max_page_length = 50
-		start_index = 0
-		end_index = max_page_length
+	def getActivities(self, channel_id: str, published_after: datetime = None, **kwargs) -> ListResource:
+		"""
+			Retrieves the recent activities (uploads, likes, playlist additions, ...) of a channel, newest first.
+			At 5 units per page, this is a cheap way to discover new uploads without paging the uploads playlist.
+		Parameters
+		----------
+		channel_id: str
+		published_after: datetime; default None
+			Only returns activities after this time. Naive datetimes are taken to be in UTC.
+		"""
+		if published_after is not None:
+			if published_after.tzinfo is not None:
+				published_after = published_after.astimezone(timezone.utc).replace(tzinfo = None)
+			kwargs['publishedAfter'] = published_after.strftime('%Y-%m-%dT%H:%M:%SZ')
+		return self.get('activities', channel_id, **kwargs)
+
+	def iterSubscriptions(self, channel_id: str, max_items: int = None, **kwargs) -> Iterator[SubscriptionResource]:
+		"""
+			Lazily yields the public subscriptions of a channel, one page of 50 at a time.
+		"""
+		return self.iterItems('subscriptions', channel_id, max_items = max_items, **kwargs)
 
-		response = None
-		while start_index < len(ids):
-			if end_index >= len(ids): end_index = len(ids)
+	def iterCommentThreads(self, video_id: str, max_items: int = None, **kwargs) -> Iterator[CommentThreadResource]:
+		"""
+			Lazily yields the top-level comments of a video, one page of 100 at a time,
+			so that videos with hundreds of thousands of comments can be processed in constant memory.
+		"""
+		return self.iterItems('commentThreads', video_id, max_items = max_items, **kwargs)
 
-			api_response = self.get('videos', ids[start_index:end_index])
-			if response is None:
-				response = api_response
+	@staticmethod
+	def truncateAt(page: ListResource, until: Callable[[ResourceType], bool] = None) -> bool:
+		"""
+			Removes the first item for which `until` returns True and every item after it.
+			Returns True if the page was truncated.
+		"""
+		if until is None:
+			return False
+		for index, item in enumerate(page.items):
+			if until(item):
+				page.items = page.items[:index]
+				return True
+		return False
+
+	@staticmethod
+	def getItemId(item: Union[str, Dict, ResourceType, Any]) -> str:
+		""" Returns the id of an item given as a string, a resource, a dict or a database entity. """
+		if isinstance(item, str):
+			return item
+		elif isinstance(item, dict):
+			return item.get('itemId', item.get('resourceId'))
+		elif hasattr(item, 'item_id'):
+			return item.item_id
+		else:
+			return item.resourceId
+
+	@classmethod
+	def chunkIds(cls, ids: List[Union[str, ResourceType]], max_page_length: int = 50) -> List[List[str]]:
+		""" Splits a list of ids into chunks small enough to be requested in a single call. """
+		ids = [cls.getItemId(i) for i in ids]
+		return [ids[i:i + max_page_length] for i in range(0, len(ids), max_page_length)]
+
+	@staticmethod
+	def mergeChunks(chunks: List[List[str]], responses: List[Union[ListResource, Exception]]) -> ListResource:
+		"""
+			Combines the responses for each chunk of ids into a single `ListResource`, preserving the order
+			of the chunks. Chunks which failed are recorded in `ListResource.errors` rather than raised.
+		"""
+		response = ListResource({
+			'kind':     'youtube#videoListResponse',
+			'etag':     None,
+			'pageInfo': {},
+			'items':    []
+		})
+		for index, (chunk, api_response) in enumerate(zip(chunks, responses)):
+			if isinstance(api_response, Exception):
+				response.errors.append({
+					'chunkIndex': index,
+					'ids':        chunk,
+					'statusCode': None,
+					'error':      str(api_response)
+				})
+			elif api_response.status_code != 200:
+				response.errors.append({
+					'chunkIndex': index,
+					'ids':        chunk,
+					'statusCode': api_response.status_code,
+					'error':      api_response.error
+				})
 			else:
 				response.items += api_response.items
-
-			start_index += max_page_length
-			end_index += max_page_length
+		response.page_info = {'totalResults': len(response.items), 'resultsPerPage': len(response.items)}
 		return response
 
-	def request(self, endpoint: str, key: str, **parameters) -> Dict:
+	def getVideos(self, ids: List[Union[str, ResourceType]], max_workers: int = None) -> ListResource:
+		"""
+			Retrieves the requested videos. The ids are requested in chunks of 50, with the chunks
+			fetched concurrently.
+		Parameters
+		----------
+		ids: list<str, VideoResource, Video>
+			The videos to retrieve, as ids, resources or database entities.
+		max_workers: int; default None
+			The maximum number of chunks requested at once. Defaults to the size of the connection pool.
+
+		Returns
+		-------
+			ListResource
+				The videos, in the same order as `ids`. Chunks which failed are listed in `errors`.
+		"""
+		chunks = self.chunkIds(ids)
+		if max_workers is None:
+			max_workers = self.pool_size
+		max_workers = max(1, min(max_workers, len(chunks)))
+
+		with ThreadPoolExecutor(max_workers = max_workers) as executor:
+			futures = [executor.submit(self.get, 'videos', chunk) for chunk in chunks]
+
+		responses = list()
+		for future in futures:
+			try:
+				responses.append(future.result())
+			except Exception as exception:
+				responses.append(exception)
+
+		return self.mergeChunks(chunks, responses)
+
+	def request(self, endpoint: str, key: str, timeout: float = None, profile: Union[str, RequestProfile] = None,
+			use_cache: bool = True, **parameters) -> Dict:
 		"""
-			Sends a raw request to the Youtube Api.
+			Sends a raw request to the Youtube Api through the pooled session.
 		Parameters
 		----------
 		endpoint: str
 		key: str
+		timeout: float; default None
+			Overrides the default timeout for this request only.
+		profile: str, RequestProfile; default None
+			Selects the 'part' and 'fields' parameters from a named profile ('identity', 'stats-only',
+			'uploads-discovery' or 'full'). Explicit parameters take precedence over the profile.
+		use_cache: bool; default True
+			If False, the request is sent even if the response cache has a response for it, and without the
+			etag of the previous response. The new response is still stored.
 
 		Returns
 		-------
 
 		"""
-		if 'youtube' not in endpoint:
-			endpoint = 'youtube#' + endpoint
+		endpoint = self.normalizeEndpoint(endpoint)
+		if profile is not None:
+			parameters = {**getProfile(profile).getParameters(endpoint), **parameters}
 
 		parameters = self.getDefaultApiParameters(endpoint, key, **parameters)
-		parameters['key'] = self.api_key
+		if self.response_cache is not None and use_cache:
+			cached_response = self.response_cache.get(endpoint, parameters)
+			if cached_response is not None:
+				return cached_response
+
+		quota_cost = self.calculateQuota(endpoint, parameters.get('part', ''))
+		headers = dict()
+		if self.etag_store is not None and use_cache:
+			etag = self.etag_store.getEtag(endpoint, parameters)
+			if etag:
+				headers['If-None-Match'] = etag
 
 		url = self.endpoints[endpoint]
 
-		response = requests.get(url, params = parameters)
+		if timeout is None:
+			timeout = self.timeout
+
+		attempt = 0
+		while True:
+			api_key = self.key_pool.acquire(quota_cost) if self.key_pool is not None else self.api_key
+			parameters['key'] = api_key
+			try:
+				self.policy.beforeRequest(api_key)
+				# Each retry is charged as well, so a budget refusal also ends the retries.
+				self._chargeQuota(quota_cost, api_key)
+			except QuotaExceededError:
+				if self.key_pool is None:
+					raise
+				# A key paused by the circuit breaker is only skipped until the breaker closes, rather than
+				# until the daily quota resets.
+				self.key_pool.markExhausted(api_key, self.policy.getPause(api_key))
+				continue
+			try:
+				response = self.transport.get(
+					url, params = parameters, headers = headers, timeout = timeout, stream = self.decode_raw
+				)
+			except (requests.ConnectionError, requests.Timeout):
+				delay = self.policy.getRetryDelay(api_key, attempt, None)
+				if delay is None:
+					raise
+			else:
+				status_code = response.status_code
+				if status_code == 304 and self.etag_store is not None:
+					self._readBody(response)  # Returns the connection to the pool.
+					cached_response = self.etag_store.getResponse(endpoint, parameters)
+					if cached_response is not None:
+						if self.response_cache is not None:
+							self.response_cache.store(endpoint, parameters, cached_response)
+						return {**cached_response, 'statusCode': 304}
+					headers.pop('If-None-Match', None)
+					attempt += 1
+					continue
+				response_body = self._decodeResponse(response)
+				if self.key_pool is not None and getErrorReason(response_body) in CircuitBreaker.quota_reasons:
+					# Another key may still have quota left.
+					self.policy.getRetryDelay(api_key, attempt, status_code, response_body, response.headers)
+					self.key_pool.markExhausted(api_key)
+					continue
+				delay = self.policy.getRetryDelay(api_key, attempt, status_code, response_body, response.headers)
+				if delay is None:
+					if self.etag_store is not None:
+						self.etag_store.store(endpoint, parameters, response_body)
+					if self.response_cache is not None:
+						self.response_cache.store(endpoint, parameters, response_body)
+					return response_body
+			time.sleep(delay)
+			attempt += 1
+
+	def toListResource(self, response: Dict) -> ListResource:
+		""" Parses a response, reusing the previously parsed resource when the etag store has one. """
+		if self.etag_store is not None:
+			return self.etag_store.toListResource(response, self.keep_raw)
+		return ListResource(response, self.keep_raw)
+
+	def _chargeQuota(self, quota_cost: int, api_key: str = None) -> None:
+		if api_key is None:
+			api_key = self.api_key
+		if self.quota_budget is not None:
+			self.quota_budget.charge(api_key, quota_cost)
+		if self.key_pool is not None:
+			self.key_pool.charge(api_key, quota_cost)
+		self.quota_used += quota_cost
+
+	def _readBody(self, response: requests.Response) -> bytes:
+		if not self.decode_raw:
+			return response.content
+
+		body = response.raw.read(decode_content = False)
+		response.raw.release_conn()
+		content_encoding = response.headers.get('Content-Encoding', '').lower()
+		if content_encoding == 'gzip':
+			body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+		elif content_encoding == 'deflate':
+			body = zlib.decompress(body)
+		return body
+
+	def _decodeResponse(self, response: requests.Response) -> Dict:
 		status_code = response.status_code
-		response = response.json()
-		response['statusCode'] = status_code
-
-		return response
-
-	def get(self, endpoint: str, key: str, **parameters) -> ListResource:
+		body = self._readBody(response)
+		try:
+			response_body = self.decoder(body)
+		except ValueError:
+			# Errors from proxies and load balancers are not always json.
+			message = body[:500].decode('utf-8', errors = 'replace')
+			response_body = {'error': {'code': status_code, 'message': message, 'errors': []}}
+		response_body['statusCode'] = status_code
+		return response_body
+
+	def iterPages(self, endpoint: str, key: str, max_items: int = None, until: Callable[[ResourceType], bool] = None,
+			**parameters) -> Iterator[ListResource]:
+		"""
+			Lazily requests each page of a response, following `nextPageToken` until the last page.
+			Every page is requested with the same parameters as the first one.
+		Parameters
+		----------
+		endpoint: str
+		key: str
+		max_items: int; default None
+			Stops paging once this many items have been yielded. The last page is truncated if necessary.
+		until: callable; default None
+			Stops paging at the first item for which this returns True. That item and the ones after it are dropped.
+
+		Yields
+		------
+			ListResource
 		"""
+		endpoint = self.normalizeEndpoint(endpoint)
+		page_parameters = dict(parameters)
+		item_count = 0
+
+		while True:
+			response = self.request(endpoint, key, **page_parameters)
+			page = self.toListResource(response)
+			if page.status_code != 200:
+				pprint(endpoint)
+				pprint(key)
+				pprint(page_parameters)
+				if getErrorReason(response) in CircuitBreaker.quota_reasons:
+					# Don't let an exhausted quota pass for an empty (or truncated) result.
+					message = "The quota was exhausted while requesting '{}' ({})".format(endpoint, key)
+					raise QuotaExceededError(message)
+
+			is_last_page = self.truncateAt(page, until)
+			if max_items is not None and item_count + len(page) >= max_items:
+				page.items = page.items[:max_items - item_count]
+				is_last_page = True
+			item_count += len(page)
+			yield page
+
+			if is_last_page or not page.next_page_token:
+				break
+			page_parameters['pageToken'] = page.next_page_token
+
+	def iterItems(self, endpoint: str, key: str, max_items: int = None, until: Callable[[ResourceType], bool] = None,
+			**parameters) -> Iterator[ResourceType]:
+		"""
+			Lazily yields each item of a response, one page at a time. See `YouTube.iterPages`.
+		"""
+		for page in self.iterPages(endpoint, key, max_items = max_items, until = until, **parameters):
+			yield from page.items
 
+	def get(self, endpoint: str, key: str, max_items: int = None, until: Callable[[ResourceType], bool] = None,
+			**parameters) -> ListResource:
+		"""
+			Retrieves every page of a response and collects the items into a single `ListResource`.
 		Parameters
 		----------
 		endpoint: str
 		key: str
+		max_items: int; default None
+			The maximum number of items to retrieve.
+		until: callable; default None
+			Stops at the first item for which this returns True. See `YouTube.iterPages`.
 
 		Returns
 		-------
-			Resource
+			ListResource
 
 		"""
-		if endpoint.endswith('s'):
-			endpoint = endpoint[:-1]
-		if '#' not in endpoint:
-			endpoint = 'youtube#' + endpoint
-
-		response = self.request(endpoint, key, **parameters)
-
-		response_resource = ListResource(response)
-		if response_resource.status_code != 200:
-			pprint(endpoint)
-			pprint(key)
-			pprint(parameters)
-		if response_resource.next_page_token:
-			next_page_response = self.get(endpoint, key, pageToken = response_resource.next_page_token)
-			response_resource.items += next_page_response.items
+		pages = self.iterPages(endpoint, key, max_items = max_items, until = until, **parameters)
+		response_resource = next(pages)
+		for page in pages:
+			response_resource.items += page.items
 		return response_resource
 
-	def search(self, **parameters):
-		raise NotImplementedError
+	def search(self, query: str, max_items: int = None, seen: Set[Tuple[str, str]] = None,
+			**parameters) -> Iterator[SearchResource]:
+		"""
+			Lazily yields the results of a search, requesting each page only when it is reached.
+			Every page costs 100 quota units.
+		Parameters
+		----------
+		query: str
+		max_items: int; default None
+			The maximum number of results to request. The Api stops at around 500 results per query.
+		seen: set<tuple<str,str>>; default None
+			The (itemType, itemId) of the results which were already found. These are skipped, and every new
+			result is added, so a set shared between several searches removes the duplicates between them.
+		**parameters
+			Any other search parameters, ex. type = 'video', channelId, publishedAfter or order.
+
+		Yields
+		------
+			SearchResource
+		"""
+		if seen is None:
+			seen = set()
+		for item in self.iterItems('youtube#search', query, max_items = max_items, **parameters):
+			key = (item.item_type, item.item_id)
+			if key in seen:
+				continue
+			seen.add(key)
+			yield item
+
+	def searchVideos(self, queries: Union[str, List[str]], max_items: int = None, seen: Set[Tuple[str, str]] = None,
+			errors: List[Dict] = None, **parameters) -> Iterator[VideoResource]:
+		"""
+			Searches for videos and yields the full resource of every new result. The results of each query are
+			deduplicated against every other query, and requested with `videos.list` 50 at a time, so only a
+			single batch is held in memory.
+		Parameters
+		----------
+		queries: str, list<str>
+		max_items: int; default None
+			The maximum number of results to request for each query.
+		seen: set<tuple<str,str>>; default None
+			See `YouTube.search`.
+		errors: list<dict>; default None
+			If given, the chunks of videos which could not be retrieved (see `ListResource.errors`) are added
+			to it. Otherwise the first failed chunk raises a RuntimeError, after the videos which were retrieved.
+		**parameters
+			Any other search parameters.
+
+		Yields
+		------
+			VideoResource
+
+		Raises
+		------
+		QuotaExceededError
+			If the quota was exhausted while requesting the videos, whether or not `errors` is given.
+		"""
+		if isinstance(queries, str):
+			queries = [queries]
+		if seen is None:
+			seen = set()
+		# The snippet would be requested again with the video, so only the ids are needed.
+		parameters.setdefault('part', 'id')
+		parameters['type'] = 'video'
+
+		def getChunkVideos(ids: List[str]) -> Iterator[VideoResource]:
+			response = self.getVideos(ids)
+			yield from response.items
+			# The search quota is already spent, so failed chunks aren't dropped silently.
+			for error in response.errors:
+				if getErrorReason(error) in CircuitBreaker.quota_reasons:
+					message = "The quota was exhausted while requesting the videos of a search"
+					raise QuotaExceededError(message)
+			if errors is not None:
+				errors.extend(response.errors)
+			elif response.errors:
+				message = "{} videos of the search results could not be retrieved: {}".format(
+					sum(len(error['ids']) for error in response.errors), response.errors[0]['error']
+				)
+				raise RuntimeError(message)
+
+		video_ids = list()
+		for query in queries:
+			for item in self.search(query, max_items = max_items, seen = seen, **parameters):
+				video_ids.append(item.item_id)
+				if len(video_ids) == 50:
+					yield from getChunkVideos(video_ids)
+					video_ids = list()
+		if video_ids:
+			yield from getChunkVideos(video_ids)
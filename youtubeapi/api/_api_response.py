@@ -3,7 +3,6 @@ from functools import partial
 import yaml
 import json
 pprint = partial(pprint, width = 200)
-from ..github import timetools
 
 
 class ApiResponse:
@@ -0,0 +1,141 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Callable, Dict, List, Union
+
+from ._api import YouTube
+from ._policy import CircuitBreaker, getErrorReason
+from ._quota import QuotaExceededError
+from .resources import ListResource, VideoResource
+
+
+class AsyncYouTube:
+	"""
+		An asyncio interface to the Youtube Api with the same surface as `YouTube`.
+		Each request is run on a worker thread using the pooled session of the wrapped client,
+		and at most `concurrency` requests are in flight at any time.
+
+		Parameters
+		----------
+		api_key: str, YouTube; default None
+			Either an api key or an existing client to wrap.
+		concurrency: int; default 8
+			The maximum number of simultaneous requests.
+		kwargs
+			Passed to `YouTube` when a new client is created.
+	"""
+
+	def __init__(self, api_key: Union[str, YouTube] = None, concurrency: int = 8, **kwargs):
+		self._owns_client = not isinstance(api_key, YouTube)
+		if not self._owns_client:
+			self.api = api_key
+		else:
+			kwargs['pool_size'] = max(kwargs.get('pool_size', 10), concurrency)
+			self.api = YouTube(api_key, **kwargs)
+		self.concurrency = concurrency
+		self._executor = ThreadPoolExecutor(max_workers = concurrency)
+		self._semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = dict()
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, exc_type, exc_val, exc_tb):
+		self.close()
+
+	def close(self) -> None:
+		self._executor.shutdown(wait = False)
+		if self._owns_client:
+			self.api.close()
+
+	def _getSemaphore(self) -> asyncio.Semaphore:
+		# Semaphores are bound to the loop they are first used in.
+		loop = asyncio.get_event_loop()
+		semaphore = self._semaphores.get(loop)
+		if semaphore is None:
+			semaphore = self._semaphores[loop] = asyncio.Semaphore(self.concurrency)
+		return semaphore
+
+	async def request(self, endpoint: str, key: str, **parameters) -> Dict:
+		"""
+			Sends a raw request to the Youtube Api. See `YouTube.request`.
+		"""
+		loop = asyncio.get_event_loop()
+		async with self._getSemaphore():
+			response = await loop.run_in_executor(
+				self._executor, partial(self.api.request, endpoint, key, **parameters)
+			)
+		return response
+
+	async def iterPages(self, endpoint: str, key: str, max_items: int = None, until: Callable = None,
+			**parameters) -> AsyncIterator[ListResource]:
+		"""
+			Lazily requests each page of a response. Pages are requested one after another, since each
+			page token is only known once the previous page arrives. See `YouTube.iterPages`.
+		"""
+		endpoint = self.api.normalizeEndpoint(endpoint)
+		page_parameters = dict(parameters)
+		item_count = 0
+
+		while True:
+			response = await self.request(endpoint, key, **page_parameters)
+			page = self.api.toListResource(response)
+			if page.status_code != 200 and getErrorReason(response) in CircuitBreaker.quota_reasons:
+				# Don't let an exhausted quota pass for an empty (or truncated) result.
+				message = "The quota was exhausted while requesting '{}' ({})".format(endpoint, key)
+				raise QuotaExceededError(message)
+
+			is_last_page = self.api.truncateAt(page, until)
+			if max_items is not None and item_count + len(page) >= max_items:
+				page.items = page.items[:max_items - item_count]
+				is_last_page = True
+			item_count += len(page)
+			yield page
+
+			if is_last_page or not page.next_page_token:
+				break
+			page_parameters['pageToken'] = page.next_page_token
+
+	async def get(self, endpoint: str, key: str, max_items: int = None, until: Callable = None,
+			**parameters) -> ListResource:
+		"""
+			Retrieves every page of a response and collects the items into a single `ListResource`.
+		Parameters
+		----------
+		endpoint: str
+		key: str
+		max_items: int; default None
+
+		Returns
+		-------
+			ListResource
+		"""
+		response_resource = None
+		async for page in self.iterPages(endpoint, key, max_items = max_items, until = until, **parameters):
+			if response_resource is None:
+				response_resource = page
+			else:
+				response_resource.items += page.items
+		return response_resource
+
+	async def getVideos(self, ids: List[Union[str, VideoResource]]) -> ListResource:
+		"""
+			Retrieves the requested videos in chunks of 50, with the chunks requested concurrently.
+			The items are returned in the same order as `ids`, and failed chunks are listed in `errors`.
+		"""
+		chunks = self.api.chunkIds(ids)
+		responses = await asyncio.gather(*[self.get('videos', chunk) for chunk in chunks], return_exceptions = True)
+		return self.api.mergeChunks(chunks, responses)
+
+	async def getChannelItems(self, channel_id: str, until: Callable = None, **kwargs) -> ListResource:
+		parameters = {
+			'id':   channel_id,
+			'part': 'contentDetails'
+		}
+		channel_response = await self.get('youtube#channel', channel_id, **parameters)
+		if len(channel_response) == 0:
+			return None
+
+		upload_playlist = channel_response[0]['channelUploadPlaylist']
+		channel_items = await self.get('playlistItems', upload_playlist, until = until, part = 'id,snippet', **kwargs)
+
+		return channel_items
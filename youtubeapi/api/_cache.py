@@ -0,0 +1,167 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+from ..github import DATA_FOLDER
+from ._etag import makeRequestKey
+
+
+class ResponseCache:
+	"""
+		A persistent cache of Api responses, stored in an SQLite database. Entries expire after a per-endpoint
+		time-to-live, bodies are stored zlib-compressed, and the least recently used entries are evicted
+		once the cache grows beyond `max_bytes`. Entries are keyed by endpoint and parameters, so the same
+		cache can be shared by several api keys.
+
+		Parameters
+		----------
+		filename: str; default None
+			Defaults to 'response_cache.sqlite' in `DATA_FOLDER`.
+		ttls: dict<str,float>; default None
+			The time-to-live of each endpoint, in seconds. Overrides `ResponseCache.default_ttls`.
+		default_ttl: float; default 86400
+			The time-to-live of endpoints without an entry in `ttls`.
+		max_bytes: int; default 256MB
+			The maximum size of the stored (compressed) bodies.
+	"""
+	default_ttls = {
+		'youtube#video':        6 * 3600,
+		'youtube#channel':      24 * 3600,
+		'youtube#playlist':     3600,
+		'youtube#playlistItem': 3600,
+		'youtube#search':       24 * 3600,
+		'youtube#activities':   900
+	}
+
+	def __init__(self, filename: str = None, ttls: Dict[str, float] = None, default_ttl: float = 86400,
+			max_bytes: int = 256 * 1024 ** 2):
+		if filename is None:
+			filename = os.path.join(DATA_FOLDER, 'response_cache.sqlite')
+		self.filename = filename
+		self.ttls = {**self.default_ttls, **(ttls or {})}
+		self.default_ttl = default_ttl
+		self.max_bytes = max_bytes
+
+		self.hits = 0
+		self.misses = 0
+		self.bytes_saved = 0
+
+		self._lock = threading.Lock()
+		self._connection = sqlite3.connect(self.filename, check_same_thread = False)
+		self._connection.execute(
+			"""CREATE TABLE IF NOT EXISTS responses (
+				key TEXT PRIMARY KEY,
+				endpoint TEXT NOT NULL,
+				body BLOB NOT NULL,
+				size INTEGER NOT NULL,
+				storedSize INTEGER NOT NULL,
+				expires REAL NOT NULL,
+				accessed REAL NOT NULL
+			)"""
+		)
+		self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+		self._connection.execute("CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires)")
+		self._connection.commit()
+		# A running total, so that storing a response doesn't add up the whole table.
+		self._stored_size: int = self._getStoredSize()
+
+	def __len__(self):
+		with self._lock:
+			return self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+	def __str__(self):
+		string = "ResponseCache('{}', {} hits, {} misses)".format(self.filename, self.hits, self.misses)
+		return string
+
+	def close(self) -> None:
+		self._connection.close()
+
+	@staticmethod
+	def _makeKey(endpoint: str, parameters: Dict) -> str:
+		return json.dumps(makeRequestKey(endpoint, parameters))
+
+	def get(self, endpoint: str, parameters: Dict) -> Optional[Dict]:
+		""" Returns the cached response to a request, or `None` if it is missing or has expired. """
+		key = self._makeKey(endpoint, parameters)
+		now = time.time()
+		with self._lock:
+			row = self._connection.execute(
+				"SELECT body, size FROM responses WHERE key = ? AND expires > ?", (key, now)
+			).fetchone()
+			if row is None:
+				self.misses += 1
+				return None
+			self._connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+			self._connection.commit()
+			self.hits += 1
+			self.bytes_saved += row[1]
+		return json.loads(zlib.decompress(row[0]).decode('utf-8'))
+
+	def store(self, endpoint: str, parameters: Dict, response: Dict) -> None:
+		""" Saves a successful response. Errors are never cached. """
+		if response.get('statusCode', 200) not in {200, 304} or 'error' in response:
+			return
+		raw_body = json.dumps(response, separators = (',', ':')).encode('utf-8')
+		body = zlib.compress(raw_body)
+		now = time.time()
+		expires = now + self.ttls.get(endpoint, self.default_ttl)
+		key = self._makeKey(endpoint, parameters)
+		with self._lock:
+			row = self._connection.execute("SELECT storedSize FROM responses WHERE key = ?", (key,)).fetchone()
+			self._connection.execute(
+				"INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+				(key, endpoint, body, len(raw_body), len(body), expires, now)
+			)
+			self._stored_size += len(body) - (row[0] if row is not None else 0)
+			if self._stored_size > self.max_bytes:
+				self._evict()
+			self._connection.commit()
+
+	def _getStoredSize(self) -> int:
+		return self._connection.execute("SELECT COALESCE(SUM(storedSize), 0) FROM responses").fetchone()[0]
+
+	def _evict(self) -> None:
+		"""
+			Deletes the expired responses, then the least recently used ones until the cache is 10% below
+			`max_bytes`, so that the next responses can be stored without evicting again.
+		"""
+		self._connection.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+		# Recounted, since other processes may share the cache.
+		total_size = self._stored_size = self._getStoredSize()
+		target_size = 0.9 * self.max_bytes
+		if total_size <= self.max_bytes:
+			return
+		rows = self._connection.execute("SELECT key, storedSize FROM responses ORDER BY accessed")
+		evicted = list()
+		for key, stored_size in rows:
+			if total_size <= target_size:
+				break
+			evicted.append((key,))
+			total_size -= stored_size
+		self._connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+		self._stored_size = total_size
+
+	def clear(self) -> None:
+		with self._lock:
+			self._connection.execute("DELETE FROM responses")
+			self._connection.commit()
+			self._stored_size = 0
+
+	def stats(self) -> Dict[str, int]:
+		with self._lock:
+			entries, size, stored_size = self._connection.execute(
+				"SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(storedSize), 0) FROM responses"
+			).fetchone()
+		statistics = {
+			'hits':        self.hits,
+			'misses':      self.misses,
+			'bytesSaved':  self.bytes_saved,
+			'entries':     entries,
+			'size':        size,
+			'storedSize':  stored_size
+		}
+		return statistics
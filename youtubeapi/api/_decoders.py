@@ -0,0 +1,44 @@
+import json
+from typing import Callable, Dict, Union
+
+Decoder = Callable[[bytes], Dict]
+
+
+def _importDecoder(name: str) -> Decoder:
+	if name == 'json':
+		return json.loads
+	elif name == 'orjson':
+		import orjson
+		return orjson.loads
+	elif name == 'ujson':
+		import ujson
+		return ujson.loads
+	else:
+		message = "'{}' is not a supported json decoder!".format(name)
+		raise ValueError(message)
+
+
+def getDecoder(decoder: Union[str, Decoder] = 'auto') -> Decoder:
+	"""
+		Returns a function which decodes a json document directly from the bytes of a response body.
+	Parameters
+	----------
+	decoder: {'auto', 'json', 'orjson', 'ujson'}, callable; default 'auto'
+		* 'auto': the fastest decoder which is installed, falling back to the standard library.
+		* callable: any function accepting `bytes` and returning a dict.
+
+	Returns
+	-------
+		callable
+	"""
+	if callable(decoder):
+		return decoder
+	if decoder != 'auto':
+		return _importDecoder(decoder)
+
+	for name in ['orjson', 'ujson']:
+		try:
+			return _importDecoder(name)
+		except ImportError:
+			pass
+	return json.loads
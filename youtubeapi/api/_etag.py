@@ -0,0 +1,95 @@
+import copy
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from .resources import ListResource
+
+
+def makeRequestKey(endpoint: str, parameters: Dict) -> Tuple:
+	""" Identifies a request by its endpoint and parameters. The api key is ignored. """
+	return (endpoint,) + tuple(sorted((k, str(v)) for k, v in parameters.items() if k != 'key'))
+
+
+class EtagStore:
+	"""
+		Remembers the etag and body of each response so that repeated requests can be sent with
+		`If-None-Match`. When the Api answers 304 Not Modified, the stored body is used instead,
+		and the parsed `ListResource` is reused rather than parsed again.
+
+		Parameters
+		----------
+		max_entries: int; default 10000
+			The number of responses kept. The least recently used are discarded first.
+	"""
+
+	def __init__(self, max_entries: int = 10000):
+		self.max_entries = max_entries
+		self._responses: 'OrderedDict[Tuple, Dict]' = OrderedDict()
+		self._resources: 'OrderedDict[Tuple[str, bool], ListResource]' = OrderedDict()
+		self._lock = threading.Lock()
+		self.hits = 0
+		self.misses = 0
+
+	def __len__(self):
+		return len(self._responses)
+
+	def __str__(self):
+		string = "EtagStore({} responses, {} hits, {} misses)".format(len(self), self.hits, self.misses)
+		return string
+
+	@staticmethod
+	def _touch(cache: OrderedDict, key, value, max_entries: int) -> None:
+		cache[key] = value
+		cache.move_to_end(key)
+		while len(cache) > max_entries:
+			cache.popitem(last = False)
+
+	def getEtag(self, endpoint: str, parameters: Dict) -> Optional[str]:
+		""" Returns the etag of the last response to this request, if any. """
+		with self._lock:
+			response = self._responses.get(makeRequestKey(endpoint, parameters))
+		return response.get('etag') if response else None
+
+	def getResponse(self, endpoint: str, parameters: Dict) -> Optional[Dict]:
+		with self._lock:
+			key = makeRequestKey(endpoint, parameters)
+			response = self._responses.get(key)
+			if response is None:
+				self.misses += 1
+			else:
+				self.hits += 1
+				self._responses.move_to_end(key)
+		return response
+
+	def store(self, endpoint: str, parameters: Dict, response: Dict) -> None:
+		""" Saves a successful response. Responses without an etag are ignored. """
+		if response.get('statusCode') != 200 or not response.get('etag'):
+			return
+		with self._lock:
+			self._touch(self._responses, makeRequestKey(endpoint, parameters), response, self.max_entries)
+
+	def toListResource(self, response: Dict, keep_raw: bool = False) -> ListResource:
+		"""
+			Parses a response, reusing the `ListResource` previously parsed from a response with the same etag
+			(and the same `keep_raw`). A copy is returned so that callers may extend its items without altering
+			the stored resource.
+		"""
+		etag = response.get('etag')
+		if etag is None or response.get('statusCode') not in {200, 304}:
+			return ListResource(response, keep_raw)
+
+		key = (etag, keep_raw)
+		with self._lock:
+			resource = self._resources.get(key)
+			if resource is not None:
+				self._resources.move_to_end(key)
+		if resource is None:
+			resource = ListResource(response, keep_raw)
+			with self._lock:
+				self._touch(self._resources, key, resource, self.max_entries)
+
+		resource = copy.copy(resource)
+		resource.items = list(resource.items)
+		resource.errors = list()
+		return resource
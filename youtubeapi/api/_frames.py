@@ -0,0 +1,114 @@
+from operator import attrgetter
+from typing import Callable, Dict, List, Sequence
+
+import numpy
+
+from ._isotime import parseDurations, parseTimestamps
+
+# Columns with few distinct values, which are stored as categoricals.
+CATEGORY_COLUMNS = {
+	'resourceType', 'itemType', 'channelId', 'channelName', 'playlistId', 'subscriberId', 'activityType',
+	'videoCategoryId', 'videoLanguage', 'videoAudioLanguage', 'videoDefinition', 'videoDimension', 'videoCaption'
+}
+
+
+def getColumnType(key: str) -> str:
+	""" Returns how a column is stored: 'category', 'int', 'date', 'duration' or 'object'. """
+	if key in CATEGORY_COLUMNS:
+		return 'category'
+	elif key.endswith(('Count', 'Position')):
+		return 'int'
+	elif key.endswith(('Date', 'PublishedAt')):
+		return 'date'
+	elif key.endswith('Duration'):
+		return 'duration'
+	else:
+		return 'object'
+
+
+def _toArray(key: str, values: Sequence) -> numpy.ndarray:
+	column_type = getColumnType(key)
+	if column_type == 'int':
+		try:
+			return numpy.array(values, dtype = 'int64')
+		except TypeError:
+			# Some values are None, which only happens when the items are of several kinds.
+			return numpy.array(values, dtype = 'float64')
+	elif column_type == 'date':
+		return parseTimestamps(values)
+	elif column_type == 'duration':
+		return parseDurations(values)
+	else:
+		array = numpy.empty(len(values), dtype = object)
+		array[:] = values
+		return array
+
+
+def getColumns(items: List, item_classes: List[type]) -> Dict[str, numpy.ndarray]:
+	"""
+		Reads every field of `items` into one typed array per field. Each field is read straight from the
+		slots of the resources, without creating a dict per item.
+	"""
+	keys = list(dict.fromkeys(
+		key for item_class in item_classes for key in (*item_class.id_attributes, *item_class.fields)
+	))
+	if not keys:
+		return dict()
+	if len(item_classes) == 1:
+		attributes = [item_classes[0].id_attributes.get(key, key) for key in keys]
+		values = [list(map(attrgetter(attribute), items)) for attribute in attributes]
+	else:
+		values = [[item[key] for item in items] for key in keys]
+	return {key: _toArray(key, column) for key, column in zip(keys, values)}
+
+
+def toFrame(columns: Dict[str, numpy.ndarray]):
+	import pandas
+
+	data = dict()
+	for key, column in columns.items():
+		if getColumnType(key) == 'category':
+			column = pandas.Categorical(column)
+		data[key] = column
+	return pandas.DataFrame(data)
+
+
+def toArrow(columns: Dict[str, numpy.ndarray]):
+	import pyarrow
+
+	arrays = list()
+	for key, column in columns.items():
+		# NaT and None are stored as nulls.
+		array = pyarrow.array(column, from_pandas = True)
+		if getColumnType(key) == 'category':
+			array = array.dictionary_encode()
+		arrays.append(array)
+	return pyarrow.Table.from_arrays(arrays, names = list(columns))
+
+
+def fromFrame(frame, getResourceClass: Callable[[str], type]) -> List:
+	"""
+		Rebuilds the resources from a frame made by `toFrame`, or a table made by `toArrow`.
+	"""
+	if hasattr(frame, 'to_pandas'):
+		frame = frame.to_pandas()
+
+	values = list()
+	for key in frame.columns:
+		column_type = getColumnType(key)
+		if column_type == 'date':
+			# Converted to datetime and timedelta objects, with None in place of NaT.
+			column = frame[key].to_numpy(dtype = 'datetime64[us]').tolist()
+		elif column_type == 'duration':
+			column = frame[key].to_numpy(dtype = 'timedelta64[us]').tolist()
+		elif column_type == 'int' and frame[key].dtype.kind in 'iu':
+			column = frame[key].tolist()
+		else:
+			column = frame[key].to_numpy(dtype = object, na_value = None).tolist()
+			# Lists (ex. tags) read from arrow are numpy arrays.
+			column = [value.tolist() if isinstance(value, numpy.ndarray) else value for value in column]
+		values.append(column)
+
+	keys = list(frame.columns)
+	rows = [dict(zip(keys, row)) for row in zip(*values)]
+	return [getResourceClass(row['resourceType']).fromSql(row) for row in rows]
@@ -0,0 +1,81 @@
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Iterable, Optional, Union
+
+import numpy
+
+# Ex. 'PT1H2M3S', 'P1DT12H', 'P0D' (livestreams). Years and months are never used by the Api.
+_DURATION_PATTERN = re.compile(
+	r'P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?'
+	r'(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+(?:\.\d+)?)S)?)?'
+)
+
+# The integer which numpy reads as NaT.
+_NOT_A_TIME = numpy.iinfo(numpy.int64).min
+_ONE_SECOND = timedelta(seconds = 1)
+
+
+def parseTimestamp(value: Union[str, datetime, None]) -> Optional[datetime]:
+	"""
+		Parses a timestamp returned by the Api (ex. '2019-05-31T17:00:04Z') as a naive datetime in UTC, which is
+		how dates are stored in the database. Datetimes with a timezone are converted to naive UTC as well, so
+		values read back from the database may be passed again. Returns None for empty values.
+	"""
+	if isinstance(value, str) and value:
+		if value.endswith('Z'):
+			value = value[:-1] + '+00:00'
+		value = datetime.fromisoformat(value)
+	elif not value:
+		return None
+	if value.tzinfo is not None:
+		value = value.astimezone(timezone.utc).replace(tzinfo = None)
+	return value
+
+
+@lru_cache(maxsize = 4096)
+def _parseDurationString(value: str) -> timedelta:
+	match = _DURATION_PATTERN.fullmatch(value)
+	if match is None or value[-1] in 'PT':
+		message = "'{}' is not a valid duration!".format(value)
+		raise ValueError(message)
+	return timedelta(**{unit: float(amount) for unit, amount in match.groupdict().items() if amount})
+
+
+def parseDuration(value: Union[str, timedelta, None]) -> Optional[timedelta]:
+	"""
+		Parses a duration returned by the Api (ex. 'PT1H2M3S'). The results are cached, since videos of
+		the same length are common. Returns None for empty values.
+	"""
+	if isinstance(value, timedelta):
+		return value
+	if not value:
+		return None
+	return _parseDurationString(value)
+
+
+def parseTimestamps(values: Iterable[Union[str, datetime, None]]) -> numpy.ndarray:
+	"""
+		Parses many timestamps at once into a `datetime64[s]` array in UTC. Timestamps in the usual 'Z' format
+		are parsed by numpy in a single pass. Missing values become NaT.
+	"""
+	normalized = list()
+	for value in values:
+		if isinstance(value, str) and value.endswith('Z'):
+			normalized.append(value[:-1])
+		elif isinstance(value, datetime) or (isinstance(value, str) and ('+' in value[10:] or '-' in value[10:])):
+			# Converted to UTC. numpy converts strings much faster than datetime objects.
+			normalized.append(parseTimestamp(value).isoformat())
+		else:
+			normalized.append(value or None)
+	return numpy.array(normalized, dtype = 'datetime64[us]').astype('datetime64[s]')
+
+
+def parseDurations(values: Iterable[Union[str, timedelta, None]]) -> numpy.ndarray:
+	""" Parses many durations at once into a `timedelta64[s]` array. Missing values become NaT. """
+	seconds = list()
+	for value in values:
+		duration = parseDuration(value)
+		seconds.append(_NOT_A_TIME if duration is None else duration // _ONE_SECOND)
+	# numpy converts integers much faster than timedelta objects.
+	return numpy.array(seconds, dtype = 'int64').view('timedelta64[s]')
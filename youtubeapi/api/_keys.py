@@ -0,0 +1,120 @@
+import threading
+import time
+from typing import Dict, List
+
+from ._quota import QuotaBudget, QuotaExceededError
+
+
+class ApiKeyPool:
+	"""
+		Shares requests between several api keys (ex. from separate projects), routing each request to the key
+		with the most quota remaining today. Keys which report that their quota is exhausted are skipped until
+		the quota resets at midnight Pacific time. The pool may be shared by any number of threads.
+
+		Parameters
+		----------
+		api_keys: list of str
+		daily_limit: int; default 10000
+			The number of units each key may use per day. Ignored when a `quota_budget` is given.
+		quota_budget: QuotaBudget; default None
+			If given, the remaining quota of each key is read from the (persisted) budget, so that separate runs
+			share the same usage. Otherwise usage is only tracked by this pool.
+	"""
+
+	def __init__(self, api_keys: List[str], daily_limit: int = 10000, quota_budget: QuotaBudget = None):
+		api_keys = list(dict.fromkeys(api_keys))
+		if not api_keys:
+			message = "An ApiKeyPool needs at least one api key!"
+			raise ValueError(message)
+		self.api_keys = api_keys
+		self.daily_limit = daily_limit
+		self.quota_budget = quota_budget
+
+		self._lock = threading.Lock()
+		self._day = QuotaBudget.today()
+		self._used: Dict[str, int] = {api_key: 0 for api_key in api_keys}
+		self._exhausted_until: Dict[str, float] = dict()
+
+	def __len__(self):
+		return len(self.api_keys)
+
+	def __str__(self):
+		string = "ApiKeyPool({} keys, {} available)".format(len(self), len(self.available()))
+		return string
+
+	def _rollover(self) -> None:
+		""" Forgets the usage of previous days. Must be called with the lock held. """
+		today = QuotaBudget.today()
+		if today != self._day:
+			self._day = today
+			self._used = {api_key: 0 for api_key in self.api_keys}
+
+	def used(self, api_key: str) -> int:
+		""" The number of units used by the key today. """
+		if self.quota_budget is not None:
+			return self.quota_budget.used(api_key)
+		with self._lock:
+			self._rollover()
+			return self._used.get(api_key, 0)
+
+	def remaining(self, api_key: str) -> int:
+		""" The number of units the key may still use today. """
+		if self.quota_budget is not None:
+			return self.quota_budget.remaining(api_key)
+		return max(0, self.daily_limit - self.used(api_key))
+
+	def usage(self) -> Dict[str, int]:
+		""" The number of units used today by each key. """
+		return {api_key: self.used(api_key) for api_key in self.api_keys}
+
+	def isExhausted(self, api_key: str) -> bool:
+		with self._lock:
+			exhausted_until = self._exhausted_until.get(api_key)
+			if exhausted_until is None:
+				return False
+			if time.monotonic() >= exhausted_until:
+				self._exhausted_until.pop(api_key)
+				return False
+			return True
+
+	def available(self) -> List[str]:
+		""" The keys which have not been marked as exhausted. """
+		return [api_key for api_key in self.api_keys if not self.isExhausted(api_key)]
+
+	def markExhausted(self, api_key: str, seconds: float = None) -> None:
+		"""
+			Skips the key for `seconds`, which defaults to the time until the daily quota resets.
+		"""
+		if seconds is None:
+			seconds = QuotaBudget.secondsUntilReset()
+		with self._lock:
+			self._exhausted_until[api_key] = time.monotonic() + seconds
+
+	def acquire(self, cost: int) -> str:
+		"""
+			Returns the available key with the most quota remaining.
+		Raises
+		------
+		QuotaExceededError
+			If no key can afford `cost` units. When the quota budget's policy is 'defer', this instead
+			blocks until the quota resets.
+		"""
+		while True:
+			candidates = [(self.remaining(api_key), api_key) for api_key in self.available()]
+			candidates = [(remaining, api_key) for remaining, api_key in candidates if remaining >= cost]
+			if candidates:
+				# Ties go to the earliest key, so that a fresh pool uses its keys in order.
+				return max(candidates, key = lambda candidate: candidate[0])[1]
+
+			if self.quota_budget is None or self.quota_budget.policy != 'defer':
+				message = "None of the {} api keys can afford a request costing {} units.".format(len(self), cost)
+				raise QuotaExceededError(message)
+			time.sleep(QuotaBudget.secondsUntilReset() + 1)
+			with self._lock:
+				self._exhausted_until.clear()
+
+	def charge(self, api_key: str, cost: int) -> None:
+		""" Records that a request costing `cost` units was sent with `api_key`. """
+		with self._lock:
+			self._rollover()
+			self._used[api_key] = self._used.get(api_key, 0) + cost
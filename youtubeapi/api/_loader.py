@@ -0,0 +1,195 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ._api import YouTube, ResourceType
+
+
+class BatchLoader:
+	"""
+		Coalesces lookups of individual channels, videos and playlists into batched requests of up to 50 ids.
+		Ids are first queued, then retrieved together the first time any of them is needed. Each id is only
+		requested once per window, however many times it is queued or loaded.
+
+		Synchronous callers queue the ids they will need (`queue`) and then `load` them one at a time.
+		Asynchronous callers only need `loadAsync`: every id requested during the same iteration of the
+		event loop is dispatched together.
+
+		Parameters
+		----------
+		api: YouTube
+		window: float; default None
+			How long retrieved items are remembered, in seconds. By default they are kept until `clear()`.
+		max_size: int; default 10000
+			The maximum number of retrieved items which are remembered. The least recently used are forgotten first.
+	"""
+	batch_size = 50
+	supported_kinds = ('youtube#channel', 'youtube#playlist', 'youtube#video')
+
+	def __init__(self, api: YouTube, window: float = None, max_size: int = 10000):
+		self.api = api
+		self.window = window
+		self.max_size = max_size
+		self.request_count = 0
+
+		self._pending: Dict[str, 'OrderedDict[str, None]'] = {kind: OrderedDict() for kind in self.supported_kinds}
+		self._results: 'OrderedDict[Tuple[str, str], Tuple[float, Optional[ResourceType]]]' = OrderedDict()
+		self._lock = threading.RLock()
+
+		self._futures: Dict[Tuple[str, str], asyncio.Future] = dict()
+		self._dispatch_scheduled = False
+
+	def _getKind(self, kind: str) -> str:
+		kind = self.api.normalizeEndpoint(kind)
+		if kind not in self.supported_kinds:
+			message = "'{}' cannot be loaded in batches!".format(kind)
+			raise ValueError(message)
+		return kind
+
+	def _getResult(self, kind: str, item_id: str) -> Tuple[bool, Optional[ResourceType]]:
+		result = self._results.get((kind, item_id))
+		if result is None:
+			return False, None
+		retrieved, resource = result
+		if self.window is not None and time.monotonic() - retrieved > self.window:
+			self._results.pop((kind, item_id))
+			return False, None
+		self._results.move_to_end((kind, item_id))
+		return True, resource
+
+	def queue(self, kind: str, ids: Iterable[str]) -> None:
+		""" Adds ids to the next batch of `kind`, unless they have already been retrieved. """
+		kind = self._getKind(kind)
+		with self._lock:
+			pending = self._pending[kind]
+			for item_id in ids:
+				if not self._getResult(kind, item_id)[0]:
+					pending[item_id] = None
+
+	def dispatch(self, kind: str = None) -> int:
+		"""
+			Retrieves every queued id, 50 at a time.
+		Parameters
+		----------
+		kind: str; default None
+			Only dispatch the ids of this kind. Defaults to every kind.
+
+		Returns
+		-------
+			int
+				The number of requests sent.
+		"""
+		kinds = self.supported_kinds if kind is None else [self._getKind(kind)]
+		return self._dispatch(kinds)[0]
+
+	def _dispatch(self, kinds: Iterable[str],
+			limit: int = None) -> Tuple[int, Dict[Tuple[str, str], Optional[ResourceType]]]:
+		""" Retrieves up to `limit` queued ids of each kind. Also returns the results, which may already be evicted. """
+		request_count = 0
+		results = dict()
+		for kind in kinds:
+			with self._lock:
+				pending = self._pending[kind]
+				ids = list(islice(pending, limit))
+				for item_id in ids:
+					del pending[item_id]
+			for start in range(0, len(ids), self.batch_size):
+				chunk = ids[start:start + self.batch_size]
+				try:
+					response = self.api.get(kind, chunk)
+				except Exception:
+					self.queue(kind, ids[start:])
+					raise
+				request_count += 1
+				if response.status_code != 200:
+					# The ids of failed requests (exceeded quota, server errors, open circuit) are queued again
+					# rather than remembered as missing, so they are retried by the next dispatch.
+					self.queue(kind, ids[start:])
+					break
+				results.update(self._storeResults(kind, chunk, response.items))
+		self.request_count += request_count
+		return request_count, results
+
+	def _storeResults(self, kind: str, ids: List[str],
+			items: List[ResourceType]) -> Dict[Tuple[str, str], Optional[ResourceType]]:
+		retrieved = time.monotonic()
+		resources = {item.item_id: item for item in items}
+		# Ids missing from the response don't exist, so they are remembered as `None`.
+		results = {(kind, item_id): resources.get(item_id) for item_id in ids}
+		with self._lock:
+			for key, resource in results.items():
+				self._results[key] = (retrieved, resource)
+				self._results.move_to_end(key)
+			while len(self._results) > self.max_size:
+				self._results.popitem(last = False)
+		return results
+
+	def load(self, kind: str, item_id: str) -> Optional[ResourceType]:
+		"""
+			Returns the resource with the given id, or `None` if it does not exist or couldn't be retrieved. If it
+			hasn't been retrieved yet, it is requested together with the other queued ids of the same kind, up to
+			`max_size` of them.
+		"""
+		kind = self._getKind(kind)
+		with self._lock:
+			found, resource = self._getResult(kind, item_id)
+			if found:
+				return resource
+			pending = self._pending[kind]
+			pending[item_id] = None
+			pending.move_to_end(item_id, last = False)
+		# Limited so that the results of this dispatch don't evict each other before they are loaded.
+		results = self._dispatch([kind], self.max_size)[1]
+		return results.get((kind, item_id))
+
+	def loadMany(self, kind: str, ids: List[str]) -> List[Optional[ResourceType]]:
+		""" Returns the resources with the given ids, in the same order. """
+		self.queue(kind, ids)
+		return [self.load(kind, item_id) for item_id in ids]
+
+	async def loadAsync(self, kind: str, item_id: str) -> Optional[ResourceType]:
+		"""
+			Asynchronous version of `load`. Ids requested by concurrent tasks during the same iteration of the
+			event loop are dispatched as a single batch on a worker thread.
+		"""
+		kind = self._getKind(kind)
+		with self._lock:
+			found, resource = self._getResult(kind, item_id)
+		if found:
+			return resource
+
+		loop = asyncio.get_event_loop()
+		key = (kind, item_id)
+		future = self._futures.get(key)
+		if future is None:
+			future = self._futures[key] = loop.create_future()
+			self.queue(kind, [item_id])
+			if not self._dispatch_scheduled:
+				self._dispatch_scheduled = True
+				loop.call_soon(lambda: asyncio.ensure_future(self._dispatchAsync()))
+		return await future
+
+	async def _dispatchAsync(self) -> None:
+		self._dispatch_scheduled = False
+		futures = self._futures
+		self._futures = dict()
+
+		loop = asyncio.get_event_loop()
+		try:
+			results = (await loop.run_in_executor(None, self._dispatch, self.supported_kinds))[1]
+		except Exception as exception:
+			for future in futures.values():
+				future.set_exception(exception)
+			return
+		with self._lock:
+			for key, future in futures.items():
+				# Ids retrieved by an earlier dispatch weren't requested again.
+				future.set_result(results[key] if key in results else self._getResult(*key)[1])
+
+	def clear(self) -> None:
+		""" Forgets every retrieved item, starting a new window. """
+		with self._lock:
+			self._results.clear()
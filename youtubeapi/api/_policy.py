@@ -0,0 +1,245 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Mapping, Optional
+
+from ._quota import QuotaBudget, QuotaExceededError
+
+
+def getErrorReason(response: Dict) -> Optional[str]:
+	""" Extracts the reason (ex. 'quotaExceeded') from an error response of the Youtube Api. """
+	error = response.get('error')
+	if not isinstance(error, dict):
+		return None
+	errors = error.get('errors') or [{}]
+	return errors[0].get('reason')
+
+
+class TokenBucket:
+	"""
+		Limits the rate of requests. Tokens are added continuously at `rate` per second up to `capacity`,
+		and each request takes one token, waiting if none are available.
+
+		Parameters
+		----------
+		rate: float
+			The sustained number of requests per second.
+		capacity: int; default None
+			The largest burst allowed. Defaults to `rate`.
+	"""
+
+	def __init__(self, rate: float, capacity: int = None):
+		self.rate = rate
+		self.capacity = capacity if capacity is not None else max(1, rate)
+		self._tokens = self.capacity
+		self._updated = time.monotonic()
+		self._lock = threading.Lock()
+
+	def acquire(self, tokens: int = 1) -> float:
+		"""
+			Takes `tokens` from the bucket, blocking until enough are available.
+			Returns the number of seconds spent waiting.
+		"""
+		waited = 0.0
+		while True:
+			with self._lock:
+				now = time.monotonic()
+				self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+				self._updated = now
+				if self._tokens >= tokens:
+					self._tokens -= tokens
+					return waited
+				delay = (tokens - self._tokens) / self.rate
+			time.sleep(delay)
+			waited += delay
+
+
+class RetryPolicy:
+	"""
+		Decides whether a failed request should be sent again, and how long to wait before doing so.
+		Delays grow exponentially with 'full jitter', and a `Retry-After` header always takes precedence. A request
+		whose `Retry-After` is longer than `max_delay` isn't retried, rather than stalling the caller.
+
+		Parameters
+		----------
+		max_retries: int; default 5
+		base_delay: float; default 1.0
+			The delay before the first retry, in seconds.
+		max_delay: float; default 64.0
+			The upper bound of any single delay, in seconds.
+		retry_statuses: iterable<int>
+			The status codes which are always retried.
+		retry_reasons: iterable<str>
+			Error reasons which are retried regardless of status code. Daily quota errors are not retried,
+			since they will not succeed until the quota resets.
+	"""
+	default_statuses = frozenset({429, 500, 502, 503, 504})
+	default_reasons = frozenset({'rateLimitExceeded', 'userRateLimitExceeded', 'backendError', 'internalError'})
+
+	def __init__(self, max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 64.0,
+			retry_statuses: Iterable[int] = None, retry_reasons: Iterable[str] = None):
+		self.max_retries = max_retries
+		self.base_delay = base_delay
+		self.max_delay = max_delay
+		self.retry_statuses = frozenset(retry_statuses) if retry_statuses is not None else self.default_statuses
+		self.retry_reasons = frozenset(retry_reasons) if retry_reasons is not None else self.default_reasons
+
+	def isRetryable(self, status_code: Optional[int], response: Dict = None) -> bool:
+		if status_code is None:  # The connection failed or timed out.
+			return True
+		if status_code in self.retry_statuses:
+			return True
+		return response is not None and getErrorReason(response) in self.retry_reasons
+
+	@staticmethod
+	def parseRetryAfter(value: Optional[str]) -> Optional[float]:
+		""" Converts a `Retry-After` header, given either in seconds or as an HTTP date, into seconds. """
+		if not value:
+			return None
+		try:
+			return max(0.0, float(value))
+		except ValueError:
+			pass
+		try:
+			retry_date = parsedate_to_datetime(value)
+		except (TypeError, ValueError):
+			return None
+		if retry_date.tzinfo is None:
+			retry_date = retry_date.replace(tzinfo = timezone.utc)
+		return max(0.0, (retry_date - datetime.now(timezone.utc)).total_seconds())
+
+	def getDelay(self, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+		""" The delay before the next retry, or `None` if the server asked to wait longer than `max_delay`. """
+		delay = self.parseRetryAfter(retry_after)
+		if delay is None:
+			delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+		elif delay > self.max_delay:
+			return None
+		return delay
+
+
+class CircuitBreaker:
+	"""
+		Pauses an api key after it repeatedly reports that its quota is exhausted, so that further requests
+		fail immediately instead of being sent.
+
+		Parameters
+		----------
+		threshold: int; default 3
+			The number of consecutive quota errors which opens the circuit.
+		cooldown: float; default None
+			How long the key is paused, in seconds. Defaults to the time until the daily quota resets.
+	"""
+	quota_reasons = frozenset({'quotaExceeded', 'dailyLimitExceeded'})
+
+	def __init__(self, threshold: int = 3, cooldown: float = None):
+		self.threshold = threshold
+		self.cooldown = cooldown
+		self._failures: Dict[str, int] = dict()
+		self._paused_until: Dict[str, float] = dict()
+		self._lock = threading.Lock()
+
+	def isOpen(self, api_key: str) -> bool:
+		with self._lock:
+			paused_until = self._paused_until.get(api_key)
+			if paused_until is None:
+				return False
+			if time.monotonic() >= paused_until:
+				self._paused_until.pop(api_key)
+				self._failures.pop(api_key, None)
+				return False
+			return True
+
+	def getPause(self, api_key: str) -> Optional[float]:
+		""" How long the key is still paused for, in seconds, or `None` if it isn't. """
+		if not self.isOpen(api_key):
+			return None
+		with self._lock:
+			return max(0.0, self._paused_until.get(api_key, time.monotonic()) - time.monotonic())
+
+	def check(self, api_key: str) -> None:
+		"""
+		Raises
+		------
+		QuotaExceededError
+			If the key is currently paused.
+		"""
+		seconds = self.getPause(api_key)
+		if seconds is not None:
+			message = "The api key is paused for another {:.0f} seconds after repeated quota errors.".format(seconds)
+			raise QuotaExceededError(message)
+
+	def recordResponse(self, api_key: str, response: Dict) -> None:
+		with self._lock:
+			if getErrorReason(response) in self.quota_reasons:
+				failures = self._failures.get(api_key, 0) + 1
+				self._failures[api_key] = failures
+				if failures >= self.threshold:
+					cooldown = self.cooldown if self.cooldown is not None else QuotaBudget.secondsUntilReset()
+					self._paused_until[api_key] = time.monotonic() + cooldown
+			elif 'error' not in response:
+				self._failures.pop(api_key, None)
+
+
+class RequestPolicy:
+	"""
+		Combines the rate limiter, retry policy and circuit breaker applied to every request sent by `YouTube`.
+		Any of the three may be disabled by passing `None`.
+
+		Parameters
+		----------
+		rate_limiter: TokenBucket; default None
+		retry: RetryPolicy; default RetryPolicy()
+		circuit_breaker: CircuitBreaker; default CircuitBreaker()
+	"""
+	_default = object()
+
+	def __init__(self, rate_limiter: TokenBucket = None, retry: RetryPolicy = _default,
+			circuit_breaker: CircuitBreaker = _default):
+		self.rate_limiter = rate_limiter
+		self.retry = RetryPolicy() if retry is self._default else retry
+		self.circuit_breaker = CircuitBreaker() if circuit_breaker is self._default else circuit_breaker
+
+	def beforeRequest(self, api_key: str) -> None:
+		""" Blocks until the request may be sent, or raises a `QuotaExceededError` if the key is paused. """
+		if self.circuit_breaker is not None:
+			self.circuit_breaker.check(api_key)
+		if self.rate_limiter is not None:
+			self.rate_limiter.acquire()
+
+	def getPause(self, api_key: str) -> Optional[float]:
+		""" How long the circuit breaker still pauses the key for, in seconds, or `None` if it doesn't. """
+		if self.circuit_breaker is None:
+			return None
+		return self.circuit_breaker.getPause(api_key)
+
+	def getRetryDelay(self, api_key: str, attempt: int, status_code: Optional[int], response: Dict = None,
+			headers: Mapping[str, str] = None) -> Optional[float]:
+		"""
+			Records the outcome of a request and returns how long to wait before retrying it,
+			or `None` if it should not be retried.
+		Parameters
+		----------
+		api_key: str
+		attempt: int
+			The number of retries already made.
+		status_code: int
+			`None` if no response was received.
+		response: dict
+			The decoded response.
+		headers: dict
+			The response headers.
+		"""
+		if response is not None and self.circuit_breaker is not None:
+			self.circuit_breaker.recordResponse(api_key, response)
+
+		if status_code == 200 or status_code == 304:
+			return None
+		if self.retry is None or attempt >= self.retry.max_retries:
+			return None
+		if not self.retry.isRetryable(status_code, response):
+			return None
+		retry_after = headers.get('Retry-After') if headers is not None else None
+		return self.retry.getDelay(attempt, retry_after)
@@ -0,0 +1,89 @@
+from typing import Dict
+
+_PAGE_FIELDS = 'kind,etag,nextPageToken,prevPageToken,pageInfo'
+
+
+class RequestProfile:
+	"""
+		A named set of `part` and `fields` parameters for each resource kind. Requesting only the parts
+		that are needed lowers the quota cost of a request, and `fields` trims the payload to the values
+		that are actually parsed.
+
+		Parameters
+		----------
+		name: str
+		parameters: dict<str, dict<str,str>>
+			The 'part' and 'fields' parameters to use for each resource kind. Kinds without an entry use
+			the defaults from `YouTube.getDefaultApiParameters`.
+	"""
+
+	def __init__(self, name: str, parameters: Dict[str, Dict[str, str]]):
+		self.name = name
+		self.parameters = parameters
+
+	def __str__(self):
+		string = "RequestProfile('{}', {})".format(self.name, sorted(self.parameters))
+		return string
+
+	def getParameters(self, endpoint: str) -> Dict[str, str]:
+		""" Returns the parameters this profile uses for the given resource kind. """
+		return dict(self.parameters.get(endpoint, {}))
+
+
+PROFILES: Dict[str, RequestProfile] = {
+	# Everything the resource classes parse. Equivalent to the default parameters.
+	'full':              RequestProfile('full', {}),
+
+	# Just enough to identify an item and its owner.
+	'identity':          RequestProfile('identity', {
+		'youtube#video':        {
+			'part':   'id,snippet',
+			'fields': _PAGE_FIELDS + ',items(kind,etag,id,snippet(title,channelId,channelTitle,publishedAt))'
+		},
+		'youtube#channel':      {
+			'part':   'id,snippet',
+			'fields': _PAGE_FIELDS + ',items(kind,etag,id,snippet(title,customUrl,country))'
+		},
+		'youtube#playlist':     {
+			'part':   'id,snippet',
+			'fields': _PAGE_FIELDS + ',items(kind,etag,id,snippet(title,channelId,channelTitle,publishedAt))'
+		},
+		'youtube#playlistItem': {
+			'part':   'id,snippet',
+			'fields': _PAGE_FIELDS + ',items(kind,etag,id,snippet(title,playlistId,position,publishedAt,resourceId))'
+		}
+	}),
+
+	# Only the counters. Used to refresh the statistics of items which are already in the database.
+	'stats-only':        RequestProfile('stats-only', {
+		'youtube#video':   {
+			'part':   'id,statistics',
+			'fields': _PAGE_FIELDS + ',items(kind,etag,id,statistics)'
+		},
+		'youtube#channel': {
+			'part':   'id,statistics',
+			'fields': _PAGE_FIELDS + ',items(kind,etag,id,statistics)'
+		}
+	}),
+
+	# Only the ids needed to walk a channel's uploads.
+	'uploads-discovery': RequestProfile('uploads-discovery', {
+		'youtube#channel':      {
+			'part':   'id,contentDetails',
+			'fields': _PAGE_FIELDS + ',items(kind,etag,id,contentDetails/relatedPlaylists/uploads)'
+		},
+		'youtube#playlistItem': {
+			'part':   'id,contentDetails',
+			'fields': _PAGE_FIELDS + ',items(kind,etag,id,contentDetails(videoId,videoPublishedAt))'
+		}
+	})
+}
+
+
+def getProfile(profile) -> RequestProfile:
+	if isinstance(profile, RequestProfile):
+		return profile
+	if profile not in PROFILES:
+		message = "'{}' is not a valid request profile! Expected one of {}".format(profile, sorted(PROFILES))
+		raise ValueError(message)
+	return PROFILES[profile]
@@ -0,0 +1,187 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator
+
+from ..github import DATA_FOLDER
+
+try:
+	from zoneinfo import ZoneInfo
+
+	PACIFIC_TIMEZONE = ZoneInfo('America/Los_Angeles')
+except ImportError:
+	# Without tz data the reset time drifts by an hour during daylight saving time.
+	PACIFIC_TIMEZONE = timezone(timedelta(hours = -8), 'PST')
+
+
+class QuotaExceededError(RuntimeError):
+	""" Raised when a request would exceed the daily quota of an api key. """
+	pass
+
+
+class QuotaBudget:
+	"""
+		Tracks the quota used by each api key over the current quota day. The Youtube Api resets
+		every key's quota at midnight Pacific time, so usage is recorded per Pacific calendar day.
+		Usage is persisted so that separate runs of an importer, including runs in parallel processes, share the
+		same budget. Charges are written every `sync_interval` seconds (and when the process exits): the usage
+		saved by the other processes is read back under a file lock and added to, rather than overwritten.
+		Parallel processes may therefore exceed the limit by the units they use during one interval.
+
+		Parameters
+		----------
+		daily_limit: int; default 10000
+			The maximum number of units each key may use per day.
+		filename: str; default None
+			Where the usage is saved. Defaults to 'quota_usage.json' in `DATA_FOLDER`. Keys are stored
+			as a fingerprint rather than in plain text.
+		policy: {'refuse', 'defer'}; default 'refuse'
+			What to do when a request would exceed the limit.
+			* 'refuse': raise a `QuotaExceededError`.
+			* 'defer': block until the quota resets, then continue.
+		sync_interval: float; default 5.0
+			How often the usage is saved and the usage of other processes read, in seconds. If 0, every
+			charge is saved immediately.
+	"""
+
+	def __init__(self, daily_limit: int = 10000, filename: str = None, policy: str = 'refuse',
+			sync_interval: float = 5.0):
+		if policy not in {'refuse', 'defer'}:
+			message = "'{}' is not a valid quota policy!".format(policy)
+			raise ValueError(message)
+		if filename is None:
+			filename = os.path.join(DATA_FOLDER, 'quota_usage.json')
+
+		self.daily_limit = daily_limit
+		self.filename = filename
+		self.policy = policy
+		self.sync_interval = sync_interval
+
+		self._lock = threading.RLock()
+		self._usage: Dict[str, Dict[str, int]] = self._load()
+		# The units charged since the usage was last saved, by day and key.
+		self._unsaved: Dict[str, Dict[str, int]] = dict()
+		self._last_sync = time.monotonic()
+
+		reference = weakref.ref(self)
+		atexit.register(lambda: reference() is not None and reference().save())
+
+	def __str__(self):
+		string = "QuotaBudget('{}', {} keys, limit = {})".format(self.today(), len(self._getDay()), self.daily_limit)
+		return string
+
+	@staticmethod
+	def today() -> str:
+		""" The current quota day, as an ISO date in Pacific time. """
+		return datetime.now(PACIFIC_TIMEZONE).date().isoformat()
+
+	@staticmethod
+	def nextReset() -> datetime:
+		""" The time at which every key's quota next resets, in UTC. """
+		now = datetime.now(PACIFIC_TIMEZONE)
+		tomorrow = (now + timedelta(days = 1)).date()
+		reset = datetime(tomorrow.year, tomorrow.month, tomorrow.day, tzinfo = PACIFIC_TIMEZONE)
+		return reset.astimezone(timezone.utc)
+
+	@classmethod
+	def secondsUntilReset(cls) -> float:
+		return max(0.0, (cls.nextReset() - datetime.now(timezone.utc)).total_seconds())
+
+	@staticmethod
+	def _keyId(api_key: str) -> str:
+		return hashlib.sha1(str(api_key).encode('utf-8')).hexdigest()[:12]
+
+	def _load(self) -> Dict[str, Dict[str, int]]:
+		if not os.path.exists(self.filename):
+			return dict()
+		try:
+			with open(self.filename) as file1:
+				usage = json.load(file1)
+		except (OSError, ValueError):
+			usage = dict()
+		return usage
+
+	@contextmanager
+	def _lockFile(self) -> Iterator[None]:
+		""" Keeps other processes from saving the usage at the same time. """
+		folder = os.path.dirname(self.filename)
+		if folder:
+			os.makedirs(folder, exist_ok = True)
+		with open(self.filename + '.lock', 'a+') as lock_file:
+			try:
+				import fcntl
+				fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+			except ImportError:
+				import msvcrt
+				lock_file.seek(0)
+				msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+			# The lock is released when the file is closed.
+			yield
+
+	def save(self) -> None:
+		""" Adds the units charged since the last save to the usage saved by every process, and reads it back. """
+		with self._lock, self._lockFile():
+			today = self.today()
+			# Only the current day is relevant once the quota has reset.
+			day = self._load().get(today, dict())
+			unsaved = self._unsaved.get(today)
+			if unsaved:
+				for key_id, cost in unsaved.items():
+					day[key_id] = day.get(key_id, 0) + cost
+				temporary_filename = self.filename + '.tmp'
+				with open(temporary_filename, 'w') as file1:
+					json.dump({today: day}, file1, indent = 4, sort_keys = True)
+				os.replace(temporary_filename, self.filename)
+			self._usage = {today: day}
+			self._unsaved = dict()
+			self._last_sync = time.monotonic()
+
+	def _getDay(self) -> Dict[str, int]:
+		return self._usage.setdefault(self.today(), dict())
+
+	def used(self, api_key: str) -> int:
+		""" The number of units used by the key today. """
+		with self._lock:
+			return self._getDay().get(self._keyId(api_key), 0)
+
+	def remaining(self, api_key: str) -> int:
+		""" The number of units the key may still use today. """
+		return max(0, self.daily_limit - self.used(api_key))
+
+	def canAfford(self, api_key: str, cost: int) -> bool:
+		return cost <= self.remaining(api_key)
+
+	def charge(self, api_key: str, cost: int) -> None:
+		"""
+			Records that a request costing `cost` units is being sent with `api_key`.
+		Raises
+		------
+		QuotaExceededError
+			If the request would exceed the daily limit and the policy is 'refuse'.
+		"""
+		while True:
+			with self._lock:
+				if time.monotonic() - self._last_sync >= self.sync_interval:
+					self.save()
+				if self.canAfford(api_key, cost):
+					day = self._getDay()
+					key_id = self._keyId(api_key)
+					day[key_id] = day.get(key_id, 0) + cost
+					unsaved = self._unsaved.setdefault(self.today(), dict())
+					unsaved[key_id] = unsaved.get(key_id, 0) + cost
+					if self.sync_interval <= 0:
+						self.save()
+					return
+
+			if self.policy == 'refuse':
+				message = "A request costing {} units would exceed the remaining quota ({} of {} units).".format(
+					cost, self.remaining(api_key), self.daily_limit
+				)
+				raise QuotaExceededError(message)
+			time.sleep(self.secondsUntilReset() + 1)
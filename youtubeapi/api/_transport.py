@@ -0,0 +1,154 @@
+import gzip
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from ..github import DATA_FOLDER
+
+CASSETTE_FOLDER = os.path.join(DATA_FOLDER, 'cassettes')
+
+
+class Cassette:
+	"""
+		A set of recorded Api responses, saved as a single gzip-compressed json file. Each response is keyed by
+		the Api method (ex. 'videos') and its parameters, without the api key, so a cassette recorded against the
+		real Api can be replayed against any base url and with any key.
+
+		Parameters
+		----------
+		filename: str
+			Either a path, or a name which is saved as '<name>.json.gz' in `DATA_FOLDER/cassettes`.
+	"""
+	# Only these headers are recorded; the others vary between requests or describe the original transfer.
+	recorded_headers = ('Content-Type', 'ETag', 'Retry-After')
+
+	def __init__(self, filename: str):
+		if os.path.sep not in filename and '/' not in filename:
+			filename = os.path.join(CASSETTE_FOLDER, filename + '.json.gz')
+		self.filename = filename
+		self.entries: Dict[str, Dict] = dict()
+		self._lock = threading.Lock()
+		self._unsaved = 0
+
+		if os.path.exists(self.filename):
+			with gzip.open(self.filename, 'rt', encoding = 'utf-8') as file1:
+				self.entries = json.load(file1)['entries']
+
+	def __len__(self):
+		return len(self.entries)
+
+	def __str__(self):
+		string = "Cassette('{}', {} responses)".format(self.filename, len(self))
+		return string
+
+	@staticmethod
+	def makeKey(url: str, parameters: Dict) -> str:
+		method = urlparse(url).path.rstrip('/').split('/')[-1]
+		return json.dumps([method] + sorted([k, str(v)] for k, v in parameters.items() if k != 'key'))
+
+	def record(self, url: str, parameters: Dict, response: requests.Response, elapsed: float) -> None:
+		entry = {
+			'statusCode': response.status_code,
+			'headers':    {k: response.headers[k] for k in self.recorded_headers if k in response.headers},
+			# 'surrogateescape' keeps the body byte-for-byte even if it isn't valid utf-8.
+			'body':       response.content.decode('utf-8', errors = 'surrogateescape'),
+			'elapsed':    elapsed
+		}
+		with self._lock:
+			self.entries[self.makeKey(url, parameters)] = entry
+			self._unsaved += 1
+
+	def find(self, url: str, parameters: Dict) -> Optional[Dict]:
+		return self.entries.get(self.makeKey(url, parameters))
+
+	def save(self) -> None:
+		with self._lock:
+			folder = os.path.dirname(self.filename)
+			if folder:
+				os.makedirs(folder, exist_ok = True)
+			with gzip.open(self.filename, 'wt', encoding = 'utf-8') as file1:
+				json.dump({'version': 1, 'entries': self.entries}, file1)
+			self._unsaved = 0
+
+
+class ReplayedResponse:
+	""" The parts of `requests.Response` used by `YouTube`, rebuilt from a cassette entry. """
+
+	def __init__(self, entry: Dict, url: str):
+		self.url = url
+		self.status_code: int = entry['statusCode']
+		self.headers = CaseInsensitiveDict(entry['headers'])
+		self.content: bytes = entry['body'].encode('utf-8', errors = 'surrogateescape')
+		self.elapsed_seconds: float = entry['elapsed']
+
+	@property
+	def text(self) -> str:
+		return self.content.decode('utf-8', errors = 'replace')
+
+	def json(self) -> Dict:
+		return json.loads(self.content)
+
+
+class CassetteTransport:
+	"""
+		Sends the requests of `YouTube` in place of its session, recording the responses to a cassette or
+		replaying them from it.
+
+		Parameters
+		----------
+		session: requests.Session
+			Used to send the requests which are recorded.
+		cassette: Cassette
+		mode: {'record', 'replay', 'auto'}; default 'replay'
+			* 'record': every request is sent and its response recorded.
+			* 'replay': every response comes from the cassette. A request which wasn't recorded raises a `LookupError`.
+			* 'auto': responses are replayed when recorded, otherwise sent and recorded.
+		emulate_latency: bool; default False
+			If True, replayed responses take as long as the recorded ones did.
+		autosave: int; default 50
+			The cassette is saved after this many new recordings, as well as when the transport is closed.
+	"""
+
+	def __init__(self, session: requests.Session, cassette: Cassette, mode: str = 'replay',
+			emulate_latency: bool = False, autosave: int = 50):
+		if mode not in {'record', 'replay', 'auto'}:
+			message = "'{}' is not a valid cassette mode!".format(mode)
+			raise ValueError(message)
+		self.session = session
+		self.cassette = cassette
+		self.mode = mode
+		self.emulate_latency = emulate_latency
+		self.autosave = autosave
+
+	def get(self, url: str, params: Dict = None, headers: Dict = None, timeout: float = None, **kwargs):
+		params = params or dict()
+		if self.mode != 'record':
+			entry = self.cassette.find(url, params)
+			if entry is not None:
+				if self.emulate_latency:
+					time.sleep(entry['elapsed'])
+				return ReplayedResponse(entry, url)
+			if self.mode == 'replay':
+				message = "No response was recorded for {} in {}".format(Cassette.makeKey(url, params), self.cassette)
+				raise LookupError(message)
+
+		# The full body is always requested and read immediately so that it can be recorded and replayed.
+		if headers:
+			headers = {k: v for k, v in headers.items() if k != 'If-None-Match'}
+		kwargs['stream'] = False
+		start = time.perf_counter()
+		response = self.session.get(url, params = params, headers = headers, timeout = timeout, **kwargs)
+		self.cassette.record(url, params, response, time.perf_counter() - start)
+		if self.cassette._unsaved >= self.autosave:
+			self.cassette.save()
+		return response
+
+	def close(self) -> None:
+		if self.cassette._unsaved:
+			self.cassette.save()
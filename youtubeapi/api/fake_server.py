@@ -0,0 +1,724 @@
+"""
+	A local stand-in for the Youtube Data Api, used to load-test the client and the importers without
+	using any real quota.
+
+	The server answers `videos`, `channels`, `playlists`, `playlistItems`, `activities`, `search`,
+	`subscriptions` and `commentThreads` requests in the same wire format as the real Api, with opaque page
+	tokens, etags (honouring `If-None-Match`) and gzip compression. Latency, transient errors and quota
+	exhaustion can be injected. The data comes from a `SyntheticCatalog`, which generates channels with any
+	number of uploads deterministically from a seed.
+
+	Usage
+	-----
+		with FakeYouTubeServer(SyntheticCatalog(channel_count = 5, uploads_per_channel = 1000)) as server:
+			youtube = YouTube('any-key', base_url = server.base_url)
+
+		python -m youtubeapi.api.fake_server --port 8080 --channels 10 --uploads 500 --latency 0.05
+"""
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from ._api import YouTube
+
+_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_'
+_WORDS = [
+	"let's", 'play', 'watch', 'funhaus', 'achievement', 'hunter', 'rooster', 'teeth', 'minecraft', 'halo',
+	'gta', 'podcast', 'episode', 'part', 'finale', 'crash', 'bandicoot', 'vs', 'challenge', 'highlights'
+]
+
+
+def _formatDate(value: datetime) -> str:
+	return value.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+class SyntheticCatalog:
+	"""
+		Deterministically generates channels, their uploads and their playlists. The same seed always
+		produces the same ids, titles, dates and statistics.
+
+		Parameters
+		----------
+		channel_count: int; default 10
+		uploads_per_channel: int; default 100
+		seed: int; default 0
+	"""
+	start_date = datetime(2012, 1, 1)
+
+	def __init__(self, channel_count: int = 10, uploads_per_channel: int = 100, seed: int = 0):
+		self.seed = seed
+		self.channels: Dict[str, Dict] = dict()
+		self.videos: Dict[str, Dict] = dict()
+		self.playlists: Dict[str, Dict] = dict()
+		# Playlist id -> video ids, in playlist order.
+		self.playlist_items: Dict[str, List[str]] = dict()
+		self._lock = threading.RLock()
+
+		for _ in range(channel_count):
+			self.addChannel(uploads_per_channel)
+
+	def _random(self, *args) -> random.Random:
+		return random.Random('{}:{}'.format(self.seed, ':'.join(map(str, args))))
+
+	@staticmethod
+	def _makeId(generator: random.Random, length: int) -> str:
+		return ''.join(generator.choice(_ALPHABET) for _ in range(length))
+
+	@staticmethod
+	def _makeTitle(generator: random.Random, word_count: int = 6) -> str:
+		return ' '.join(generator.choice(_WORDS) for _ in range(word_count))
+
+	def addChannel(self, upload_count: int = 100) -> str:
+		""" Adds a channel with `upload_count` uploads and one playlist, returning the channel id. """
+		with self._lock:
+			index = len(self.channels)
+			generator = self._random('channel', index)
+			channel_id = 'UC' + self._makeId(generator, 22)
+			upload_playlist = 'UU' + channel_id[2:]
+			self.channels[channel_id] = {
+				'index':          index,
+				'id':             channel_id,
+				'title':          'Channel {}'.format(index),
+				'customUrl':      'channel{}'.format(index),
+				'country':        generator.choice(['US', 'GB', 'CA', 'AU']),
+				'publishedAt':    self.start_date + timedelta(days = index),
+				'subscribers':    generator.randint(1000, 10 ** 7),
+				'uploadPlaylist': upload_playlist
+			}
+			self.playlist_items[upload_playlist] = list()
+			self.addUploads(channel_id, upload_count)
+
+			playlist_id = 'PL' + self._makeId(generator, 32)
+			uploads = self.playlist_items[upload_playlist]
+			self.playlists[playlist_id] = {
+				'id':          playlist_id,
+				'channelId':   channel_id,
+				'title':       self._makeTitle(generator, 3),
+				'publishedAt': self.start_date + timedelta(days = index + 1)
+			}
+			# The playlist holds every other upload, oldest first.
+			self.playlist_items[playlist_id] = list(reversed(uploads))[::2]
+			return channel_id
+
+	def addUploads(self, channel_id: str, upload_count: int) -> List[str]:
+		""" Publishes new videos on a channel. Like the real uploads playlist, the newest video comes first. """
+		with self._lock:
+			channel = self.channels[channel_id]
+			uploads = self.playlist_items[channel['uploadPlaylist']]
+			new_ids = list()
+			for _ in range(upload_count):
+				position = len(uploads) + len(new_ids)
+				generator = self._random('video', channel['index'], position)
+				video_id = self._makeId(generator, 11)
+				self.videos[video_id] = {
+					'id':          video_id,
+					'channelId':   channel_id,
+					'title':       self._makeTitle(generator),
+					'description': ' '.join(self._makeTitle(generator, 12) for _ in range(generator.randint(1, 20))),
+					'tags':        sorted({generator.choice(_WORDS) for _ in range(generator.randint(0, 15))}),
+					'publishedAt': channel['publishedAt'] + timedelta(hours = 12 * position + generator.randint(0, 11)),
+					'duration':    generator.randint(30, 3 * 3600),
+					'views':       generator.randint(0, 10 ** 7),
+					'categoryId':  str(generator.choice([1, 10, 20, 22, 24]))
+				}
+				new_ids.append(video_id)
+			uploads[:0] = reversed(new_ids)
+			return new_ids
+
+	@staticmethod
+	def _formatDuration(seconds: int) -> str:
+		hours, remainder = divmod(seconds, 3600)
+		minutes, seconds = divmod(remainder, 60)
+		duration = 'PT'
+		if hours:
+			duration += '{}H'.format(hours)
+		if minutes:
+			duration += '{}M'.format(minutes)
+		if seconds or duration == 'PT':
+			duration += '{}S'.format(seconds)
+		return duration
+
+	def getVideo(self, video_id: str, parts: List[str]) -> Optional[Dict]:
+		video = self.videos.get(video_id)
+		if video is None:
+			return None
+		channel = self.channels[video['channelId']]
+		views = video['views']
+		item = {'kind': 'youtube#video', 'id': video_id}
+		if 'snippet' in parts:
+			item['snippet'] = {
+				'publishedAt':          _formatDate(video['publishedAt']),
+				'channelId':            channel['id'],
+				'title':                video['title'],
+				'description':          video['description'],
+				'thumbnails':           {
+					'default': {'url': 'https://i.ytimg.com/vi/{}/default.jpg'.format(video_id), 'width': 120, 'height': 90}
+				},
+				'channelTitle':         channel['title'],
+				'tags':                 video['tags'],
+				'categoryId':           video['categoryId'],
+				'liveBroadcastContent': 'none',
+				'defaultAudioLanguage': 'en'
+			}
+		if 'contentDetails' in parts:
+			item['contentDetails'] = {
+				'duration':        self._formatDuration(video['duration']),
+				'dimension':       '2d',
+				'definition':      'hd',
+				'caption':         'false',
+				'licensedContent': True
+			}
+		if 'statistics' in parts:
+			item['statistics'] = {
+				'viewCount':     str(views),
+				'likeCount':     str(views // 40),
+				'dislikeCount':  str(views // 900),
+				'favoriteCount': '0',
+				'commentCount':  str(views // 300)
+			}
+		if 'topicDetails' in parts:
+			item['topicDetails'] = {'relevantTopicIds': ['/m/0bzvm2']}
+		return item
+
+	def getChannel(self, channel_id: str, parts: List[str]) -> Optional[Dict]:
+		channel = self.channels.get(channel_id)
+		if channel is None:
+			return None
+		uploads = self.playlist_items[channel['uploadPlaylist']]
+		item = {'kind': 'youtube#channel', 'id': channel_id}
+		if 'snippet' in parts:
+			item['snippet'] = {
+				'title':       channel['title'],
+				'description': 'The synthetic channel #{}.'.format(channel['index']),
+				'customUrl':   channel['customUrl'],
+				'publishedAt': _formatDate(channel['publishedAt']),
+				'country':     channel['country']
+			}
+		if 'contentDetails' in parts:
+			item['contentDetails'] = {'relatedPlaylists': {'uploads': channel['uploadPlaylist'], 'likes': ''}}
+		if 'statistics' in parts:
+			item['statistics'] = {
+				'viewCount':             str(sum(self.videos[i]['views'] for i in uploads)),
+				'commentCount':          '0',
+				'subscriberCount':       str(channel['subscribers']),
+				'hiddenSubscriberCount': False,
+				'videoCount':            str(len(uploads))
+			}
+		if 'topicDetails' in parts:
+			item['topicDetails'] = {
+				'topicIds':        ['/m/0bzvm2'],
+				'topicCategories': ['https://en.wikipedia.org/wiki/Video_game_culture']
+			}
+		return item
+
+	def getPlaylist(self, playlist_id: str, parts: List[str]) -> Optional[Dict]:
+		if playlist_id in self.playlists:
+			playlist = self.playlists[playlist_id]
+		else:
+			# Upload playlists are not listed as playlists of the channel, but can still be requested.
+			channels = [c for c in self.channels.values() if c['uploadPlaylist'] == playlist_id]
+			if not channels:
+				return None
+			playlist = {
+				'id':          playlist_id,
+				'channelId':   channels[0]['id'],
+				'title':       'Uploads from ' + channels[0]['title'],
+				'publishedAt': channels[0]['publishedAt']
+			}
+		channel = self.channels[playlist['channelId']]
+		item = {'kind': 'youtube#playlist', 'id': playlist_id}
+		if 'snippet' in parts:
+			item['snippet'] = {
+				'publishedAt':  _formatDate(playlist['publishedAt']),
+				'channelId':    channel['id'],
+				'title':        playlist['title'],
+				'description':  '',
+				'channelTitle': channel['title']
+			}
+		if 'contentDetails' in parts:
+			item['contentDetails'] = {'itemCount': len(self.playlist_items[playlist_id])}
+		return item
+
+	def getPlaylistItems(self, playlist_id: str, parts: List[str], start: int = 0, stop: int = None) -> Optional[List[Dict]]:
+		""" Returns the items of a playlist between positions `start` and `stop`. """
+		video_ids = self.playlist_items.get(playlist_id)
+		if video_ids is None:
+			return None
+		owner = self.getPlaylist(playlist_id, ['snippet'])['snippet']
+		items = list()
+		for position, video_id in enumerate(video_ids[start:stop], start):
+			video = self.videos[video_id]
+			item = {
+				'kind': 'youtube#playlistItem',
+				'id':   hashlib.sha1('{}:{}'.format(playlist_id, video_id).encode()).hexdigest()
+			}
+			if 'snippet' in parts:
+				item['snippet'] = {
+					'publishedAt':  _formatDate(video['publishedAt']),
+					'channelId':    owner['channelId'],
+					'title':        video['title'],
+					'description':  video['description'],
+					'channelTitle': owner['channelTitle'],
+					'playlistId':   playlist_id,
+					'position':     position,
+					'resourceId':   {'kind': 'youtube#video', 'videoId': video_id}
+				}
+			if 'contentDetails' in parts:
+				item['contentDetails'] = {'videoId': video_id, 'videoPublishedAt': _formatDate(video['publishedAt'])}
+			items.append(item)
+		return items
+
+	def getUploadsAfter(self, channel_id: str, published_after: datetime = None) -> Optional[List[str]]:
+		""" The ids of the channel's uploads published after `published_after`, newest first. """
+		channel = self.channels.get(channel_id)
+		if channel is None:
+			return None
+		video_ids = list()
+		for video_id in self.playlist_items[channel['uploadPlaylist']]:
+			if published_after is not None and self.videos[video_id]['publishedAt'] <= published_after:
+				break
+			video_ids.append(video_id)
+		return video_ids
+
+	def getActivities(self, channel_id: str, video_ids: List[str], parts: List[str]) -> List[Dict]:
+		""" Returns the upload activities of the given videos. """
+		channel = self.channels[channel_id]
+		items = list()
+		for video_id in video_ids:
+			video = self.videos[video_id]
+			item = {
+				'kind': 'youtube#activity',
+				'id':   hashlib.sha1('activity:{}'.format(video_id).encode()).hexdigest()
+			}
+			if 'snippet' in parts:
+				item['snippet'] = {
+					'publishedAt':  _formatDate(video['publishedAt']),
+					'channelId':    channel_id,
+					'title':        video['title'],
+					'description':  video['description'],
+					'channelTitle': channel['title'],
+					'type':         'upload'
+				}
+			if 'contentDetails' in parts:
+				item['contentDetails'] = {'upload': {'videoId': video_id}}
+			items.append(item)
+		return items
+
+
+	def getSubscriptions(self, channel_id: str, parts: List[str]) -> Optional[List[Dict]]:
+		""" Every channel is subscribed to every other channel. """
+		channel = self.channels.get(channel_id)
+		if channel is None:
+			return None
+		items = list()
+		for other in self.channels.values():
+			if other['id'] == channel_id:
+				continue
+			item = {
+				'kind': 'youtube#subscription',
+				'id':   hashlib.sha1('subscription:{}:{}'.format(channel_id, other['id']).encode()).hexdigest()
+			}
+			if 'snippet' in parts:
+				item['snippet'] = {
+					'publishedAt': _formatDate(max(channel['publishedAt'], other['publishedAt'])),
+					'title':       other['title'],
+					'description': '',
+					'resourceId':  {'kind': 'youtube#channel', 'channelId': other['id']},
+					'channelId':   channel_id
+				}
+			if 'contentDetails' in parts:
+				uploads = self.playlist_items[other['uploadPlaylist']]
+				item['contentDetails'] = {'totalItemCount': len(uploads), 'newItemCount': 0, 'activityType': 'all'}
+			items.append(item)
+		return items
+
+	def getCommentCount(self, video_id: str) -> int:
+		return self.videos[video_id]['views'] // 300
+
+	def getCommentThreads(self, video_id: str, parts: List[str], start: int = 0, stop: int = None) -> List[Dict]:
+		""" Returns the comments on a video between `start` and `stop`. Comments are generated on request. """
+		video = self.videos[video_id]
+		items = list()
+		for index in range(start, min(stop, self.getCommentCount(video_id))):
+			generator = self._random('comment', video_id, index)
+			comment_id = 'Ug' + self._makeId(generator, 24)
+			author_id = 'UC' + self._makeId(generator, 22)
+			text = self._makeTitle(generator, generator.randint(3, 40))
+			comment = {
+				'kind':    'youtube#comment',
+				'id':      comment_id,
+				'snippet': {
+					'videoId':           video_id,
+					'textDisplay':       text,
+					'textOriginal':      text,
+					'authorDisplayName': 'User {}'.format(author_id[2:8]),
+					'authorChannelId':   {'value': author_id},
+					'likeCount':         generator.randint(0, 1000),
+					'publishedAt':       _formatDate(video['publishedAt'] + timedelta(minutes = index)),
+					'updatedAt':         _formatDate(video['publishedAt'] + timedelta(minutes = index))
+				}
+			}
+			item = {'kind': 'youtube#commentThread', 'id': comment_id}
+			if 'snippet' in parts:
+				item['snippet'] = {
+					'channelId':       video['channelId'],
+					'videoId':         video_id,
+					'topLevelComment': comment,
+					'canReply':        True,
+					'totalReplyCount': generator.randint(0, 20),
+					'isPublic':        True
+				}
+			items.append(item)
+		return items
+
+	def search(self, query: str, types: List[str]) -> List[Tuple[str, str]]:
+		"""
+			Returns the (kind, id) of every video, channel and playlist whose title contains each word of the query.
+			The Api caps a search at 500 results, so this does too.
+		"""
+		words = query.lower().split()
+		sources = {
+			'video':    ('youtube#video', self.videos),
+			'channel':  ('youtube#channel', self.channels),
+			'playlist': ('youtube#playlist', self.playlists)
+		}
+		results = list()
+		for kind_name in types:
+			kind, items = sources[kind_name]
+			for item_id, item in items.items():
+				title = item['title'].lower().split()
+				if all(word in title for word in words):
+					results.append((kind, item_id))
+		return results[:500]
+
+	def getSearchResults(self, results: List[Tuple[str, str]], parts: List[str]) -> List[Dict]:
+		items = list()
+		for kind, item_id in results:
+			if kind == 'youtube#video':
+				source = self.videos[item_id]
+				channel = self.channels[source['channelId']]
+				id_key = 'videoId'
+			elif kind == 'youtube#channel':
+				source = channel = self.channels[item_id]
+				id_key = 'channelId'
+			else:
+				source = self.playlists[item_id]
+				channel = self.channels[source['channelId']]
+				id_key = 'playlistId'
+			item = {
+				'kind': 'youtube#searchResult',
+				'id':   {'kind': kind, id_key: item_id}
+			}
+			if 'snippet' in parts:
+				item['snippet'] = {
+					'publishedAt':          _formatDate(source['publishedAt']),
+					'channelId':            channel['id'],
+					'title':                source['title'],
+					'description':          source.get('description', '')[:160],
+					'channelTitle':         channel['title'],
+					'liveBroadcastContent': 'none'
+				}
+			items.append(item)
+		return items
+
+
+class FakeYouTubeServer:
+	"""
+		Serves a `SyntheticCatalog` over HTTP in the wire format of the Youtube Data Api.
+
+		Parameters
+		----------
+		catalog: SyntheticCatalog; default None
+			Defaults to `SyntheticCatalog()`.
+		host: str; default '127.0.0.1'
+		port: int; default 0
+			0 picks a free port.
+		latency: float; default 0.0
+			Seconds added to every response.
+		latency_jitter: float; default 0.0
+			A random amount of up to this many seconds added to every response.
+		error_rate: float; default 0.0
+			The probability that a request fails with a transient 503 'backendError'.
+		quota_exceeded_rate: float; default 0.0
+			The probability that a request fails with 403 'quotaExceeded'.
+		quota_limit: int; default None
+			The daily quota of each api key. Once it is used, every request with the key fails with 403 'quotaExceeded'.
+		seed: int; default 0
+			Seeds the injected latency and errors.
+	"""
+
+	def __init__(self, catalog: SyntheticCatalog = None, host: str = '127.0.0.1', port: int = 0,
+			latency: float = 0.0, latency_jitter: float = 0.0, error_rate: float = 0.0,
+			quota_exceeded_rate: float = 0.0, quota_limit: int = None, seed: int = 0):
+		self.catalog = catalog if catalog is not None else SyntheticCatalog()
+		self.latency = latency
+		self.latency_jitter = latency_jitter
+		self.error_rate = error_rate
+		self.quota_exceeded_rate = quota_exceeded_rate
+		self.quota_limit = quota_limit
+
+		self.request_count = 0
+		self.quota_used: Dict[str, int] = dict()
+		self._random = random.Random(seed)
+		self._lock = threading.Lock()
+
+		self._server = ThreadingHTTPServer((host, port), self._createHandler())
+		self._server.daemon_threads = True
+		self._thread: Optional[threading.Thread] = None
+
+	def __enter__(self):
+		self.start()
+		return self
+
+	def __exit__(self, exc_type, exc_val, exc_tb):
+		self.stop()
+
+	@property
+	def base_url(self) -> str:
+		host, port = self._server.server_address[:2]
+		return 'http://{}:{}/youtube/v3'.format(host, port)
+
+	def start(self) -> str:
+		""" Starts serving on a background thread and returns the base url to give to `YouTube`. """
+		self._thread = threading.Thread(target = self._server.serve_forever, daemon = True)
+		self._thread.start()
+		return self.base_url
+
+	def stop(self) -> None:
+		self._server.shutdown()
+		self._server.server_close()
+
+	def serveForever(self) -> None:
+		self._server.serve_forever()
+
+	def _createHandler(self):
+		server = self
+
+		class _Handler(BaseHTTPRequestHandler):
+			protocol_version = 'HTTP/1.1'
+			disable_nagle_algorithm = True
+
+			def do_GET(self):
+				status_code, body, headers = server.handle(self.path, self.headers)
+				if body is not None and 'gzip' in self.headers.get('Accept-Encoding', ''):
+					body = gzip.compress(body, compresslevel = 5)
+					headers['Content-Encoding'] = 'gzip'
+				self.send_response(status_code)
+				for key, value in headers.items():
+					self.send_header(key, value)
+				self.send_header('Content-Length', str(len(body) if body else 0))
+				self.end_headers()
+				if body:
+					self.wfile.write(body)
+
+			def log_message(self, *args):
+				pass
+
+		return _Handler
+
+	@staticmethod
+	def encodePageToken(offset: int) -> str:
+		return base64.urlsafe_b64encode('offset:{}'.format(offset).encode()).decode().rstrip('=')
+
+	@staticmethod
+	def decodePageToken(token: str) -> int:
+		token = token + '=' * (-len(token) % 4)
+		return int(base64.urlsafe_b64decode(token.encode()).decode().split(':')[1])
+
+	@staticmethod
+	def _error(status_code: int, reason: str, message: str) -> Tuple[int, Dict]:
+		body = {
+			'error': {
+				'errors':  [{'domain': 'youtube.quota' if status_code == 403 else 'global', 'reason': reason, 'message': message}],
+				'code':    status_code,
+				'message': message
+			}
+		}
+		return status_code, body
+
+	def _chargeQuota(self, api_key: str, method: str, parts: List[str]) -> bool:
+		method_costs = YouTube.quota_costs.get(method + '.list', {})
+		cost = YouTube.method_costs.get(method + '.list', 1) + sum(v for k, v in method_costs.items() if k in parts)
+		with self._lock:
+			used = self.quota_used.get(api_key, 0)
+			if self.quota_limit is not None and used + cost > self.quota_limit:
+				return False
+			self.quota_used[api_key] = used + cost
+		return True
+
+	def handle(self, path: str, headers) -> Tuple[int, Optional[bytes], Dict[str, str]]:
+		""" Builds the response to a request. Returns the status code, body and headers. """
+		with self._lock:
+			self.request_count += 1
+			delay = self.latency + self._random.uniform(0, self.latency_jitter)
+			is_error = self._random.random() < self.error_rate
+			is_quota_error = self._random.random() < self.quota_exceeded_rate
+		if delay:
+			time.sleep(delay)
+
+		url = urlparse(path)
+		method = url.path.rstrip('/').split('/')[-1]
+		parameters = {k: v[0] for k, v in parse_qs(url.query).items()}
+		parts = parameters.get('part', '').split(',')
+		api_key = parameters.get('key', '')
+
+		if not api_key:
+			status_code, body = self._error(403, 'forbidden', 'The request is missing a valid API key.')
+		elif is_error:
+			status_code, body = self._error(503, 'backendError', 'Backend Error')
+		elif is_quota_error or not self._chargeQuota(api_key, method, parts):
+			status_code, body = self._error(403, 'quotaExceeded', 'The request cannot be completed because you have exceeded your quota.')
+		else:
+			status_code, body = self.getResponse(method, parameters, parts)
+
+		response_headers = {'Content-Type': 'application/json; charset=UTF-8'}
+		if status_code == 200:
+			etag = body['etag']
+			response_headers['ETag'] = etag
+			if headers.get('If-None-Match') == etag:
+				return 304, None, response_headers
+		return status_code, json.dumps(body).encode('utf-8'), response_headers
+
+	def getResponse(self, method: str, parameters: Dict[str, str], parts: List[str]) -> Tuple[int, Dict]:
+		catalog = self.catalog
+		with catalog._lock:
+			if method == 'videos':
+				items = [catalog.getVideo(i, parts) for i in parameters.get('id', '').split(',')]
+			elif method == 'channels':
+				items = [catalog.getChannel(i, parts) for i in parameters.get('id', '').split(',')]
+			elif method == 'playlists':
+				items = [catalog.getPlaylist(i, parts) for i in parameters.get('id', '').split(',')]
+			elif method == 'playlistItems':
+				# Only the requested page is built, since upload playlists can be very long.
+				playlist_id = parameters.get('playlistId', '')
+				if playlist_id not in catalog.playlist_items:
+					return self._error(404, 'playlistNotFound', 'The playlist identified with the request cannot be found.')
+				offset, max_results = self._getPage(parameters)
+				items = catalog.getPlaylistItems(playlist_id, parts, offset, offset + max_results)
+				return 200, self.paginate(method, items, parameters, len(catalog.playlist_items[playlist_id]))
+			elif method == 'subscriptions':
+				items = catalog.getSubscriptions(parameters.get('channelId', ''), parts)
+				if items is None:
+					return self._error(404, 'subscriberNotFound', 'The subscriber identified with the request cannot be found.')
+				return 200, self.paginate(method, items, parameters)
+			elif method == 'commentThreads':
+				video_id = parameters.get('videoId', '')
+				if video_id not in catalog.videos:
+					return self._error(404, 'videoNotFound', 'The video identified by the videoId parameter cannot be found.')
+				offset, max_results = self._getPage(parameters, 100)
+				items = catalog.getCommentThreads(video_id, parts, offset, offset + max_results)
+				return 200, self.paginate(method, items, parameters, catalog.getCommentCount(video_id), 100)
+			elif method == 'search':
+				types = parameters.get('type', 'video,channel,playlist').split(',')
+				results = catalog.search(parameters.get('q', ''), types)
+				offset, max_results = self._getPage(parameters)
+				items = catalog.getSearchResults(results[offset:offset + max_results], parts)
+				return 200, self.paginate(method, items, parameters, len(results))
+			elif method == 'activities':
+				channel_id = parameters.get('channelId', '')
+				published_after = parameters.get('publishedAfter')
+				if published_after:
+					published_after = datetime.strptime(published_after[:19], '%Y-%m-%dT%H:%M:%S')
+				video_ids = catalog.getUploadsAfter(channel_id, published_after)
+				if video_ids is None:
+					return self._error(404, 'channelNotFound', 'The channel identified with the request cannot be found.')
+				offset, max_results = self._getPage(parameters)
+				items = catalog.getActivities(channel_id, video_ids[offset:offset + max_results], parts)
+				return 200, self.paginate(method, items, parameters, len(video_ids))
+			else:
+				return self._error(404, 'notFound', "'{}' is not supported by the fake server.".format(method))
+		# Lookups by id return every requested item at once, as 'maxResults' does not apply to them.
+		items = [i for i in items if i is not None]
+		return 200, self.paginate(method, items, {**parameters, 'maxResults': '50'})
+
+	def _getPage(self, parameters: Dict[str, str], limit: int = 50) -> Tuple[int, int]:
+		max_results = min(limit, int(parameters.get('maxResults', 5)))
+		offset = self.decodePageToken(parameters['pageToken']) if parameters.get('pageToken') else 0
+		return offset, max_results
+
+	def paginate(self, method: str, items: List[Dict], parameters: Dict[str, str], total: int = None,
+			limit: int = 50) -> Dict:
+		"""
+			Builds one page of a list response.
+		Parameters
+		----------
+		method: str
+		items: list<dict>
+			Every item of the response, or only the requested page if `total` is given.
+		parameters: dict<str,str>
+		total: int; default None
+			The total number of items, when `items` is already limited to the requested page.
+		limit: int; default 50
+			The largest 'maxResults' the method accepts.
+		"""
+		offset, max_results = self._getPage(parameters, limit)
+		if total is None:
+			total = len(items)
+			items = items[offset:offset + max_results]
+		page_items = items
+		for item in page_items:
+			item['etag'] = self._makeEtag(item)
+
+		kind = {
+			'videos':         'youtube#videoListResponse',
+			'channels':       'youtube#channelListResponse',
+			'playlists':      'youtube#playlistListResponse',
+			'playlistItems':  'youtube#playlistItemListResponse',
+			'activities':     'youtube#activityListResponse',
+			'search':         'youtube#searchListResponse',
+			'subscriptions':  'youtube#subscriptionListResponse',
+			'commentThreads': 'youtube#commentThreadListResponse'
+		}.get(method, 'youtube#{}ListResponse'.format(method.rstrip('s')))
+		response = {
+			'kind':     kind,
+			'pageInfo': {'totalResults': total, 'resultsPerPage': max_results},
+			'items':    page_items
+		}
+		if offset + max_results < total:
+			response['nextPageToken'] = self.encodePageToken(offset + max_results)
+		if offset > 0:
+			response['prevPageToken'] = self.encodePageToken(max(0, offset - max_results))
+		response['etag'] = self._makeEtag(response)
+		return response
+
+	@staticmethod
+	def _makeEtag(value: Dict) -> str:
+		digest = hashlib.md5(json.dumps(value, sort_keys = True).encode('utf-8')).digest()
+		return '"{}"'.format(base64.urlsafe_b64encode(digest).decode().rstrip('='))
+
+
+def main():
+	parser = argparse.ArgumentParser(description = "Serves synthetic data in the format of the Youtube Data Api.")
+	parser.add_argument('--host', default = '127.0.0.1')
+	parser.add_argument('--port', type = int, default = 8080)
+	parser.add_argument('--channels', type = int, default = 10)
+	parser.add_argument('--uploads', type = int, default = 100)
+	parser.add_argument('--seed', type = int, default = 0)
+	parser.add_argument('--latency', type = float, default = 0.0)
+	parser.add_argument('--error-rate', type = float, default = 0.0)
+	parser.add_argument('--quota-exceeded-rate', type = float, default = 0.0)
+	parser.add_argument('--quota-limit', type = int, default = None)
+	args = parser.parse_args()
+
+	catalog = SyntheticCatalog(args.channels, args.uploads, seed = args.seed)
+	server = FakeYouTubeServer(
+		catalog, host = args.host, port = args.port, latency = args.latency, error_rate = args.error_rate,
+		quota_exceeded_rate = args.quota_exceeded_rate, quota_limit = args.quota_limit, seed = args.seed
+	)
+	print("Serving {} channels at {}".format(len(catalog.channels), server.base_url))
+	for channel_id in catalog.channels:
+		print("\t", channel_id)
+	server.serveForever()
+
+
+if __name__ == '__main__':
+	main()
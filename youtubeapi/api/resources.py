@@ -1,9 +1,13 @@
-from youtubeapi.github import timetools
 from pprint import pprint
-from typing import Dict, List,Iterable
+from typing import Callable, Dict, List,Iterable, Tuple
 import json
 import yaml
 
+import numpy
+
+from . import _frames
+from ._isotime import parseDuration, parseTimestamp
+
 
 # https://developers.google.com/youtube/v3/docs/playlists
 def checkKeys(expected_keys:List[str], provided_keys:Iterable)->None:
@@ -25,9 +29,17 @@ def checkKeys(expected_keys:List[str], provided_keys:Iterable)->None:
 		raise ValueError
 
 class ListResource:
-	def __init__(self, api_response: Dict):
-
-		self.response = api_response
+	def __init__(self, api_response: Dict, keep_raw: bool = False):
+		"""
+		Parameters
+		----------
+		api_response: dict
+		keep_raw: bool; default False
+			If True, the raw response and the raw response of each item are kept in `response`.
+			Otherwise only the parsed fields are kept.
+		"""
+		self.response = api_response if keep_raw else None
+		self.error: Dict = api_response.get('error')
 		if 'error' in api_response:
 			pprint(api_response)
 			self.kind = 'youtube#error'
@@ -39,7 +51,10 @@ class ListResource:
 		self.next_page_token: str = api_response.get('nextPageToken')
 		self.previous_page_token: str = api_response.get('prevPageToken')
 		self.page_info: Dict = api_response.get('pageInfo')
-		self.items: List = [self.getResource(i) for i in api_response.get('items', [])]
+		# Responses trimmed with the 'fields' parameter may omit the kind of each item.
+		item_kind = self.getItemKind(self.kind)
+		self.items: List = [self.getResource(i, item_kind, keep_raw) for i in api_response.get('items', [])]
+		self.errors: List[Dict] = list()
 
 	def __str__(self):
 		if self.status_code == 200:
@@ -65,10 +80,14 @@ class ListResource:
 			print("\t", i)
 
 	@staticmethod
-	def getResource(item: Dict):
-
-		item_kind = item.get('kind', item.get('itemType'))
+	def getItemKind(kind: str) -> str:
+		""" Returns the kind of the items in a response, ex. 'youtube#video' for 'youtube#videoListResponse'. """
+		if kind and kind.endswith('ListResponse'):
+			return kind[:-len('ListResponse')]
+		return None
 
+	@staticmethod
+	def getResourceClass(item_kind: str) -> type:
 		if item_kind == 'youtube#video':
 			item_class = VideoResource
 		elif item_kind == 'youtube#channel':
@@ -79,15 +98,77 @@ class ListResource:
 			item_class = PlaylistItemResource
 		elif item_kind == 'youtube#searchResult':
 			item_class = SearchResource
+		elif item_kind == 'youtube#activity':
+			item_class = ActivityResource
+		elif item_kind == 'youtube#subscription':
+			item_class = SubscriptionResource
+		elif item_kind == 'youtube#commentThread':
+			item_class = CommentThreadResource
 		else:
 			message = "'{}' is not a supported resource!".format(item_kind)
 			raise ValueError(message)
+		return item_class
+
+	@classmethod
+	def getResource(cls, item: Dict, default_kind: str = None, keep_raw: bool = False):
+
+		item_kind = item.get('kind', item.get('itemType', default_kind))
+		item_class = cls.getResourceClass(item_kind)
 		if 'resourceId' in item: #Comes from the database.
 			item_resource = item_class.fromSql(item)
 		else:
-			item_resource = item_class(item)
+			if 'kind' not in item:
+				item = {**item, 'kind': item_kind}
+			item_resource = item_class(item, keep_raw)
 		return item_resource
 
+	@classmethod
+	def getItemIds(cls, api_response: Dict) -> List[str]:
+		"""
+			Returns the item id of each item in a response without creating the resources, ex. the ids of the
+			videos in a page of playlist items. Used when only the ids are needed, such as to check which
+			items are already in the database.
+		"""
+		item_kind = cls.getItemKind(api_response.get('kind'))
+		return [
+			cls.getResourceClass(item.get('kind', item_kind)).getItemId(item) for item in api_response.get('items', [])
+		]
+
+	def _getItemClasses(self) -> List[type]:
+		item_classes = list(dict.fromkeys(type(item) for item in self.items))
+		if not item_classes and self.getItemKind(self.kind):
+			try:
+				item_classes = [self.getResourceClass(self.getItemKind(self.kind))]
+			except ValueError:
+				pass
+		return item_classes
+
+	def toColumns(self) -> Dict[str, numpy.ndarray]:
+		"""
+			Returns every field of the items as a typed numpy array, read in a single pass without creating
+			a dict per item. Counters are int64, dates datetime64[s] (in UTC), durations timedelta64[s],
+			and the other fields are object arrays. Fields which an item doesn't have are None (NaT for dates).
+		"""
+		return _frames.getColumns(self.items, self._getItemClasses())
+
+	def toFrame(self) -> 'pandas.DataFrame':
+		"""
+			Returns the items as a DataFrame with a column per field (see `ListResource.toColumns`).
+			Ids and other fields with few distinct values, such as 'channelId', are categoricals.
+		"""
+		return _frames.toFrame(self.toColumns())
+
+	def toArrow(self) -> 'pyarrow.Table':
+		""" Returns the items as an arrow table with the same columns as `ListResource.toFrame`. Requires pyarrow. """
+		return _frames.toArrow(self.toColumns())
+
+	@classmethod
+	def fromFrame(cls, frame) -> 'ListResource':
+		""" Rebuilds the items from a DataFrame returned by `ListResource.toFrame` or a table returned by `toArrow`. """
+		response = cls.fromSql([])
+		response.items = _frames.fromFrame(frame, cls.getResourceClass)
+		return response
+
 	def toFile(self, filename):
 
 		filetype = filename.split('.')[-1]
@@ -124,40 +205,115 @@ class ListResource:
 		return cls(sql_response)
 
 
-class ChannelResource:
-	def __init__(self, response: Dict):
-		self.response = response
+# Stands in for the parts missing from a response, which are parsed as empty.
+_EMPTY_PART: Dict = dict()
+
+
+class Resource:
+	"""
+		The base of the resources returned by the Api. Each parsed field is stored once, in a slot named after
+		the field (ex. `video.videoName`), so that large lists of resources stay small. `resource['videoName']`,
+		`resource.data` and `resource.toDict()` read from these slots. The raw response is only kept, in
+		`resource.response`, when the resource is created with `keep_raw = True`.
+
+		Only the ids are read when a resource is created. Each part of the response (ex. 'snippet') is parsed
+		the first time one of its fields is read, after which its raw dict is released. Resources whose ids are
+		all that is needed, such as when checking which items are already in the database, are never parsed.
+	"""
+	__slots__ = ('kind', 'etag', 'resource_id', 'item_id', 'item_type', 'response', '_unparsed')
+	# The fields parsed from each part of the response. A part is parsed by the `_parse<Part>` method of
+	# the subclass, and each of its fields is stored in a slot of the same name.
+	parts: Dict[str, Tuple[str, ...]] = {}
+	fields: Tuple[str, ...] = ()
+	# The keys saved to the database by `toDict(to_sql = True)`. None saves every key.
+	sql_fields: Tuple[str, ...] = None
+	# The keys which are read from the identifying attributes of the resource.
+	id_attributes = {
+		'resourceId':   'resource_id',
+		'resourceType': 'kind',
+		'itemId':       'item_id',
+		'itemType':     'item_type'
+	}
+	_keys = frozenset(id_attributes)
+	_field_parts: Dict[str, str] = {}
+	_parsers: Dict[str, Callable[[Dict], Dict]] = {}
+
+	def __init_subclass__(cls, **kwargs):
+		super().__init_subclass__(**kwargs)
+		cls._keys = frozenset(cls.id_attributes) | frozenset(cls.fields)
+		cls._field_parts = {field: part for part, part_fields in cls.parts.items() for field in part_fields}
+		cls._parsers = {part: getattr(cls, '_parse' + part[0].upper() + part[1:]) for part in cls.parts}
+
+	def __init__(self, response: Dict, keep_raw: bool = False):
 		self.kind = response.get('kind')
 		self.etag = response.get('etag')
 		self.resource_id = response.get('id')
-		self.item_id = self.resource_id
+		self.item_id = self.getItemId(response)
+		self.item_type = self.kind
+		self.response = response if keep_raw else None
+		self._unparsed = {part: response.get(part, _EMPTY_PART) for part in self.parts} or None
+
+	def __getattr__(self, name: str):
+		# Only called for the slots which are still empty, i.e. the fields of the parts which haven't been parsed.
+		part = self._field_parts.get(name)
+		if part is None:
+			message = "'{}' object has no attribute '{}'".format(type(self).__name__, name)
+			raise AttributeError(message)
+		self._parsePart(part)
+		return object.__getattribute__(self, name)
 
-		default_response = dict()
+	def __getitem__(self, item: str):
+		if item not in self._keys:
+			return None
+		return getattr(self, self.id_attributes.get(item, item))
+
+	@staticmethod
+	def getItemId(response: Dict) -> str:
+		""" Reads the item id from a raw response, without parsing it. """
+		return response.get('id')
+
+	def _parsePart(self, part: str) -> None:
+		unparsed = self._unparsed
+		if unparsed is None or part not in unparsed:
+			# Already parsed by another thread.
+			return
+		for key, value in self._parsers[part](unparsed[part]).items():
+			setattr(self, key, value)
+		# Replaced rather than changed, so that another thread reading it still finds the parts it expects.
+		self._unparsed = {k: v for k, v in unparsed.items() if k != part} or None
+
+	@property
+	def data(self) -> Dict:
+		""" Every field of the resource. A new dict is built on each access. """
+		return self.toDict()
+
+	def toDict(self, to_sql: bool = False) -> Dict:
+		data = {key: getattr(self, attribute) for key, attribute in self.id_attributes.items()}
+		for field in self.fields:
+			data[field] = getattr(self, field)
+		if to_sql and self.sql_fields is not None:
+			data = {k: v for k, v in data.items() if k in self.sql_fields}
+		return data
 
-		self.snippet = self._parseSnippet(response.get('snippet', default_response))
-		self.content_details = self._parseContentDetails(response.get('contentDetails', default_response))
-		self.statistics = self._parseStatistics(response.get('statistics', default_response))
-		self.topic_details = self._parseTopicDetails(response.get('topicDetails', default_response))
-		self.status = self._parseStatus(response.get('status', default_response))
-		self.branding_settings = self._parseBrandingSettings(response.get('brandingSettings', default_response))
-		self.audit_details = self._parseAuditDetails(response.get('auditDetails', default_response))
-		self.content_owner_details = self._parseContentOwnerDetails(response.get('contentOwnerDetails'))
-		self.localizations = self._parseLocalizations(response.get('localizations', default_response))
 
-		self.data = {**self.snippet, **self.content_details, **self.statistics}
-		self.data['resourceId'] = self.resource_id
-		self.data['itemId'] = self.item_id
-		self.data['itemType'] = self.kind
-		self.data['resourceType'] = self.kind
+class ChannelResource(Resource):
+	parts = {
+		'snippet':        ('channelName', 'channelDescription', 'channelUrl', 'channelLanguage', 'channelCountry'),
+		'contentDetails': ('channelUploadPlaylist',),
+		'statistics':     ('channelViewCount', 'channelCommentCount', 'channelSubscriberCount', 'channelVideoCount')
+	}
+	fields = sum(parts.values(), ())
+	sql_fields = (
+		'resourceId', 'resourceType', 'itemId', 'itemType', 'channelId', 'channelName', 'channelDescription',
+		'channelUrl', 'channelLanguage', 'channelUploadPlaylist', 'channelViewCount', 'channelCommentCount',
+		'channelSubscriberCount', 'channelVideoCount'
+	)
+	__slots__ = fields
 
 	def __str__(self):
-		channel_name = self.snippet['channelName']
-		string = "ChannelResource('{}', '{}')".format(self.resource_id, channel_name)
+		string = "ChannelResource('{}', '{}')".format(self.resource_id, self.channelName)
 		return string
 
-	def __getitem__(self, item: str):
-		return self.data.get(item)
-
 	@staticmethod
 	def _parseSnippet(snippet: Dict):
 		standard_snippet = {
@@ -191,42 +347,6 @@ class ChannelResource:
 		}
 		return standard_statistics
 
-	@staticmethod
-	def _parseTopicDetails(response: Dict) -> Dict:
-		return response
-
-	@staticmethod
-	def _parseStatus(response: Dict) -> Dict:
-		return response
-
-	@staticmethod
-	def _parseBrandingSettings(response: Dict) -> Dict:
-		return response
-
-	@staticmethod
-	def _parseAuditDetails(response: Dict) -> Dict:
-		return response
-
-	@staticmethod
-	def _parseContentOwnerDetails(response: Dict) -> Dict:
-		return response
-
-	@staticmethod
-	def _parseLocalizations(response: Dict) -> Dict:
-		return response
-
-	def toDict(self, to_sql:bool = False)->Dict:
-
-		data = self.data
-		if to_sql:
-			allowed_keys = [
-				'resourceId','resourceType', 'itemId', 'itemType', 'channelId', 'channelName', 'channelDescription',
-				'channelUrl', 'channelLanguage', 'channelUploadPlaylist', 'channelViewCount', 'channelCommentCount',
-				'channelSubscriberCount', 'channelVideoCount'
-			]
-			data = {k:v for k,v in data.items() if k in allowed_keys}
-		return data
-
 	@classmethod
 	def fromSql(cls, response:Dict)->'ChannelResource':
 		expected_keys = [
@@ -267,27 +387,21 @@ class ChannelResource:
 		return cls(api_response)
 
 
-class PlaylistResource:
-	def __init__(self, response):
-		self.kind = response.get('kind')
-		self.etag = response.get('etag')
-		self.resource_id = response.get('id')
-		self.item_id = self.resource_id
-
-		self.snippet = self._parseSnippet(response.get('snippet', {}))
-		self.status = self._parseStatus(response.get('status', {}))
-		self.content_details = self._parseContentDetails(response.get('contentDetails', {}))
-		self.player = self._parsePlayer(response.get('player', {}))
-		self.localizations = self._parseLocalizations(response.get('localizations', {}))
+class PlaylistResource(Resource):
+	parts = {
+		'snippet':        (
+			'playlistDate', 'channelId', 'channelName', 'playlistName', 'playlistDescription', 'playlistTags',
+			'playlistLanguage'
+		),
+		'contentDetails': ('playlistItemCount',)
+	}
+	fields = sum(parts.values(), ())
+	sql_fields = (
+		'resourceId', 'resourceType', 'itemId', 'itemType', 'playlistDate', 'playlistName', 'playlistTags',
+		'playlistDescription', 'playlistLanguage', 'channelId'
+	)
+	__slots__ = fields
 
-		self.data = {**self.snippet, **self.content_details}
-		self.data['itemId'] = self.item_id
-		self.data['itemType'] = self.kind
-		self.data['resourceType'] = self.kind
-		self.data['resourceId'] = self.resource_id
-
-	def __getitem__(self, item):
-		return self.data.get(item)
 	@staticmethod
 	def _parseContentDetails(content_details):
 		item_count = int(content_details.get('itemCount', 0))
@@ -299,11 +413,7 @@ class PlaylistResource:
 
 	@staticmethod
 	def _parseSnippet(snippet):
-		playlist_date = snippet.get('publishedAt')
-		if playlist_date:
-			playlist_date = timetools.Timestamp(playlist_date)
-		else:
-			playlist_date = None
+		playlist_date = parseTimestamp(snippet.get('publishedAt'))
 		standard_snippet = {
 			'playlistDate':        playlist_date,
 			'channelId':           snippet.get('channelId'),
@@ -316,29 +426,6 @@ class PlaylistResource:
 
 		return standard_snippet
 
-	@staticmethod
-	def _parseStatus(response):
-		return response
-
-	@staticmethod
-	def _parsePlayer(response):
-		return response
-
-	@staticmethod
-	def _parseLocalizations(response):
-		return response
-
-	def toDict(self, to_sql:bool = False)->Dict:
-
-		data = self.data
-		allowed_keys = [
-			'resourceId','resourceType', 'itemId', 'itemType', 'playlistDate', 'playlistName', 'playlistTags',
-			'playlistDescription', 'playlistLanguage', 'channelId'
-		]
-		if to_sql:
-			data = {k:v for k,v in data.items() if k in allowed_keys}
-		return data
-
 	@classmethod
 	def fromSql(cls, response:Dict)->'PlaylistResource':
 		expected_keys = [
@@ -370,42 +457,41 @@ class PlaylistResource:
 		return cls(api_response)
 
 
-class PlaylistItemResource:
-	def __init__(self, response):
-		self.response = response
-		self.kind = response.get('kind')
-		self.etag = response.get('etag')
-		self.resource_id = response.get('id')
-
-		self.snippet = self._parseSnippet(response.get('snippet', {}))
-		self.content_details = self._parseContentDetails(response.get('contentDetails', {}))
-		self.status = self._parseStatus(response.get('status', {}))
-
-		self.item_id = self.snippet['itemId']
-		self.data = {**self.snippet, **self.content_details}
-		self.data['itemId'] = self.item_id
-		self.data['itemType'] = 'youtube#video'
-		self.data['resourceType'] = self.kind
-		self.data['resourceId'] = self.resource_id
+class PlaylistItemResource(Resource):
+	parts = {
+		'snippet':        (
+			'playlistItemDate', 'channelId', 'playlistItemName', 'playlistItemDescription', 'channelName',
+			'playlistId', 'playlistItemPosition'
+		),
+		'contentDetails': ('videoId', 'videoPublishedAt')
+	}
+	fields = sum(parts.values(), ())
+	sql_fields = (
+		'playlistId', 'resourceId', 'resourceType', 'itemId', 'itemType', 'playlistItemDate',
+		'playlistItemName', 'playlistItemDescription', 'playlistItemPosition'
+	)
+	__slots__ = fields
+
+	def __init__(self, response: Dict, keep_raw: bool = False):
+		super().__init__(response, keep_raw)
+		self.item_type = 'youtube#video'
 
 	def __str__(self):
-		playlist_id = self.data['playlistId']
-		channel_name = self.data['channelName']
-		video_name = self.data['playlistItemName']
-		string = "PlaylistItemResource('{}', '{}', '{}')".format(playlist_id, channel_name, video_name)
+		string = "PlaylistItemResource('{}', '{}', '{}')".format(self.playlistId, self.channelName, self.playlistItemName)
 		return string
 
-	def __getitem__(self, item):
-		return self.data.get(item)
+	@staticmethod
+	def getItemId(response: Dict) -> str:
+		item_id = response.get('snippet', {}).get('resourceId', {}).get('videoId')
+		if item_id is None:
+			# Only 'contentDetails' was requested (see the 'uploads-discovery' profile).
+			item_id = response.get('contentDetails', {}).get('videoId')
+		return item_id
+
 	@staticmethod
 	def _parseSnippet(response):
 		item_position = int(response.get('position', 0))
-		item_date = response.get('publishedAt')
-		item_resource_info = response.get('resourceId', {})
-		resource_type = item_resource_info.get('kind')
-		resource_id = item_resource_info.get('videoId')
-		if item_date:
-			item_date = timetools.Timestamp(item_date)
+		item_date = parseTimestamp(response.get('publishedAt'))
 
 		standard_snippet = {
 			'playlistItemDate':        item_date,
@@ -414,30 +500,17 @@ class PlaylistItemResource:
 			'playlistItemDescription': response.get('description', ''),
 			'channelName':             response.get('channelTitle', ''),
 			'playlistId':              response.get('playlistId', ''),
-			'playlistItemPosition':    item_position,
-			'itemId':                  resource_id,
-			'itemType':                resource_type
+			'playlistItemPosition':    item_position
 		}
 		return standard_snippet
 
 	@staticmethod
 	def _parseContentDetails(response):
-		return response
-
-	@staticmethod
-	def _parseStatus(response):
-		return response
-
-	def toDict(self, to_sql:bool = False):
-		data = self.data
-
-		allowed_keys = [
-			'playlistId', 'resourceId', 'resourceType', 'itemId', 'itemType', 'playlistItemDate',
-			'playlistItemName', 'playlistItemDescription', 'playlistItemPosition'
-		]
-		if to_sql:
-			data = {k:v for k,v in data.items() if k in allowed_keys}
-		return data
+		standard_content_details = {
+			'videoId':          response.get('videoId'),
+			'videoPublishedAt': parseTimestamp(response.get('videoPublishedAt'))
+		}
+		return standard_content_details
 
 	@classmethod
 	def fromSql(cls, response:Dict)->'PlaylistItemResource':
@@ -466,88 +539,328 @@ class PlaylistItemResource:
 			'kind':    'youtube#playlistItem',
 			'snippet': snippet
 		}
+		# Not stored in the database, but included in the rows of `ListResource.toFrame`.
+		if 'videoId' in response or 'videoPublishedAt' in response:
+			api_response['contentDetails'] = {
+				'videoId':          response.get('videoId'),
+				'videoPublishedAt': response.get('videoPublishedAt')
+			}
 		return cls(api_response)
 
 
-class SearchResource:
-	def __init__(self, response):
-		self.kind = response.get('kind')
-		self.etag = response.get('etag')
-		self.resource_id = None
-		self.item_id = self._parseId(response.get('id'))
-		self.snippet = self._parseSnippet(response.get('snippet', {}))
-		self.data = {}
+class ActivityResource(Resource):
+	"""
+		An action taken by a channel, such as an upload. `itemId` and `itemType` refer to the resource the
+		action was taken on (ex. the uploaded video).
+	"""
+	parts = {
+		'snippet': ('activityDate', 'activityType', 'activityName', 'activityDescription', 'channelId', 'channelName')
+	}
+	fields = sum(parts.values(), ())
+	__slots__ = fields
+
+	def __init__(self, response: Dict, keep_raw: bool = False):
+		super().__init__(response, keep_raw)
+		self.item_id, self.item_type = self._parseContentDetails(response.get('contentDetails', {}))
+
+	def __str__(self):
+		string = "ActivityResource('{}', '{}', '{}')".format(self.channelName, self.activityType, self.item_id)
+		return string
+
+	@classmethod
+	def getItemId(cls, response: Dict) -> str:
+		return cls._parseContentDetails(response.get('contentDetails', {}))[0]
 
 	@staticmethod
-	def _parseId(response):
-		return response
+	def _parseSnippet(response):
+		item_date = parseTimestamp(response.get('publishedAt'))
+
+		standard_snippet = {
+			'activityDate':        item_date,
+			'activityType':        response.get('type'),
+			'activityName':        response.get('title'),
+			'activityDescription': response.get('description', ''),
+			'channelId':           response.get('channelId'),
+			'channelName':         response.get('channelTitle', '')
+		}
+		return standard_snippet
+
+	@staticmethod
+	def _parseContentDetails(response) -> Tuple[str, str]:
+		# Only the key matching the activity type is present, ex. {'upload': {'videoId': ...}}.
+		item_id = None
+		item_type = None
+		for details in response.values():
+			resource = details.get('resourceId', details)
+			if 'videoId' in resource:
+				item_id, item_type = resource['videoId'], 'youtube#video'
+			elif 'playlistId' in resource:
+				item_id, item_type = resource['playlistId'], 'youtube#playlist'
+			elif 'channelId' in resource:
+				item_id, item_type = resource['channelId'], 'youtube#channel'
+			break
+		return item_id, item_type
+
+	@classmethod
+	def fromSql(cls, response: Dict) -> 'ActivityResource':
+		id_keys = {'youtube#video': 'videoId', 'youtube#playlist': 'playlistId', 'youtube#channel': 'channelId'}
+		snippet = {
+			'publishedAt':  response.get('activityDate'),
+			'type':         response.get('activityType'),
+			'title':        response.get('activityName'),
+			'description':  response.get('activityDescription'),
+			'channelId':    response.get('channelId'),
+			'channelTitle': response.get('channelName')
+		}
+		content_details = dict()
+		if response.get('itemType') in id_keys:
+			content_details[response['activityType']] = {id_keys[response['itemType']]: response['itemId']}
+
+		api_response = {
+			'etag':           'fromSql',
+			'id':             response['resourceId'],
+			'kind':           'youtube#activity',
+			'snippet':        snippet,
+			'contentDetails': content_details
+		}
+		return cls(api_response)
+
+
+class SubscriptionResource(Resource):
+	"""
+		A channel's subscription to another channel. `itemId` is the channel subscribed to,
+		and `subscriberId` the channel that subscribed.
+	"""
+	parts = {
+		'snippet':        ('subscriptionDate', 'subscriptionName', 'subscriptionDescription', 'subscriberId'),
+		'contentDetails': ('subscriptionItemCount',)
+	}
+	fields = sum(parts.values(), ())
+	sql_fields = (
+		'resourceId', 'resourceType', 'itemId', 'subscriberId', 'subscriptionName', 'subscriptionDate',
+		'subscriptionItemCount'
+	)
+	__slots__ = fields
+
+	def __init__(self, response: Dict, keep_raw: bool = False):
+		super().__init__(response, keep_raw)
+		self.item_type = 'youtube#channel'
+
+	def __str__(self):
+		string = "SubscriptionResource('{}', '{}')".format(self.item_id, self.subscriptionName)
+		return string
+
+	@staticmethod
+	def getItemId(response: Dict) -> str:
+		return response.get('snippet', {}).get('resourceId', {}).get('channelId')
 
 	@staticmethod
 	def _parseSnippet(response):
-		item_date = response.get('publishedAt')
-		if item_date:
-			item_date = timetools.Timestamp(item_date)
+		item_date = parseTimestamp(response.get('publishedAt'))
 
 		standard_snippet = {
-			'itemDate':        item_date,
-			'channelId':       response.get('title'),
-			'itemName':        response.get('title'),
-			'itemDescription': response.get('description'),
-			'channelName':     response.get('channelTitle')
+			'subscriptionDate':        item_date,
+			'subscriptionName':        response.get('title', ''),
+			'subscriptionDescription': response.get('description', ''),
+			'subscriberId':            response.get('channelId')
+		}
+		return standard_snippet
+
+	@staticmethod
+	def _parseContentDetails(response):
+		standard_content_details = {
+			'subscriptionItemCount': int(response.get('totalItemCount', 0))
 		}
+		return standard_content_details
 
+	@classmethod
+	def fromSql(cls, response: Dict) -> 'SubscriptionResource':
+		snippet = {
+			'publishedAt': response.get('subscriptionDate'),
+			'title':       response.get('subscriptionName'),
+			'description': response.get('subscriptionDescription', ''),
+			'channelId':   response.get('subscriberId'),
+			'resourceId':  {'kind': 'youtube#channel', 'channelId': response['itemId']}
+		}
+		api_response = {
+			'etag':           'fromSql',
+			'id':             response['resourceId'],
+			'kind':           'youtube#subscription',
+			'snippet':        snippet,
+			'contentDetails': {'totalItemCount': response.get('subscriptionItemCount', 0)}
+		}
+		return cls(api_response)
+
+
+class CommentThreadResource(Resource):
+	"""
+		A top-level comment on a video, along with the number of replies to it. `itemId` is the video.
+	"""
+	parts = {
+		'snippet': (
+			'commentDate', 'commentAuthor', 'commentAuthorChannelId', 'commentText', 'commentLikeCount',
+			'commentReplyCount', 'channelId'
+		)
+	}
+	fields = sum(parts.values(), ())
+	sql_fields = (
+		'resourceId', 'resourceType', 'itemId', 'channelId', 'commentDate', 'commentAuthor',
+		'commentAuthorChannelId', 'commentText', 'commentLikeCount', 'commentReplyCount'
+	)
+	__slots__ = fields
+
+	def __init__(self, response: Dict, keep_raw: bool = False):
+		super().__init__(response, keep_raw)
+		self.item_type = 'youtube#video'
+
+	def __str__(self):
+		string = "CommentThreadResource('{}', '{}', '{}')".format(self.item_id, self.commentAuthor, self.commentText[:40])
+		return string
+
+	@staticmethod
+	def getItemId(response: Dict) -> str:
+		return response.get('snippet', {}).get('videoId')
+
+	@staticmethod
+	def _parseSnippet(response):
+		comment = response.get('topLevelComment', {}).get('snippet', {})
+		item_date = parseTimestamp(comment.get('publishedAt'))
+
+		standard_snippet = {
+			'commentDate':            item_date,
+			'commentAuthor':          comment.get('authorDisplayName', ''),
+			'commentAuthorChannelId': comment.get('authorChannelId', {}).get('value'),
+			# 'textOriginal' is only returned to the comment's author, so fall back to the displayed text.
+			'commentText':            comment.get('textOriginal', comment.get('textDisplay', '')),
+			'commentLikeCount':       int(comment.get('likeCount', 0)),
+			'commentReplyCount':      int(response.get('totalReplyCount', 0)),
+			'channelId':              response.get('channelId')
+		}
 		return standard_snippet
 
+	@classmethod
+	def fromSql(cls, response: Dict) -> 'CommentThreadResource':
+		comment = {
+			'publishedAt':       response.get('commentDate'),
+			'authorDisplayName': response.get('commentAuthor'),
+			'authorChannelId':   {'value': response.get('commentAuthorChannelId')},
+			'textOriginal':      response.get('commentText'),
+			'likeCount':         response.get('commentLikeCount', 0)
+		}
+		snippet = {
+			'channelId':       response.get('channelId'),
+			'videoId':         response['itemId'],
+			'totalReplyCount': response.get('commentReplyCount', 0),
+			'topLevelComment': {'snippet': comment}
+		}
+		api_response = {
+			'etag':    'fromSql',
+			'id':      response['resourceId'],
+			'kind':    'youtube#commentThread',
+			'snippet': snippet
+		}
+		return cls(api_response)
 
-class VideoResource:
-	def __init__(self, resource):
-		self.response = resource
-		self.kind = resource['kind']
-		self.etag = resource['etag']
-		self.resource_id = resource['id']
-		self.item_id = self.resource_id
 
-		default_response = dict()
+class SearchResource(Resource):
+	"""
+		A single search result. `itemId` and `itemType` identify the video, channel or playlist that was found.
+	"""
+	id_keys = {'youtube#video': 'videoId', 'youtube#channel': 'channelId', 'youtube#playlist': 'playlistId'}
+	parts = {
+		'snippet': ('itemDate', 'channelId', 'itemName', 'itemDescription', 'channelName')
+	}
+	fields = sum(parts.values(), ())
+	__slots__ = fields
 
-		self.snippet = self._parseSnippet(resource.get('snippet', default_response))
-		self.content_details = self._parseContentDetails(resource.get('contentDetails', default_response))
-		self.status = self._parseStatus(resource.get('status', default_response))
-		self.statistics = self._parseStatistics(resource.get('statistics', default_response))
+	def __init__(self, response: Dict, keep_raw: bool = False):
+		super().__init__(response, keep_raw)
+		self.resource_id = None
+		self.item_id, self.item_type = self._parseId(response.get('id', {}))
 
-		self.player = self._parsePlayer(resource.get('player', default_response))
-		self.topic_details = self._parseTopicDetails(resource.get('topicDetails', default_response))
-		self.recording_details = self._parseRecordingDetails(resource.get('recordingDetails', default_response))
-		self.file_details = self._parseFileDetails(resource.get('fileDetails', default_response))
-		self.processing_details = self._parseProcessingDetails(resource.get('processingDetails', default_response))
-		self.suggestions = self._parseSuggestions(resource.get('suggestions', default_response))
-		self.livestream_details = self._parseLivestreamDetails(resource.get('liveStreamingDetails', default_response))
-		self.localizations = self._parseLocalizations(resource.get('localizations', default_response))
+	def __str__(self):
+		string = "SearchResource('{}', '{}', '{}')".format(self.item_type, self.item_id, self.itemName)
+		return string
+
+	@classmethod
+	def getItemId(cls, response: Dict) -> str:
+		return cls._parseId(response.get('id', {}))[0]
+
+	@classmethod
+	def _parseId(cls, response):
+		if isinstance(response, str):
+			return response, None
+		item_type = response.get('kind')
+		item_id = response.get(cls.id_keys.get(item_type, ''))
+		return item_id, item_type
+
+	@staticmethod
+	def _parseSnippet(response):
+		item_date = parseTimestamp(response.get('publishedAt'))
 
-		standard_id = {
-			'resourceId':   self.resource_id,
-			'itemId':       self.item_id,
-			'itemType':     self.kind,
-			'resourceType': self.kind
+		standard_snippet = {
+			'itemDate':        item_date,
+			'channelId':       response.get('channelId'),
+			'itemName':        response.get('title'),
+			'itemDescription': response.get('description'),
+			'channelName':     response.get('channelTitle')
 		}
 
-		self.data = {**standard_id, **self.snippet, **self.content_details, **self.statistics}
+		return standard_snippet
+
+	@classmethod
+	def fromSql(cls, response: Dict) -> 'SearchResource':
+		snippet = {
+			'publishedAt':  response.get('itemDate'),
+			'channelId':    response.get('channelId'),
+			'title':        response.get('itemName'),
+			'description':  response.get('itemDescription'),
+			'channelTitle': response.get('channelName')
+		}
+		api_response = {
+			'etag':    'fromSql',
+			'kind':    'youtube#searchResult',
+			'id':      {'kind': response['itemType'], cls.id_keys.get(response['itemType'], 'id'): response['itemId']},
+			'snippet': snippet
+		}
+		return cls(api_response)
+
+
+class VideoResource(Resource):
+	parts = {
+		'snippet':        (
+			'videoName', 'videoDate', 'channelName', 'channelId', 'videoDescription', 'videoCategoryId',
+			'videoLanguage', 'videoAudioLanguage', 'videoTags'
+		),
+		'contentDetails': ('videoDuration', 'videoDimension', 'videoDefinition', 'videoCaption'),
+		'statistics':     (
+			'videoViewCount', 'videoCommentCount', 'videoLikeCount', 'videoDislikeCount', 'videoFavoriteCount'
+		)
+	}
+	fields = sum(parts.values(), ())
+	sql_fields = (
+		'resourceId','resourceType', 'itemId','itemType', 'videoName', 'videoViewCount', 'videoLikeCount', 'videoDislikeCount',
+		'videoCommentCount', 'videoFavoriteCount', 'videoDescription', 'videoCaption', 'videoLanguage',
+		'videoAudioLanguage', 'videoCategoryId', 'videoDate', 'videoDuration', 'videoDefinition', 'videoDimension',
+		'channelId', 'videoTags'
+	)
+	__slots__ = fields
+
+	def __init__(self, resource: Dict, keep_raw: bool = False):
+		super().__init__(resource, keep_raw)
+		self.kind = resource.get('kind', 'youtube#video')
+		self.resource_id = resource['id']
+		self.item_id = self.resource_id
+		self.item_type = self.kind
 
 	def __str__(self):
-		video_name = self.data['videoName']
-		channel_name = self.data['channelName']
-		string = "VideoResource('{}', '{}', '{}')".format(self.resource_id, channel_name, video_name)
+		string = "VideoResource('{}', '{}', '{}')".format(self.resource_id, self.channelName, self.videoName)
 		return string
 
-	def __getitem__(self, item):
-		return self.data.get(item)
 	@staticmethod
 	def _parseContentDetails(response):
 
-		video_duration = response['duration']
-		if video_duration:
-			video_duration = timetools.Duration(video_duration)
-		else:
-			video_duration = None
+		video_duration = parseDuration(response.get('duration'))
 
 		standard_content_details = {
 			'videoDuration':   video_duration,
@@ -579,11 +892,7 @@ class VideoResource:
 		-------
 			dict<>
 		"""
-		publish_date = response.get('publishedAt')
-		if publish_date:
-			publish_date = timetools.Timestamp(publish_date)
-		else:
-			publish_date = None
+		publish_date = parseTimestamp(response.get('publishedAt'))
 
 		standard_snippet = {
 			'videoName':          response.get('title'),
@@ -610,54 +919,6 @@ class VideoResource:
 		}
 		return standard_statistics
 
-	@staticmethod
-	def _parseStatus(response):
-		return response
-
-	@staticmethod
-	def _parsePlayer(response):
-		return response
-
-	@staticmethod
-	def _parseTopicDetails(response):
-		return response
-
-	@staticmethod
-	def _parseRecordingDetails(response):
-		return response
-
-	@staticmethod
-	def _parseFileDetails(response):
-		return response
-
-	@staticmethod
-	def _parseProcessingDetails(response):
-		return response
-
-	@staticmethod
-	def _parseSuggestions(response):
-		return response
-
-	@staticmethod
-	def _parseLivestreamDetails(response):
-		return response
-
-	@staticmethod
-	def _parseLocalizations(response):
-		return response
-
-	def toDict(self, to_sql:bool = False)->Dict:
-		data = self.data
-		if to_sql:
-
-			allowed_keys = [
-				'resourceId','resourceType', 'itemId','itemType', 'videoName', 'videoViewCount', 'videoLikeCount', 'videoDislikeCount',
-				'videoCommentCount', 'videoFavoriteCount', 'videoDescription', 'videoCaption', 'videoLanguage',
-				'videoAudioLanguage', 'videoCategoryId', 'videoDate', 'videoDuration', 'videoDefinition', 'videoDimension',
-				'channelId', 'videoTags'
-			]
-			data = {k:v for k,v in data.items() if k in allowed_keys}
-		return data
 
 	@classmethod
 	def fromSql(cls, response: Dict) -> 'VideoResource':
@@ -1 +1,3 @@
-from ._youtube_database import YoutubeDatabase
\ No newline at end of file
+from ._youtube_database import YoutubeDatabase
+from ._refresh import RefreshScheduler
+from ._snapshots import SnapshotStore
\ No newline at end of file
@@ -29,6 +29,7 @@ def importEntities(db: Database) -> Dict:
 		channel = Required('Channel')
 		tags = Set('Tag')
 		playlistItems = Set('PlaylistItem')
+		refresh = Optional('VideoRefresh')
 
 		def toDict(self):
 			data = self.to_dict()
@@ -117,14 +118,89 @@ def importEntities(db: Database) -> Dict:
 			data['itemType'] = 'youtube#Tag'
 			return data
 
-	Entities = Union[Channel, Playlist, PlaylistItem, Video, Tag]
+	class ChannelSync(db.Entity):
+		""" The newest upload and activity imported from each channel, so that later imports only request newer ones. """
+		entity_type = 'youtube#channelSync'
+		channelId = PrimaryKey(str)
+		lastItemId = Optional(str)
+		lastItemDate = Optional(datetime)
+		lastSyncDate = Optional(datetime)
+		lastFullSyncDate = Optional(datetime)
+		lastActivityDate = Optional(datetime)
+
+	class Subscription(db.Entity):
+		entity_type = 'youtube#subscription'
+		resourceId = PrimaryKey(str)
+		itemId = Required(str)  # The channel subscribed to, which may not be in the database.
+		subscriberId = Required(str, index = True)
+		subscriptionName = Optional(str)
+		subscriptionDate = Optional(datetime)
+		subscriptionItemCount = Optional(int, sql_default = 0)
+
+		def toDict(self):
+			data = self.to_dict()
+			data['itemType'] = 'youtube#channel'
+			return data
+
+	class Comment(db.Entity):
+		# Videos are referenced by id rather than by relation, so that comments can be bulk inserted
+		# without loading (or requesting) each video first.
+		entity_type = 'youtube#commentThread'
+		resourceId = PrimaryKey(str)
+		itemId = Required(str, index = True)
+		channelId = Optional(str)
+		commentDate = Optional(datetime)
+		commentAuthor = Optional(str)
+		commentAuthorChannelId = Optional(str)
+		commentText = Optional(str)
+		commentLikeCount = Optional(int, size = 64, sql_default = 0)
+		commentReplyCount = Optional(int, sql_default = 0)
+
+		def toDict(self):
+			data = self.to_dict()
+			data['itemType'] = 'youtube#video'
+			return data
+
+	class VideoRefresh(db.Entity):
+		""" When the statistics of a video were last refreshed, and when they are next due. See `RefreshScheduler`. """
+		entity_type = 'youtube#videoRefresh'
+		video = PrimaryKey(Video)
+		lastRefreshDate = Required(datetime)
+		nextRefreshDate = Required(datetime, index = True)
+
+	class SnapshotSeries(db.Entity):
+		""" Maps a video or channel to the integer id its snapshots are stored under. See `SnapshotStore`. """
+		id = PrimaryKey(int, auto = True)
+		resourceId = Required(str)
+		resourceType = Required(str)
+		blocks = Set('SnapshotBlock')
+		composite_key(resourceId, resourceType)
+
+	class SnapshotBlock(db.Entity):
+		""" Every snapshot of one series during one month, packed as zigzag varint deltas. """
+		series = Required(SnapshotSeries)
+		month = Required(int)  # ex. 202401
+		snapshotCount = Required(int)
+		data = Required(bytes)
+		PrimaryKey(series, month)
+
+	Entities = Union[
+		Channel, Playlist, PlaylistItem, Video, Tag, ChannelSync, Subscription, Comment, VideoRefresh, SnapshotSeries,
+		SnapshotBlock
+	]
 
 	# db.generate_mapping(create_tables = True)
 	entities: Dict[str, Entities] = {
-		'channel':      Channel,
-		'playlist':     Playlist,
-		'playlistItem': PlaylistItem,
-		'video':        Video,
-		'tag':          Tag
+		'channel':        Channel,
+		'playlist':       Playlist,
+		'playlistItem':   PlaylistItem,
+		'video':          Video,
+		'tag':            Tag,
+		'channelSync':    ChannelSync,
+		'subscription':   Subscription,
+		'comment':        Comment,
+		'videoRefresh':   VideoRefresh,
+		'snapshotSeries': SnapshotSeries,
+		'snapshotBlock':  SnapshotBlock
 	}
 	return entities
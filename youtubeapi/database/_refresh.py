@@ -0,0 +1,184 @@
+import time
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+from pony.orm import db_session, desc, select
+
+from ..api import ListResource, QuotaBudget, QuotaExceededError, VideoResource
+
+
+class RefreshScheduler:
+	"""
+		Keeps the statistics of the videos in a `YoutubeDatabase` up to date. Young videos, whose counters
+		still change quickly, are refreshed often, and older videos progressively less often. Each run
+		requests the most overdue videos 50 at a time with the 'stats-only' profile (3 units per request),
+		and writes the new counters in a single transaction. Every refresh is also recorded in the
+		database's `SnapshotStore`, so the history of each counter is kept.
+
+		Parameters
+		----------
+		database: YoutubeDatabase
+		max_units: int; default None
+			The maximum number of quota units used by each run. If the api client has a `QuotaBudget` or an
+			`ApiKeyPool`, runs also stop at the remaining quota of the day (of every key in the pool).
+		intervals: list<tuple<timedelta, timedelta>>; default None
+			(maximum age, refresh interval) pairs, ordered by age. Videos older than the last age use the
+			last interval. Defaults to `RefreshScheduler.default_intervals`.
+	"""
+	default_intervals = [
+		(timedelta(days = 2), timedelta(hours = 1)),
+		(timedelta(days = 7), timedelta(hours = 6)),
+		(timedelta(days = 30), timedelta(days = 1)),
+		(timedelta(days = 365), timedelta(days = 7)),
+		(timedelta.max, timedelta(days = 30))
+	]
+	batch_size = 50
+
+	# The statistics returned by the Api, and the column each one is saved to.
+	statistics_columns = {
+		'viewCount':     'videoViewCount',
+		'likeCount':     'videoLikeCount',
+		'dislikeCount':  'videoDislikeCount',
+		'commentCount':  'videoCommentCount',
+		'favoriteCount': 'videoFavoriteCount'
+	}
+
+	def __init__(self, database, max_units: int = None, intervals: List[Tuple[timedelta, timedelta]] = None):
+		self.database = database
+		self.api = database.api
+		self.max_units = max_units
+		self.intervals = intervals if intervals is not None else self.default_intervals
+		self.batch_cost = self.api.calculateProfileQuota('stats-only', 'youtube#video')
+
+	def __str__(self):
+		string = "RefreshScheduler('{}', {} due)".format(self.database.filename, self.countDue())
+		return string
+
+	def getInterval(self, video_date: datetime, now: datetime) -> timedelta:
+		""" How long to wait before refreshing a video published at `video_date` again. """
+		age = now - video_date.replace(tzinfo = None)
+		for max_age, interval in self.intervals:
+			if age < max_age:
+				return interval
+		return self.intervals[-1][1]
+
+	def getBatchLimit(self) -> int:
+		""" The number of requests the next run may send. """
+		batch_limit = None if self.max_units is None else self.max_units // self.batch_cost
+		key_pool = self.api.key_pool
+		quota_budget = self.api.quota_budget
+		if key_pool is not None:
+			# Each request is sent with a single key, so the requests each key can afford are added up.
+			key_limit = sum(key_pool.remaining(api_key) // self.batch_cost for api_key in key_pool.available())
+		elif quota_budget is not None:
+			key_limit = quota_budget.remaining(self.api.api_key) // self.batch_cost
+		else:
+			key_limit = None
+		if key_limit is None:
+			return batch_limit
+		return key_limit if batch_limit is None else min(batch_limit, key_limit)
+
+	@db_session
+	def countDue(self, now: datetime = None) -> int:
+		if now is None:
+			now = datetime.utcnow()
+		database = self.database
+		never_refreshed = select(v for v in database.Video if v.refresh is None).count()
+		overdue = select(r for r in database.VideoRefresh if r.nextRefreshDate <= now).count()
+		return never_refreshed + overdue
+
+	@db_session
+	def getDueVideos(self, limit: int = None, now: datetime = None) -> List[str]:
+		"""
+			Returns the ids of the videos which are due for a refresh, most urgent first. Videos which were
+			never refreshed come first, youngest first, followed by the others in the order they became due.
+		"""
+		if now is None:
+			now = datetime.utcnow()
+		database = self.database
+		query = select(v.resourceId for v in database.Video if v.refresh is None).order_by(lambda: desc(v.videoDate))
+		video_ids = list(query[:limit] if limit is not None else query[:])
+		if limit is None or len(video_ids) < limit:
+			remaining = None if limit is None else limit - len(video_ids)
+			query = select(
+				r.video.resourceId for r in database.VideoRefresh if r.nextRefreshDate <= now
+			).order_by(lambda: r.nextRefreshDate)
+			video_ids += list(query[:remaining] if remaining is not None else query[:])
+		return video_ids
+
+	def run(self, now: datetime = None) -> int:
+		"""
+			Refreshes the videos which are due, up to the quota allowed for a run. Returns the number of
+			videos refreshed.
+		"""
+		if now is None:
+			now = datetime.utcnow()
+		batch_limit = self.getBatchLimit()
+		limit = None if batch_limit is None else batch_limit * self.batch_size
+		if limit == 0:
+			return 0
+
+		refreshed_count = 0
+		video_ids = self.getDueVideos(limit, now)
+		for start in range(0, len(video_ids), self.batch_size):
+			batch = video_ids[start:start + self.batch_size]
+			try:
+				# Cached statistics would be saved (and snapshotted) again as if they were new.
+				api_response = self.api.request('videos', batch, profile = 'stats-only', use_cache = False)
+			except QuotaExceededError:
+				break
+			# The raw statistics are kept so that counters hidden by the channel aren't saved as 0.
+			response = ListResource(api_response, keep_raw = True)
+			if response.status_code != 200:
+				break
+			self.applyStatistics(batch, response.items, now)
+			self.database.snapshots.recordResources(response.items, now)
+			refreshed_count += len(response)
+		return refreshed_count
+
+	def runForever(self, idle_delay: float = 60.0) -> None:
+		"""
+			Refreshes videos as they become due. Waits `idle_delay` seconds whenever nothing is due,
+			and until the quota resets once it is used up.
+		"""
+		while True:
+			refreshed_count = self.run()
+			quota_limited = self.api.quota_budget is not None or self.api.key_pool is not None
+			if refreshed_count == 0 and self.getBatchLimit() == 0 and quota_limited:
+				time.sleep(QuotaBudget.secondsUntilReset() + 1)
+			elif refreshed_count == 0:
+				time.sleep(idle_delay)
+
+	@db_session
+	def applyStatistics(self, video_ids: List[str], resources: List[VideoResource], now: datetime) -> None:
+		"""
+			Saves the refreshed counters and schedules the next refresh of each video. Videos missing from
+			the response (deleted or made private) are rescheduled at the longest interval.
+		"""
+		database = self.database
+		videos = {v.resourceId: v for v in database.Video.select(lambda v: v.resourceId in video_ids)}
+		refreshes = {
+			r.video.resourceId: r for r in database.VideoRefresh.select(lambda r: r.video.resourceId in video_ids)
+		}
+
+		returned_ids = set()
+		for resource in resources:
+			video = videos.get(resource.resource_id)
+			if video is None:
+				continue
+			# Only the counters which were returned are updated, since hidden counters are omitted.
+			statistics = resource.response.get('statistics', {})
+			columns = self.statistics_columns
+			video.set(**{column: int(statistics[key]) for key, column in columns.items() if key in statistics})
+			returned_ids.add(resource.resource_id)
+
+		for video_id, video in videos.items():
+			if video_id in returned_ids:
+				interval = self.getInterval(video.videoDate, now)
+			else:
+				interval = self.intervals[-1][1]
+			refresh = refreshes.get(video_id)
+			if refresh is None:
+				database.VideoRefresh(video = video, lastRefreshDate = now, nextRefreshDate = now + interval)
+			else:
+				refresh.set(lastRefreshDate = now, nextRefreshDate = now + interval)
@@ -0,0 +1,235 @@
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy
+from pony.orm import db_session, select
+
+_EPOCH = datetime(1970, 1, 1)
+# Stored in place of the counters which are hidden (ex. disabled comments), since counters are never negative.
+_MISSING = -1
+
+
+def encodeVarints(values: Iterable[int]) -> bytes:
+	""" Packs signed integers as zigzag varints, so that small deltas take a byte or two whatever their sign. """
+	buffer = bytearray()
+	for value in values:
+		value = (value << 1) ^ (value >> 63)
+		while value >= 0x80:
+			buffer.append((value & 0x7f) | 0x80)
+			value >>= 7
+		buffer.append(value)
+	return bytes(buffer)
+
+
+def decodeVarints(data: bytes) -> List[int]:
+	values = list()
+	value = 0
+	shift = 0
+	for byte in data:
+		value |= (byte & 0x7f) << shift
+		if byte & 0x80:
+			shift += 7
+		else:
+			values.append((value >> 1) ^ -(value & 1))
+			value = 0
+			shift = 0
+	return values
+
+
+class SnapshotStore:
+	"""
+		Records the counters of videos and channels each time they are polled, so that their history is kept
+		rather than overwritten. Each video or channel is stored under an integer id, and its snapshots are
+		packed into one blob per month: the time and counters of each snapshot are stored as the difference
+		from the previous snapshot, encoded as zigzag varints. A daily snapshot of a video takes ~10 bytes.
+		Hidden counters are recorded as missing rather than as 0, and read back as NaN.
+
+		Parameters
+		----------
+		database: YoutubeDatabase
+	"""
+	# The counters recorded for each kind of resource, in the order they are packed.
+	fields = {
+		'youtube#video':   ('videoViewCount', 'videoLikeCount', 'videoCommentCount'),
+		'youtube#channel': ('channelViewCount', 'channelSubscriberCount', 'channelVideoCount')
+	}
+
+	# The key of each counter in the 'statistics' part of a raw response.
+	statistics_keys = {
+		'videoViewCount':         'viewCount',
+		'videoLikeCount':         'likeCount',
+		'videoCommentCount':      'commentCount',
+		'channelViewCount':       'viewCount',
+		'channelSubscriberCount': 'subscriberCount',
+		'channelVideoCount':      'videoCount'
+	}
+
+	def __init__(self, database):
+		self.database = database
+
+	def __str__(self):
+		with db_session:
+			series_count = self.database.SnapshotSeries.select().count()
+		string = "SnapshotStore('{}', {} series)".format(self.database.filename, series_count)
+		return string
+
+	@staticmethod
+	def toTimestamp(date: datetime) -> int:
+		""" Seconds since the epoch. Naive datetimes are taken to be in UTC. """
+		if date.tzinfo is not None:
+			date = date.astimezone(timezone.utc).replace(tzinfo = None)
+		return int((date - _EPOCH).total_seconds())
+
+	@staticmethod
+	def getMonth(timestamp: int) -> int:
+		date = datetime.utcfromtimestamp(timestamp)
+		return date.year * 100 + date.month
+
+	def getDtype(self, kind: str) -> numpy.dtype:
+		return numpy.dtype([('time', 'datetime64[s]')] + [(field, 'float64') for field in self.fields[kind]])
+
+	@staticmethod
+	def packBlock(snapshots: List[Tuple[int, ...]]) -> bytes:
+		values = list()
+		previous = (0,) * len(snapshots[0])
+		for snapshot in snapshots:
+			values += [value - previous_value for value, previous_value in zip(snapshot, previous)]
+			previous = snapshot
+		return encodeVarints(values)
+
+	@staticmethod
+	def unpackBlock(data: bytes, width: int) -> List[Tuple[int, ...]]:
+		values = decodeVarints(data)
+		snapshots = list()
+		previous = [0] * width
+		for start in range(0, len(values), width):
+			previous = [value + delta for value, delta in zip(previous, values[start:start + width])]
+			snapshots.append(tuple(previous))
+		return snapshots
+
+	def getCounters(self, resource, kind: str) -> List[Optional[int]]:
+		"""
+			Returns the counters of a resource, with None for the counters which are hidden. These are only
+			known when the resource kept its raw response (`keep_raw`), since parsed counters default to 0.
+		"""
+		response = getattr(resource, 'response', None)
+		if not response or 'statistics' not in response:
+			return [resource[field] for field in self.fields[kind]]
+		statistics = response['statistics']
+		return [statistics.get(self.statistics_keys[field]) for field in self.fields[kind]]
+
+	def recordResources(self, resources: Iterable, date: datetime = None) -> int:
+		""" Records the current counters of `VideoResource`s or `ChannelResource`s. Returns the number recorded. """
+		if date is None:
+			date = datetime.utcnow()
+		snapshots = dict()
+		for resource in resources:
+			kind = resource['resourceType'] or resource['itemType']
+			snapshots.setdefault(kind, list()).append((resource['resourceId'], date, self.getCounters(resource, kind)))
+		return sum(self.record(kind, items) for kind, items in snapshots.items())
+
+	@db_session
+	def record(self, kind: str, snapshots: Iterable[Tuple[str, datetime, List[int]]]) -> int:
+		"""
+			Records a batch of snapshots in a single transaction.
+		Parameters
+		----------
+		kind: {'youtube#video', 'youtube#channel'}
+		snapshots: iterable<tuple<str, datetime, list<int>>>
+			The id, time and counters (in the order of `SnapshotStore.fields[kind]`) of each snapshot.
+			Counters which are hidden are None.
+
+		Returns
+		-------
+			int
+				The number of snapshots recorded.
+		"""
+		database = self.database
+		width = 1 + len(self.fields[kind])
+		new_snapshots: Dict[Tuple[str, int], List[Tuple[int, ...]]] = dict()
+		for resource_id, date, counters in snapshots:
+			timestamp = self.toTimestamp(date)
+			key = (resource_id, self.getMonth(timestamp))
+			counters = [_MISSING if counter is None else int(counter) for counter in counters]
+			new_snapshots.setdefault(key, list()).append((timestamp, *counters))
+		if not new_snapshots:
+			return 0
+
+		resource_ids = list({resource_id for resource_id, _ in new_snapshots})
+		series = {
+			s.resourceId: s for s in select(
+				s for s in database.SnapshotSeries if s.resourceType == kind and s.resourceId in resource_ids
+			)
+		}
+		# Only the series which already existed can have blocks.
+		series_ids = [s.id for s in series.values()]
+		months = list({month for _, month in new_snapshots})
+		blocks = {
+			(b.series.resourceId, b.month): b for b in select(
+				b for b in database.SnapshotBlock if b.series.id in series_ids and b.month in months
+			)
+		}
+
+		for resource_id in resource_ids:
+			if resource_id not in series:
+				series[resource_id] = database.SnapshotSeries(resourceId = resource_id, resourceType = kind)
+
+		snapshot_count = 0
+		for (resource_id, month), block_snapshots in new_snapshots.items():
+			snapshot_count += len(block_snapshots)
+			block = blocks.get((resource_id, month))
+			if block is not None:
+				block_snapshots = self.unpackBlock(block.data, width) + block_snapshots
+			block_snapshots = sorted(block_snapshots)
+			data = self.packBlock(block_snapshots)
+			if block is None:
+				database.SnapshotBlock(
+					series = series[resource_id], month = month, snapshotCount = len(block_snapshots), data = data
+				)
+			else:
+				block.set(snapshotCount = len(block_snapshots), data = data)
+		return snapshot_count
+
+	def getSeries(self, resource_id: str, kind: str = 'youtube#video', start: datetime = None,
+			end: datetime = None) -> numpy.ndarray:
+		"""
+			Returns the snapshots of a video or channel as a structured array with a 'time' column and a
+			column for each counter, ex. `series['videoViewCount']`. Counters which were hidden are NaN.
+		"""
+		return self.getMany([resource_id], kind, start, end)[resource_id]
+
+	@db_session
+	def getMany(self, resource_ids: List[str], kind: str = 'youtube#video', start: datetime = None,
+			end: datetime = None) -> Dict[str, numpy.ndarray]:
+		""" Returns the snapshots of several videos or channels. See `SnapshotStore.getSeries`. """
+		database = self.database
+		width = 1 + len(self.fields[kind])
+		start = self.toTimestamp(start) if start is not None else None
+		end = self.toTimestamp(end) if end is not None else None
+		first_month = self.getMonth(start) if start is not None else 0
+		last_month = self.getMonth(end) if end is not None else 999999
+
+		blocks = select(
+			(b.series.resourceId, b.month, b.data) for b in database.SnapshotBlock
+			if b.series.resourceType == kind and b.series.resourceId in resource_ids
+			and b.month >= first_month and b.month <= last_month
+		).order_by(2)
+
+		snapshots = {resource_id: list() for resource_id in resource_ids}
+		for resource_id, _, data in blocks:
+			snapshots[resource_id] += self.unpackBlock(data, width)
+
+		dtype = self.getDtype(kind)
+		series = dict()
+		for resource_id, values in snapshots.items():
+			array = numpy.array(values, dtype = numpy.int64).reshape(-1, width)
+			if start is not None:
+				array = array[array[:, 0] >= start]
+			if end is not None:
+				array = array[array[:, 0] <= end]
+			result = numpy.empty(len(array), dtype = dtype)
+			result['time'] = array[:, 0].astype('datetime64[s]')
+			for index, field in enumerate(self.fields[kind], 1):
+				result[field] = numpy.where(array[:, index] == _MISSING, numpy.nan, array[:, index])
+			series[resource_id] = result
+		return series
@@ -1,16 +1,21 @@
+import asyncio
+import itertools
 import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from pprint import pprint
 from functools import partial
 
 pprint = partial(pprint, width = 200)
-from pony.orm import Database, db_session
+from pony.orm import Database, db_session, select
 
 
 from ._database_entities import importEntities
+from ._snapshots import SnapshotStore
 from ..github import DATA_FOLDER
 
 from ..api import *
-from typing import Union, List, Any
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 from progressbar import ProgressBar
 
 
@@ -26,19 +31,29 @@ def formatErrorMessage(message, exception, *args, **kwargs):
 
 
 class YoutubeDatabase:
-	def __init__(self, api_key: Union[str, YouTube] = None, filename: str = None):
-		if isinstance(api_key, str):
+	def __init__(self, api_key: Union[str, List[str], ApiKeyPool, YouTube] = None, filename: str = None):
+		if isinstance(api_key, (str, list, ApiKeyPool)):
 			self.api = YouTube(api_key)
 		else:
 			self.api = api_key
+		# Coalesces the lookups of missing channels, playlists and videos into batched requests.
+		self.loader = BatchLoader(self.api) if self.api is not None else None
 
 		self.Channel = None
 		self.Playlist = None
 		self.PlaylistItem = None
 		self.Video = None
 		self.Tag = None
+		self.ChannelSync = None
+		self.Subscription = None
+		self.Comment = None
+		self.VideoRefresh = None
+		self.SnapshotSeries = None
+		self.SnapshotBlock = None
 
 		self._initializeDatabase(filename)
+		# The history of the counters of each video and channel.
+		self.snapshots = SnapshotStore(self)
 
 
 	def _initializeDatabase(self, filename: str):
@@ -61,6 +76,12 @@ class YoutubeDatabase:
 		self.PlaylistItem = entities['playlistItem']
 		self.Video = entities['video']
 		self.Tag = entities['tag']
+		self.ChannelSync = entities['channelSync']
+		self.Subscription = entities['subscription']
+		self.Comment = entities['comment']
+		self.VideoRefresh = entities['videoRefresh']
+		self.SnapshotSeries = entities['snapshotSeries']
+		self.SnapshotBlock = entities['snapshotBlock']
 
 		self._db.generate_mapping(create_tables = True)
 
@@ -83,13 +104,45 @@ class YoutubeDatabase:
 			return self.Video
 		elif kind == 'playlistItem' or kind == 'youtube#playlistItem':
 			return self.PlaylistItem
+		elif kind == 'subscription':
+			return self.Subscription
+		elif kind == 'comment' or kind == 'commentThread':
+			return self.Comment
 		else:
 			message = "'{}' is not a valid entity type!".format(kind)
 			raise ValueError(message)
 
+	def _queueRelatedItems(self, items: List) -> None:
+		"""
+			Queues the channels, playlists and videos referenced by `items` which aren't in the database yet,
+			so that they are retrieved 50 at a time instead of one request each.
+		"""
+		if self.loader is None:
+			return
+		related_items = {'youtube#channel': set(), 'youtube#playlist': set(), 'youtube#video': set()}
+		for item in items:
+			item_type = item['resourceType']
+			if item_type == 'youtube#video' or item_type == 'youtube#playlist':
+				related_items['youtube#channel'].add(item['channelId'])
+			elif item_type == 'youtube#playlistItem':
+				related_items['youtube#playlist'].add(item['playlistId'])
+				related_items['youtube#video'].add(item['itemId'])
+
+		for kind, ids in related_items.items():
+			missing_ids = [i for i in ids if i and not self.exists(kind, i)]
+			self.loader.queue(kind, missing_ids)
+
 	@db_session
 	def insertItemIntoDatabase(self, items: ListResource, show:bool=False)->List:
 		new_entities = list()
+		# Checked before the items are converted, so that the items already imported are never parsed.
+		new_items = dict()
+		for item in items:
+			key = (item['resourceType'], item['resourceId'])
+			if key not in new_items and not self.exists(*key):
+				new_items[key] = item
+		items = list(new_items.values())
+		self._queueRelatedItems(items)
 		if show:
 			pbar = ProgressBar(max_value = len(items))
 		else:
@@ -98,12 +151,12 @@ class YoutubeDatabase:
 			if show:
 				pbar.update(index)
 
-
-			sql_arguments: Dict = item.toDict(to_sql = True)
-			item_type = sql_arguments.pop('resourceType')
-			item_already_exists = self.exists(item_type, sql_arguments['resourceId'])
-			if item_already_exists:
+			item_type = item['resourceType']
+			# Related items retrieved while inserting the previous ones may include this one.
+			if index and self.exists(item_type, item['resourceId']):
 				continue
+			sql_arguments: Dict = item.toDict(to_sql = True)
+			sql_arguments.pop('resourceType')
 			#sql_arguments.pop('itemType')
 
 			if item_type == 'youtube#video' or item_type == 'youtube#playlist':
@@ -140,6 +193,56 @@ class YoutubeDatabase:
 				raise ValueError
 		return new_entities
 
+	def insertBulk(self, items: Iterable, batch_size: int = 500) -> int:
+		"""
+			Inserts a stream of subscriptions or comments. Each batch is written in its own transaction and then
+			released, so memory use stays constant however many items there are. Items which are already in the
+			database are skipped.
+		Parameters
+		----------
+		items: iterable<SubscriptionResource, CommentThreadResource>
+			Ex. `YouTube.iterCommentThreads(video_id)`.
+		batch_size: int; default 500
+
+		Returns
+		-------
+			int
+				The number of items inserted.
+		"""
+		items = iter(items)
+		inserted_count = 0
+		while True:
+			batch = list(itertools.islice(items, batch_size))
+			if not batch:
+				break
+			inserted_count += self._insertBatch(batch)
+		return inserted_count
+
+	@db_session
+	def _insertBatch(self, batch: List) -> int:
+		entity_class = self._getEntityClass(batch[0])
+		batch_ids = [item['resourceId'] for item in batch]
+		existing_ids = set(select(e.resourceId for e in entity_class if e.resourceId in batch_ids))
+
+		inserted_count = 0
+		for item in batch:
+			if item['resourceId'] in existing_ids:
+				continue
+			existing_ids.add(item['resourceId'])
+			sql_arguments = item.toDict(to_sql = True)
+			sql_arguments.pop('resourceType')
+			entity_class(**{k: v for k, v in sql_arguments.items() if v is not None})
+			inserted_count += 1
+		return inserted_count
+
+	def importSubscriptions(self, channel_id: str, batch_size: int = 500) -> int:
+		""" Imports the public subscriptions of a channel. Returns the number of new subscriptions. """
+		return self.insertBulk(self.api.iterSubscriptions(channel_id), batch_size)
+
+	def importComments(self, video_id: str, max_items: int = None, batch_size: int = 500) -> int:
+		""" Streams the top-level comments of a video into the database. Returns the number of new comments. """
+		return self.insertBulk(self.api.iterCommentThreads(video_id, max_items = max_items), batch_size)
+
 	@db_session
 	def addTags(self, entity, tags:List[str]):
 		for tag in tags:
@@ -191,7 +294,11 @@ class YoutubeDatabase:
 
 		else:
 			# If not, insert it into the database.
-			api_response = self.api.get(endpoint, key)
+			if ',' in key or self.loader is None:
+				api_response = self.api.get(endpoint, key)
+			else:
+				resource = self.loader.load(endpoint, key)
+				api_response = [resource] if resource is not None else []
 			item = self.insertItemIntoDatabase(api_response)
 
 		if item_type == 'resource' or item_type == 'listResource':
@@ -208,11 +315,139 @@ class YoutubeDatabase:
 
 		return item
 
-	def importChannel(self, channel_id:str):
-		channel_response = self.api.getChannelItems(channel_id)
-		if channel_response:
+	def importChannel(self, channel_id: str, full: bool = None, reconcile_after: timedelta = timedelta(days = 30)):
+		"""
+			Imports the uploads of a channel. After the first import, only the uploads newer than the newest
+			imported upload are requested, rather than paging through the entire uploads playlist.
+		Parameters
+		----------
+		channel_id: str
+		full: bool; default None
+			Whether to request every upload, which also picks up uploads that an incremental import would miss
+			(ex. videos which were private when the channel was last imported). Defaults to True for the first
+			import and whenever the last full import is older than `reconcile_after`.
+		reconcile_after: timedelta; default 30 days
+		"""
+		full, until, now = self._getImportPlan(channel_id, full, reconcile_after)
+		channel_response = self.api.getChannelItems(channel_id, until = until)
+		if channel_response is None:
+			return
 
+		if len(channel_response) > 0:
 			self.insertItemIntoDatabase(channel_response, show = True)
+		self._updateSyncState(channel_id, channel_response, full, now)
+
+	def _getImportPlan(self, channel_id: str, full: Optional[bool],
+			reconcile_after: timedelta) -> Tuple[bool, Optional[Callable], datetime]:
+		""" Whether the next import of the channel is a full one, where its uploads stop otherwise, and the sync time. """
+		sync_state = self.getSyncState(channel_id)
+		now = datetime.utcnow()
+		if full is None:
+			last_full_sync = sync_state['lastFullSyncDate'] if sync_state else None
+			full = last_full_sync is None or now - last_full_sync >= reconcile_after
+
+		until = None if full else partial(self._isImportedUpload, sync_state)
+		return full, until, now
+
+	@db_session
+	def getSyncState(self, channel_id: str) -> Optional[Dict]:
+		""" The newest upload imported from the channel and when it was last imported, or None if it never was. """
+		sync_state = self.ChannelSync.get(channelId = channel_id)
+		return sync_state.to_dict() if sync_state is not None else None
+
+	@staticmethod
+	def _isImportedUpload(sync_state: Dict, item: PlaylistItemResource) -> bool:
+		if item['itemId'] == sync_state['lastItemId']:
+			return True
+		# Still stops if the newest imported upload has since been deleted.
+		item_date = item['playlistItemDate']
+		last_date = sync_state['lastItemDate']
+		if item_date is None or last_date is None:
+			return False
+		return item_date.replace(tzinfo = None) < last_date.replace(tzinfo = None)
+
+	def _getSyncEntity(self, channel_id: str):
+		sync_state = self.ChannelSync.get(channelId = channel_id)
+		if sync_state is None:
+			sync_state = self.ChannelSync(channelId = channel_id)
+		return sync_state
+
+	@db_session
+	def _updateSyncState(self, channel_id: str, channel_response: ListResource, full: bool, now: datetime):
+		sync_state = self._getSyncEntity(channel_id)
+		if len(channel_response) > 0:
+			# Uploads are listed newest first.
+			newest_item = channel_response.items[0]
+			sync_state.lastItemId = newest_item['itemId']
+			if newest_item['playlistItemDate'] is not None:
+				sync_state.lastItemDate = newest_item['playlistItemDate'].replace(tzinfo = None)
+		sync_state.lastSyncDate = now
+		if full:
+			sync_state.lastFullSyncDate = now
+
+	def importActivities(self, channel_ids: List[str] = None, max_workers: int = 8) -> List:
+		"""
+			Imports the videos uploaded since each channel was last synced. New uploads are found through the
+			channels' activities, which costs a single request per channel, and only the new videos are then
+			requested, 50 at a time.
+		Parameters
+		----------
+		channel_ids: list<str>; default None
+			Defaults to every channel in the database.
+		max_workers: int; default 8
+			The number of channels whose activities are requested at the same time.
+
+		Returns
+		-------
+			list
+				The new video entities.
+		"""
+		if channel_ids is None:
+			with db_session:
+				channel_ids = [channel.resourceId for channel in self.Channel.select()]
+		sync_states = {channel_id: self.getSyncState(channel_id) or {} for channel_id in channel_ids}
+
+		def getActivities(channel_id: str) -> ListResource:
+			sync_state = sync_states[channel_id]
+			published_after = sync_state.get('lastActivityDate') or sync_state.get('lastItemDate')
+			return self.api.getActivities(channel_id, published_after)
+
+		with ThreadPoolExecutor(max_workers = max_workers) as executor:
+			responses = list(executor.map(getActivities, channel_ids))
+
+		upload_ids = list()
+		for response in responses:
+			upload_ids.append([
+				activity['itemId'] for activity in response
+				if activity['activityType'] == 'upload' and activity['itemType'] == 'youtube#video'
+			])
+		video_ids = [i for i in dict.fromkeys(sum(upload_ids, [])) if not self.exists('youtube#video', i)]
+
+		new_entities = list()
+		failed_ids = set()
+		if video_ids:
+			videos = self.api.getVideos(video_ids)
+			failed_ids = {video_id for error in videos.errors for video_id in error['ids']}
+			new_entities = self.insertItemIntoDatabase(videos)
+
+		now = datetime.utcnow()
+		with db_session:
+			for channel_id, response, channel_upload_ids in zip(channel_ids, responses, upload_ids):
+				if response.status_code != 200:
+					continue
+				# The sync state is left as is until every upload was retrieved, so the next run requests
+				# the same activities again.
+				if failed_ids.intersection(channel_upload_ids):
+					continue
+				sync_state = self._getSyncEntity(channel_id)
+				activity_dates = [i['activityDate'] for i in response if i['activityDate'] is not None]
+				if activity_dates:
+					# Activities are listed newest first.
+					sync_state.lastActivityDate = activity_dates[0].replace(tzinfo = None)
+				elif sync_state.lastActivityDate is None:
+					sync_state.lastActivityDate = now
+				sync_state.lastSyncDate = now
+		return new_entities
 
 	def importChannels(self, channel_ids:List[str]):
 		for channel_id in channel_ids:
@@ -229,3 +464,42 @@ class YoutubeDatabase:
 
 
 			self.importChannel(channel_id)
+
+	async def importChannelsAsync(self, channel_ids: List[str], concurrency: int = 8, full: bool = None,
+			reconcile_after: timedelta = timedelta(days = 30)):
+		"""
+			Imports several channels, fetching their uploads concurrently through an `AsyncYouTube` client.
+			Each channel is written to the database as soon as its uploads have been retrieved. As with
+			`importChannel`, only the uploads newer than the newest imported upload are requested after the
+			first import.
+		Parameters
+		----------
+		channel_ids: list<str>
+		concurrency: int; default 8
+			The maximum number of simultaneous requests.
+		full: bool; default None
+			See `YoutubeDatabase.importChannel`.
+		reconcile_after: timedelta; default 30 days
+		"""
+		async def getChannelItems(async_api: AsyncYouTube, channel_id: str):
+			channel_full, until, now = self._getImportPlan(channel_id, full, reconcile_after)
+			channel_response = await async_api.getChannelItems(channel_id, until = until)
+			return channel_id, channel_full, now, channel_response
+
+		async with AsyncYouTube(self.api, concurrency = concurrency) as async_api:
+			tasks = [getChannelItems(async_api, channel_id) for channel_id in channel_ids]
+			for task in asyncio.as_completed(tasks):
+				channel_id, channel_full, now, channel_response = await task
+				if channel_response is None:
+					continue
+				if len(channel_response) == 0:
+					self._updateSyncState(channel_id, channel_response, channel_full, now)
+					continue
+
+				# Fetch the videos which aren't in the database yet concurrently rather than one at a time.
+				missing_ids = [i['itemId'] for i in channel_response if not self.exists('youtube#video', i['itemId'])]
+				if missing_ids:
+					video_response = await async_api.getVideos(missing_ids)
+					self.insertItemIntoDatabase(video_response)
+				self.insertItemIntoDatabase(channel_response)
+				self._updateSyncState(channel_id, channel_response, channel_full, now)
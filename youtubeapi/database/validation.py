@@ -1,6 +1,6 @@
 import math
 from datetime import datetime, timedelta
-from ..github import timetools
+from ..api import parseDuration, parseTimestamp
 def debugEntity(label, entity):
 	""" Convientience method to display the arguments
 		used in a failed attempt to create a new entity 
@@ -119,7 +119,7 @@ def parseEntityArguments(entity_type, entity_args = None, **kwargs):
 			'views': parseKeywords(result, ['views', 'viewCount', 'videoViewCount'], int),
 			'likes': parseKeywords(result, ['likes', 'likeCount', 'videoLikeCount'], int),
 			'dislikes': parseKeywords(result, ['dislikes', 'dislikeCount', 'videoDislikeCount'], int),
-			'publishDate': parseKeywords(result, ['publishDate', 'publishedAt', 'videoPublishDate'], timetools.Timestamp),
+			'publishDate': parseKeywords(result, ['publishDate', 'publishedAt', 'videoPublishDate'], parseTimestamp),
 			'duration': parseKeywords(result, ['duration', 'length', 'videoDuration']),
 			#'updatedAt': "",
 			'channel': parseKeywords(result, ['channel']),
@@ -127,7 +127,7 @@ def parseEntityArguments(entity_type, entity_args = None, **kwargs):
 			'tags': parseKeywords(result, ['tags', 'videoTags'])
 		}
 		if args['duration'] is not None:
-			args['duration'] = timetools.Duration(args['duration'])
+			args['duration'] = parseDuration(args['duration'])
 		#args['duration'] = args['duration'].toTimeDelta()
 	elif entity_type == 'playlist':
 		args = {
@@ -144,7 +144,7 @@ def parseEntityArguments(entity_type, entity_args = None, **kwargs):
 			'id': parseKeywords(result, ['channelId', 'id']),
 			'name': parseKeywords(result, ['channelName', 'name', 'title']),
 			'country': parseKeywords(result, ['country']),
-			'creationDate': parseKeywords(result, ['creationDate', 'publishedAt'], timetools.Timestamp),
+			'creationDate': parseKeywords(result, ['creationDate', 'publishedAt'], parseTimestamp),
 			'description': parseKeywords(result, ['description']),
 			'subscriberCount': parseKeywords(result, ['subscriberCount', 'subscribers'], int),
 			'videoCount': parseKeywords(result, ['videoCount'], int),
@@ -1,19 +1,25 @@
+import importlib
+import os
 import sys
-import os 
-
-github_folder = os.path.join(os.getenv('USERPROFILE'), 'Documents', 'Github')
-
-sys.path.append(github_folder)
-
-# noinspection PyUnresolvedReferences
-from pytools import tabletools, timetools
-#import pytools.tabletools as tabletools
-
-#import pytools.timetools as timetools
-#import pytools.tabletools as tabletools
-# noinspection PyUnresolvedReferences
-from github_data import youtube_subscriptions, youtube_api_key
 
 # Common youtubeapi settings
 
 DATA_FOLDER:str = os.path.join(os.path.dirname(__file__), "data")
+
+
+def __getattr__(name):
+	"""
+		`youtube_api_key` and `youtube_subscriptions` are read from the private 'github_data' module the first
+		time they are used, so the package can be imported on machines which don't have it.
+	"""
+	if name not in ('youtube_api_key', 'youtube_subscriptions'):
+		message = "module '{}' has no attribute '{}'".format(__name__, name)
+		raise AttributeError(message)
+	user_folder = os.getenv('USERPROFILE')
+	if user_folder is not None:
+		github_folder = os.path.join(user_folder, 'Documents', 'Github')
+		if github_folder not in sys.path:
+			sys.path.append(github_folder)
+	# noinspection PyUnresolvedReferences
+	github_data = importlib.import_module('github_data')
+	return getattr(github_data, name)
@@ -10,7 +10,9 @@ def importSubscriptions(youtube, subscriptions, whitelist = None, start_index =
 	Parameters
 	----------
 	youtube: YoutubeDatabase
-	subscriptions: dict
+	subscriptions: dict, str
+		Maps each channel name to its channel id. If a channel id is given instead, that channel's
+		public subscriptions are requested from the Api.
 	whitelist: list
 		overrides 'subscriptions'
 	start_index: int; default 0
@@ -20,6 +22,8 @@ def importSubscriptions(youtube, subscriptions, whitelist = None, start_index =
 	-------
 
 	"""
+	if isinstance(subscriptions, str):
+		subscriptions = {i['subscriptionName']: i['itemId'] for i in youtube.api.iterSubscriptions(subscriptions)}
 	if whitelist is None:
 		whitelist = list(subscriptions.keys())
 	all_metrics = list()